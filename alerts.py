@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Alert Rules
+User-defined rules from alert_rules.json, compiled once (and again only when
+the file changes) into per-kind threshold arrays. Each ingest works out which
+lines changed since the last poll and evaluates every rule of a kind against
+those rows in one broadcast, so the cost grows with changed lines x rules
+rather than with the stored history.
+
+Rule kinds ("when"):
+
+    crosses           home spread or total crosses, lands on or leaves `number`
+    moves             price moves `cents` (American odds, -110 to -130 is 20) or
+                      the point moves `points` within `window_minutes`
+    beats_consensus   a changed outcome's best price beats the consensus by
+                      `edge` implied probability, or its best point by `points`
+
+Every rule may narrow on market, book (name or list) and team (substring), and
+set cooldown_minutes (default 60) and sinks (stdout, file, webhook). Alerts go
+to stdout, alerts.jsonl, and ALERT_WEBHOOK_URL when that is set.
+
+Example alert_rules.json:
+    [{"name": "Spread through 3", "when": "crosses", "market": "spreads", "number": 3},
+     {"name": "ML 20c in an hour", "when": "moves", "market": "h2h", "cents": 20, "window_minutes": 60},
+     {"name": "Best beats consensus", "when": "beats_consensus", "market": "h2h", "edge": 0.02}]
+
+Usage:
+    python3 alerts.py check alert_rules.json
+    python3 alerts.py tail --limit 20
+"""
+
+import os
+import json
+import argparse
+import requests
+import numpy as np
+from collections import deque
+from datetime import datetime, timedelta
+
+from consensus import point_direction
+from odds_math import american_to_probability
+
+ALERT_RULES_FILE = os.environ.get("ALERT_RULES_FILE", "alert_rules.json")
+ALERTS_STATE_FILE = "alerts_state.json"
+ALERTS_LOG_FILE = "alerts.jsonl"
+ALERT_WEBHOOK_URL = os.environ.get("ALERT_WEBHOOK_URL")
+DEFAULT_SINKS = tuple(os.environ.get("ALERT_SINKS", "stdout,file,webhook").split(","))
+SINKS = ("stdout", "file", "webhook")
+KINDS = ("crosses", "moves", "beats_consensus")
+
+_compiled = {"mtime": None, "rules": None}
+_muted_sinks = set()
+
+
+class RuleSet:
+    """Rules of each kind as parallel arrays: one column per rule in every evaluation"""
+
+    def __init__(self, rules):
+        self.rules = [compile_rule(rule, i) for i, rule in enumerate(rules)]
+        self.by_kind = {kind: [rule for rule in self.rules if rule["when"] == kind] for kind in KINDS}
+        self.windows = sorted({rule["window"] for rule in self.by_kind["moves"]})
+        self.max_window = max(self.windows, default=timedelta(0))
+        self.max_cooldown = max((rule["cooldown"] for rule in self.rules), default=timedelta(0))
+
+    def _matches(self, rules, markets, books):
+        """Changed rows x rules mask for the market and book filters"""
+        rule_markets = np.array([rule["market"] or "" for rule in rules], dtype=object)
+        mask = (rule_markets[None, :] == markets[:, None]) | (rule_markets == "")[None, :]
+        for j, rule in enumerate(rules):
+            if rule["books"]:
+                mask[:, j] &= np.isin(books, list(rule["books"]))
+        return mask
+
+    def evaluate(self, changes, references, consensus):
+        """(row, rule, detail) for every rule a changed row or touched outcome satisfies"""
+        hits = []
+        rows = changes.to_dict('records')
+        markets = changes['market'].to_numpy(dtype=object)
+        books = changes['bookmaker'].to_numpy(dtype=object)
+        point = changes['point'].to_numpy(dtype=np.float64)
+
+        # Home side for spreads, Over for totals, so a point change is reported once per book
+        side = ((markets == 'spreads') & (changes['outcome_name'] == changes['home_team']).to_numpy()) | \
+               ((markets == 'totals') & (changes['outcome_name'] == 'Over').to_numpy())
+
+        rules = self.by_kind["crosses"]
+        if rules:
+            spread = markets == 'spreads'
+            old_point = changes['old_point'].to_numpy(dtype=np.float64)
+            old = np.where(spread, np.abs(old_point), old_point)[:, None]
+            new = np.where(spread, np.abs(point), point)[:, None]
+            numbers = np.array([rule["number"] for rule in rules])[None, :]
+            with np.errstate(invalid='ignore'):
+                crossed = ((old - numbers) * (new - numbers) <= 0) & (old != new)
+            mask = self._matches(rules, markets, books) & crossed & side[:, None]
+            hits += [(rows[i], rules[j], {"from": _number(old[i, 0]), "to": _number(new[i, 0])})
+                     for i, j in zip(*np.nonzero(mask))]
+
+        for window in self.windows:
+            rules = [rule for rule in self.by_kind["moves"] if rule["window"] == window]
+            ref_price, ref_point = references[window]
+            price_move = np.abs(_cents(changes['price'].to_numpy(dtype=np.float64)) - _cents(ref_price))
+            point_move = np.abs(point - ref_point)
+            cents = np.array([rule["cents"] or np.inf for rule in rules])[None, :]
+            points = np.array([rule["points"] or np.inf for rule in rules])[None, :]
+            with np.errstate(invalid='ignore'):
+                moved = (price_move[:, None] >= cents) | ((point_move[:, None] >= points) & side[:, None])
+            mask = self._matches(rules, markets, books) & moved
+            hits += [(rows[i], rules[j], {"from_price": _number(ref_price[i]), "from_point": _number(ref_point[i]),
+                                          "window_minutes": window.total_seconds() / 60})
+                     for i, j in zip(*np.nonzero(mask))]
+
+        rules = self.by_kind["beats_consensus"]
+        if rules and not consensus.empty:
+            touched = consensus.merge(changes[['game_id', 'market', 'outcome_name']].drop_duplicates(),
+                                      on=['game_id', 'market', 'outcome_name'])
+            touched_markets = touched['market'].to_numpy(dtype=object)
+            best_point = touched['best_point'].to_numpy(dtype=np.float64)
+            consensus_point = touched['consensus_point'].to_numpy(dtype=np.float64)
+            same_point = (touched_markets == 'h2h') | (best_point == consensus_point)
+            edge = np.where(same_point, touched['consensus_prob'].to_numpy(dtype=np.float64) -
+                            american_to_probability(touched['best_price'].to_numpy(dtype=np.float64)), np.nan)
+            point_edge = point_direction(touched) * (best_point - consensus_point)
+            edges = np.array([rule["edge"] or np.inf for rule in rules])[None, :]
+            points = np.array([rule["points"] or np.inf for rule in rules])[None, :]
+            with np.errstate(invalid='ignore'):
+                beats = (edge[:, None] >= edges) | (point_edge[:, None] >= points)
+            mask = self._matches(rules, touched_markets, touched['best_book'].to_numpy(dtype=object)) & beats
+            outcomes = touched.to_dict('records')
+            hits += [(outcomes[i], rules[j], {"edge": _number(edge[i]), "point_edge": _number(point_edge[i]),
+                                              "consensus_price": _number(outcomes[i]['consensus_price']),
+                                              "consensus_point": _number(consensus_point[i])})
+                     for i, j in zip(*np.nonzero(mask))]
+        return hits
+
+
+def compile_rule(rule, index):
+    """Validate one rule and fill in its defaults; raises ValueError naming the rule"""
+    name = rule.get("name") or f"rule {index + 1}"
+    when = rule.get("when")
+    if when not in KINDS:
+        raise ValueError(f"{name}: 'when' must be one of {', '.join(KINDS)}")
+    books = rule.get("book")
+    compiled = {
+        "name": name, "when": when, "market": rule.get("market"),
+        "books": frozenset([books] if isinstance(books, str) else books or []),
+        "team": (rule.get("team") or "").lower(),
+        "number": rule.get("number"), "cents": rule.get("cents"), "points": rule.get("points"),
+        "edge": rule.get("edge"),
+        "window": timedelta(minutes=float(rule.get("window_minutes", 60))),
+        "cooldown": timedelta(minutes=float(rule.get("cooldown_minutes", 60))),
+        "sinks": tuple(rule.get("sinks") or DEFAULT_SINKS),
+    }
+    if when == "crosses" and (compiled["number"] is None or compiled["market"] not in ("spreads", "totals")):
+        raise ValueError(f"{name}: crosses needs a number and market spreads or totals")
+    if when == "moves" and not (compiled["cents"] or compiled["points"]):
+        raise ValueError(f"{name}: moves needs cents or points")
+    if when == "beats_consensus" and not (compiled["edge"] or compiled["points"]):
+        raise ValueError(f"{name}: beats_consensus needs edge or points")
+    unknown = set(compiled["sinks"]) - set(SINKS)
+    if unknown:
+        raise ValueError(f"{name}: unknown sinks {', '.join(sorted(unknown))}")
+    return compiled
+
+
+def load_rules():
+    """Compiled rules, recompiled only when the rules file changes; None if there is no rules file"""
+    try:
+        mtime = os.stat(ALERT_RULES_FILE).st_mtime_ns
+    except OSError:
+        return None
+    if _compiled["mtime"] != mtime:
+        try:
+            with open(ALERT_RULES_FILE, 'r') as f:
+                _compiled["rules"] = RuleSet(json.load(f))
+        except ValueError as e:
+            print(f"⚠️ Alert rules not loaded: {e}")
+            _compiled["rules"] = None
+        _compiled["mtime"] = mtime
+    return _compiled["rules"]
+
+
+def _cents(price):
+    """American odds on a linear scale: -110 is -10, +120 is 20, so distances are in cents"""
+    return np.where(price >= 100, price - 100, np.where(price <= -100, price + 100, np.nan))
+
+
+def _number(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def load_state():
+    state = {"lines": {}, "fired": {}}
+    if os.path.exists(ALERTS_STATE_FILE):
+        try:
+            with open(ALERTS_STATE_FILE, 'r') as f:
+                state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return state
+
+
+def find_changes(snapshot, history):
+    """Rows whose price or point changed since the last poll, with their previous line"""
+    keys = [f"{g}|{b}|{m}|{o}" for g, b, m, o in
+            snapshot[['game_id', 'bookmaker', 'market', 'outcome_name']].itertuples(index=False, name=None)]
+    last = [history[key][-1] if key in history else None for key in keys]
+    old_price = np.array([line[1] if line else np.nan for line in last], dtype=np.float64)
+    old_point = np.array([line[2] if line and line[2] is not None else np.nan for line in last], dtype=np.float64)
+    price = snapshot['price'].to_numpy(dtype=np.float64)
+    point = snapshot['point'].to_numpy(dtype=np.float64)
+    changed = ~np.isnan(old_price) & ((price != old_price) | ~((point == old_point) |
+                                                              (np.isnan(point) & np.isnan(old_point))))
+    changes = snapshot[changed].assign(old_price=old_price[changed], old_point=old_point[changed])
+    return changes, keys, np.nonzero(changed)[0]
+
+
+def window_references(history, keys, rows, now, windows):
+    """Per window: each changed line's price and point as of that long ago (or when first seen, if later)"""
+    references = {}
+    for window in windows:
+        cutoff = (now - window).isoformat()
+        prices, points = [], []
+        for row in rows:
+            lines = history[keys[row]]
+            reference = lines[0]
+            for line in lines:
+                if line[0] > cutoff:
+                    break
+                reference = line
+            prices.append(reference[1])
+            points.append(np.nan if reference[2] is None else reference[2])
+        references[window] = (np.array(prices, dtype=np.float64), np.array(points, dtype=np.float64))
+    return references
+
+
+def describe(alert):
+    """Book, market, outcome and line of an alert, like: fanduel spreads Chiefs -2.5 -110"""
+    point = "" if alert['point'] is None else f"{alert['point']:+g} " if alert['m'] == 'spreads' else f"{alert['point']:g} "
+    return f"{alert['b']} {alert['m']} {alert['o']} {point}{alert['price']:+.0f}"
+
+
+def mute_sinks(sinks):
+    """Stop delivering to these sinks in this process, e.g. so a replay doesn't re-send old alerts"""
+    _muted_sinks.update(sinks)
+
+
+def deliver(alerts):
+    """Send each alert to its rule's sinks"""
+    by_sink = {sink: [alert for alert, sinks in alerts if sink in sinks and sink not in _muted_sinks]
+               for sink in SINKS}
+    for alert in by_sink["stdout"]:
+        print(f"🔔 {alert['rule']}: {alert['away_team']} @ {alert['home_team']} {describe(alert)}")
+    if by_sink["file"]:
+        with open(ALERTS_LOG_FILE, 'a', encoding='utf-8') as f:
+            for alert in by_sink["file"]:
+                f.write(json.dumps(alert, separators=(',', ':')) + "\n")
+    if by_sink["webhook"] and ALERT_WEBHOOK_URL:
+        try:
+            requests.post(ALERT_WEBHOOK_URL, json={"alerts": by_sink["webhook"]}, timeout=5)
+        except requests.RequestException as e:
+            print(f"⚠️ Alert webhook failed: {e}")
+
+
+def evaluate_alerts(snapshot, consensus, timestamp):
+    """Evaluate the rules against this snapshot's changed lines; returns the alerts sent"""
+    rules = load_rules()
+    if rules is None or not rules.rules:
+        return []
+    state = load_state()
+    history = state["lines"]
+    now = datetime.fromisoformat(timestamp)
+    changes, keys, rows = find_changes(snapshot, history)
+    references = window_references(history, keys, rows, now, rules.windows)
+    cooldown_cutoff = (now - rules.max_cooldown).isoformat()
+    fired = {key: at for key, at in state["fired"].items() if at >= cooldown_cutoff}
+
+    alerts = []
+    for row, rule, detail in rules.evaluate(changes, references, consensus):
+        book = row['best_book'] if rule["when"] == "beats_consensus" else row['bookmaker']
+        price = row['best_price'] if rule["when"] == "beats_consensus" else row['price']
+        point = row['best_point'] if rule["when"] == "beats_consensus" else row['point']
+        if rule["team"] and rule["team"] not in f"{row['home_team']}|{row['away_team']}".lower():
+            continue
+        fired_key = f"{rule['name']}|{row['game_id']}|{book}|{row['market']}|{row['outcome_name']}"
+        if fired.get(fired_key, "") >= (now - rule["cooldown"]).isoformat():
+            continue
+        fired[fired_key] = timestamp
+        alerts.append(({"t": timestamp, "rule": rule["name"], "when": rule["when"], "g": row['game_id'],
+                        "home_team": row['home_team'], "away_team": row['away_team'], "b": book,
+                        "m": row['market'], "o": row['outcome_name'], "price": _number(float(price)),
+                        "point": _number(float(point)), **detail}, rule["sinks"]))
+    if alerts:
+        deliver(alerts)
+
+    # History per line covers the longest window, plus the last entry from before it
+    cutoff = (now - rules.max_window).isoformat()
+    prices = snapshot['price'].tolist()
+    points = [_number(point) for point in snapshot['point'].tolist()]
+    lines = {}
+    for key, price, point in zip(keys, prices, points):
+        previous = history.get(key)
+        if previous is None or previous[-1][1] != price or previous[-1][2] != point:
+            previous = (previous or []) + [[timestamp, price, point]]
+        start = 0
+        while start + 1 < len(previous) and previous[start + 1][0] <= cutoff:
+            start += 1
+        lines[key] = previous[start:]
+
+    tmp_path = f"{ALERTS_STATE_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"lines": lines, "fired": fired}, f, separators=(',', ':'))
+    os.replace(tmp_path, ALERTS_STATE_FILE)
+    return [alert for alert, _ in alerts]
+
+
+def recent_alerts(limit=100, rule=None):
+    """Most recent alerts from the file sink, optionally for one rule, newest first"""
+    if not os.path.exists(ALERTS_LOG_FILE):
+        return []
+    with open(ALERTS_LOG_FILE, 'r', encoding='utf-8') as f:
+        alerts = (json.loads(line) for line in f)
+        latest = deque((alert for alert in alerts if rule is None or alert['rule'] == rule), maxlen=limit)
+    return list(reversed(latest))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert rules evaluated on every ingest")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check = subparsers.add_parser("check", help="Validate a rules file")
+    check.add_argument("rules_file", nargs="?", default=ALERT_RULES_FILE)
+    tail = subparsers.add_parser("tail", help=f"Show the latest alerts from {ALERTS_LOG_FILE}")
+    tail.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "check":
+        with open(args.rules_file, 'r') as f:
+            rules = RuleSet(json.load(f))
+        for kind, compiled in rules.by_kind.items():
+            print(f"✅ {len(compiled)} {kind} rules")
+        return
+    for alert in reversed(recent_alerts(args.limit)):
+        print(f"{alert['t']}  {alert['rule']}: {alert['away_team']} @ {alert['home_team']} {describe(alert)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ import sys
 import os
 from datetime import datetime
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Add virtual environment to Python path
 venv_path = '/opt/venv'
 if os.path.exists(venv_path):
@@ -37,6 +39,53 @@ def run_web_interface():
     except Exception as e:
         print(f"❌ Web interface error: {e}")
 
+def start_event_stream():
+    """Board events come from the asyncio server so open dashboards don't hold gunicorn threads
+    
+    Platforms that set PORT route only that port, so the stream is started there only when
+    EVENTS_PORT is given; otherwise dashboards poll /api/board instead.
+    """
+    if "EVENTS_PORT" not in os.environ and "PORT" in os.environ:
+        print("📡 No EVENTS_PORT; dashboards will poll for board changes")
+        return None
+    port = os.environ.setdefault("EVENTS_PORT", "8098")
+    print(f"📡 Starting board event stream on port {port}...")
+    return subprocess.Popen([sys.executable, os.path.join(APP_DIR, "event_stream.py"), "--port", port])
+
+def run_production():
+    """Scheduler in its own process, gunicorn workers for the web interface, and the event stream"""
+    app_dir = APP_DIR
+    events = start_event_stream()
+    
+    print("🔄 Starting odds logger scheduler process...")
+    scheduler = subprocess.Popen([sys.executable, os.path.join(app_dir, "schedule_odds.py")])
+    
+    print("🌐 Starting gunicorn workers...")
+    web = subprocess.Popen([sys.executable, "-m", "gunicorn",
+                            "-c", os.path.join(app_dir, "gunicorn.conf.py"),
+                            "web_interface:app"])
+    
+    # If any of them exits, stop the others so the platform restarts the service
+    processes = [process for process in (scheduler, web, events) if process]
+    try:
+        while all(process.poll() is None for process in processes):
+            time.sleep(5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    print(f"❌ Stopped (scheduler exit: {scheduler.returncode}, web exit: {web.returncode}, "
+          f"events exit: {events.returncode if events else None})")
+    sys.exit(1)
+
 def main():
     print("🏈 NFL Odds Logger - Railway Deployment")
     print("=" * 50)
@@ -69,6 +118,13 @@ def main():
     os.chdir('linemovement')
     print(f"📁 Working directory: {os.getcwd()}")
     
+    # Production mode: multiple web worker processes plus a separate scheduler process
+    if "--production" in sys.argv or os.environ.get("SERVE_MODE") == "production":
+        run_production()
+        return
+    
+    # Flask's threaded server streams /events itself on the main port, one thread per open dashboard
+    
     # Start scheduler in background thread
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
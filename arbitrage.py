@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Arbitrage and Middle Scanner
+Evaluated on every ingest from two per-outcome reductions, never by pairing
+books against each other:
+
+    arbitrage  best price for each side of the same line (h2h, a spread from
+               the home side, or a total); the sides' implied probabilities
+               sum to less than 1
+    middle     best spread point for each side, or the lowest Over and highest
+               Under; the two points leave a whole-number result where both
+               bets win
+
+Open opportunities are tracked in opportunities_state.json with first and last
+seen snapshots; when one disappears it is appended to opportunities.jsonl with
+its lifetime.
+"""
+
+import os
+import json
+import numpy as np
+from collections import deque
+
+from odds_math import american_to_probability
+from closing_lines import poll_times_utc
+
+OPPORTUNITIES_STATE_FILE = "opportunities_state.json"
+OPPORTUNITIES_LOG_FILE = "opportunities.jsonl"
+
+
+def line_of(df):
+    """Shared line for both sides of a market: spread from the home side, the total, or 0 for h2h"""
+    point = df['point'].to_numpy(dtype=np.float64)
+    is_home = (df['outcome_name'] == df['home_team']).to_numpy()
+    spreads = (df['market'] == 'spreads').to_numpy()
+    totals = (df['market'] == 'totals').to_numpy()
+    return np.where(spreads, np.where(is_home, point, -point), np.where(totals, point, 0.0))
+
+
+def find_arbitrage(snapshot):
+    """One row per (game, market, line) whose best prices across books imply less than 100%"""
+    df = snapshot.assign(implied_prob=american_to_probability(snapshot['price'].to_numpy(dtype=np.float64)),
+                         line=line_of(snapshot))
+    df = df[~np.isnan(df['line'].to_numpy())]
+    if df.empty:
+        return []
+    best = df.loc[df.groupby(['game_id', 'market', 'line', 'outcome_name'], sort=False)['implied_prob'].idxmin()]
+
+    totals = best.groupby(['game_id', 'market', 'line'], sort=False).agg(
+        sides=('outcome_name', 'size'), total=('implied_prob', 'sum')).reset_index()
+    arbs = totals[(totals['sides'] == 2) & (totals['total'] < 1.0)]
+    if arbs.empty:
+        return []
+
+    legs = best.merge(arbs[['game_id', 'market', 'line', 'total']], on=['game_id', 'market', 'line'])
+    opportunities = []
+    for (game_id, market, line), group in legs.groupby(['game_id', 'market', 'line'], sort=False):
+        first = group.iloc[0]
+        opportunities.append({
+            "type": "arbitrage", "game_id": game_id, "market": market, "line": float(line),
+            "home_team": first['home_team'], "away_team": first['away_team'],
+            "edge": round(1.0 / first['total'] - 1.0, 5),
+            "legs": [{"outcome": leg.outcome_name, "book": leg.bookmaker, "price": int(leg.price),
+                      "point": None if np.isnan(leg.point) else float(leg.point)}
+                     for leg in group.itertuples(index=False)]
+        })
+    return opportunities
+
+
+def find_middles(consensus):
+    """Spreads and totals where the best points on each side leave a gap both bets win inside"""
+    if consensus.empty:
+        return []
+    lines = consensus[consensus['market'].isin(['spreads', 'totals'])].dropna(subset=['best_point'])
+    if lines.empty:
+        return []
+    lines = lines.assign(implied_prob=american_to_probability(lines['best_price'].to_numpy(dtype=np.float64)))
+    is_home = lines['outcome_name'] == lines['home_team']
+
+    # Spreads: home +h and away +a both cover when -h < margin < a.
+    # Totals: Over o and Under u both win when o < total < u.
+    # Final margins and totals are whole numbers, so a middle needs one strictly inside
+    # (lo, hi); -2.5/+3 or -3/+4 can only end in a win and a push.
+    spreads = (lines['market'] == 'spreads').to_numpy()
+    point = lines['best_point'].to_numpy(dtype=np.float64)
+    low_side = np.where(spreads, is_home.to_numpy(), (lines['outcome_name'] == 'Over').to_numpy())
+    lines = lines.assign(lo=np.where(low_side, np.where(spreads, -point, point), np.nan),
+                         hi=np.where(low_side, np.nan, point),
+                         side=np.where(spreads, np.where(is_home, 'home', 'away'), lines['outcome_name']))
+    gaps = lines.groupby(['game_id', 'market'], sort=False).agg(
+        sides=('side', 'nunique'), lo=('lo', 'max'), hi=('hi', 'min'), cost=('implied_prob', 'sum')).reset_index()
+    gaps['width'] = gaps['hi'] - gaps['lo']
+    middles = gaps[(gaps['sides'] == 2) & (np.floor(gaps['lo']) + 1 < gaps['hi'])]
+    if middles.empty:
+        return []
+
+    legs = lines.merge(middles[['game_id', 'market', 'width', 'cost']], on=['game_id', 'market'])
+    opportunities = []
+    for (game_id, market), group in legs.groupby(['game_id', 'market'], sort=False):
+        first = group.iloc[0]
+        opportunities.append({
+            "type": "middle", "game_id": game_id, "market": market, "line": None,
+            "home_team": first['home_team'], "away_team": first['away_team'],
+            "width": float(first['width']), "cost": round(float(first['cost']), 5),
+            "legs": [{"outcome": leg.outcome_name, "book": leg.best_book, "price": int(leg.best_price),
+                      "point": float(leg.best_point)} for leg in group.itertuples(index=False)]
+        })
+    return opportunities
+
+
+def opportunity_key(opportunity):
+    """Same game, market and line is the same opportunity even if the books offering it change"""
+    return f"{opportunity['type']}|{opportunity['game_id']}|{opportunity['market']}|{opportunity['line']}"
+
+
+def load_open():
+    if not os.path.exists(OPPORTUNITIES_STATE_FILE):
+        return {}
+    try:
+        with open(OPPORTUNITIES_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _lifetime_minutes(opportunity):
+    # Opportunities open across the switch to UTC poll stamps mix naive and aware times
+    first, last = poll_times_utc([opportunity["first_seen"], opportunity["last_seen"]])
+    return round((last - first).total_seconds() / 60, 1)
+
+
+def scan(snapshot, consensus, timestamp):
+    """Find this snapshot's opportunities, extend the open ones and close those that are gone"""
+    found = find_arbitrage(snapshot) + find_middles(consensus)
+    open_opportunities = load_open()
+    current = {}
+    for opportunity in found:
+        key = opportunity_key(opportunity)
+        previous = open_opportunities.pop(key, None)
+        opportunity["first_seen"] = previous["first_seen"] if previous else timestamp
+        opportunity["last_seen"] = timestamp
+        opportunity["snapshots"] = previous["snapshots"] + 1 if previous else 1
+        current[key] = opportunity
+
+    # Whatever is left was not in this snapshot
+    if open_opportunities:
+        with open(OPPORTUNITIES_LOG_FILE, 'a', encoding='utf-8') as f:
+            for opportunity in open_opportunities.values():
+                opportunity["closed"] = timestamp
+                opportunity["lifetime_minutes"] = _lifetime_minutes(opportunity)
+                f.write(json.dumps(opportunity, separators=(',', ':')) + "\n")
+
+    tmp_path = f"{OPPORTUNITIES_STATE_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(current, f, separators=(',', ':'))
+    os.replace(tmp_path, OPPORTUNITIES_STATE_FILE)
+
+    new = sum(1 for opportunity in current.values() if opportunity["snapshots"] == 1)
+    if current or open_opportunities:
+        print(f"💰 {len(current)} open opportunities ({new} new), {len(open_opportunities)} closed")
+    return list(current.values())
+
+
+def recent_closed(limit=100):
+    """Most recently closed opportunities, newest first"""
+    if not os.path.exists(OPPORTUNITIES_LOG_FILE):
+        return []
+    with open(OPPORTUNITIES_LOG_FILE, 'r', encoding='utf-8') as f:
+        lines = deque(f, maxlen=limit)
+    return [json.loads(line) for line in reversed(lines)]
+
+
+def opportunities_report(limit=100):
+    """Open opportunities with their age so far, plus recently closed ones"""
+    open_opportunities = sorted(load_open().values(), key=lambda o: o["first_seen"])
+    for opportunity in open_opportunities:
+        opportunity["lifetime_minutes"] = _lifetime_minutes(opportunity)
+    return {"open": open_opportunities, "closed": recent_closed(limit)}
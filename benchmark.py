@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Ingest and Dashboard Benchmark Suite
+Generates (or reuses) a synthetic season and times ingest, the dashboard page,
+/api/stats and the graph endpoint, plus peak traced memory per stage. Each web
+stage is timed cold (fragment cache, coalescers and shared SQLite cache emptied
+before every call) and warm (repeat calls served from those caches). Results
+are written as JSON tagged with the git commit so runs can be compared.
+
+Usage:
+    python3 benchmark.py --output bench.json
+    python3 benchmark.py --data-dir season_data --compare bench.json
+    python3 benchmark.py --render-matrix
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+import contextlib
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                               text=True, cwd=REPO_DIR).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def time_call(func, repeats, setup=None):
+    """Run func repeats times (setup, untimed, before each); returns timing summary in milliseconds plus the last result"""
+    samples = []
+    result = None
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeats,
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "min_ms": round(samples[0], 2)
+    }, result
+
+
+def peak_memory(func, setup=None):
+    """Peak traced allocation (MiB) for a single call"""
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def reset_web_caches(web_interface, cache_dir):
+    """Empty every response cache so the next request is built from the files"""
+    from shared_cache import SharedCache
+    with web_interface._fragment_lock:
+        web_interface._fragment_cache.clear()
+    web_interface.board_frames_coalescer.clear()
+    web_interface.graphs_coalescer.clear()
+    fd, path = tempfile.mkstemp(dir=cache_dir, suffix=".sqlite3")
+    os.close(fd)
+    web_interface.shared_cache = SharedCache(path)
+
+
+def run_benchmarks(data_dir, repeats, graph_games):
+    """Time the web paths against the data in data_dir, cold and warm"""
+    os.chdir(data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import web_interface
+    client = web_interface.app.test_client()
+
+    latest_file = web_interface.get_latest_csv_file()
+    import pandas as pd
+    game_ids = list(pd.read_csv(latest_file, usecols=['game_id'])['game_id'].unique())[:graph_games]
+
+    def get(path):
+        response = client.get(path)
+        assert response.status_code == 200, f"{path} returned {response.status_code}"
+        return response
+
+    results = {}
+    stages = {
+        "dashboard": lambda: get("/"),
+        "api_stats": lambda: get("/api/stats"),
+        "game_graphs": lambda: [get(f"/api/game/{game_id}/graphs") for game_id in game_ids]
+    }
+    cache_dir = tempfile.mkdtemp(prefix="nfl_bench_cache_")
+    reset = lambda: reset_web_caches(web_interface, cache_dir)
+    try:
+        for name, func in stages.items():
+            cold, response = time_call(func, repeats, setup=reset)
+            warm, _ = time_call(func, repeats)
+            summary = {"cold": cold, "warm": warm, "peak_mib": peak_memory(func, setup=reset)}
+            if name == "dashboard":
+                summary["bytes"] = len(response.data)
+            results[name] = summary
+            print(f"   {name:<12} cold {cold['median_ms']:>9.1f} ms   warm {warm['median_ms']:>9.1f} ms   "
+                  f"peak {summary['peak_mib']:>7.1f} MiB")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results["data"] = {
+        "csv_files": len([f for f in os.listdir(".") if f.startswith("nfl_odds_") and f.endswith(".csv")]),
+        "csv_bytes": sum(os.path.getsize(f) for f in os.listdir(".") if f.endswith(".csv")),
+        "latest_file_rows": int(sum(1 for _ in open(latest_file)) - 1),
+        "graph_games": len(game_ids)
+    }
+    return results
+
+
+def run_render_matrix(repeats, game_counts=(4, 16, 32, 64), book_counts=(4, 8, 12)):
+    """Time game-card and full-page rendering against board size"""
+    import pandas as pd
+    from mock_odds_server import SyntheticBoard
+    from nfl_odds_logger import flatten_odds
+
+    # An empty directory means no previous file, so only rendering is measured
+    work_dir = tempfile.mkdtemp(prefix="nfl_render_")
+    os.chdir(work_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import web_interface
+
+        results = {}
+        print("   games  books   cards ms    page ms      bytes")
+        for n_games in game_counts:
+            for n_books in book_counts:
+                board = SyntheticBoard(n_games, n_books, seed=2025)
+                blocks = flatten_odds(board.response(), board.now.isoformat())
+                df = pd.DataFrame([row for rows in blocks.values() for row in rows])
+                games = web_interface.organize_data_by_games(df)
+
+                cards, games_html = time_call(lambda: web_interface.generate_games_html(games), repeats)
+                with web_interface.app.test_request_context('/'):
+                    template = web_interface.get_template('dashboard', web_interface.HTML_TEMPLATE)
+                    context = {'total_games': len(games), 'total_odds': len(df), 'api_calls': 0,
+                               'remaining_calls': 500, 'games_html': games_html,
+                               'data_files_html': '', 'last_update': ''}
+                    page, html = time_call(lambda: template.render(context), repeats)
+
+                results[f"{n_games}x{n_books}"] = {"cards_ms": cards["median_ms"], "page_ms": page["median_ms"],
+                                                   "bytes": len(html)}
+                print(f"   {n_games:>5}  {n_books:>5}  {cards['median_ms']:>9.2f}  {page['median_ms']:>9.2f}  "
+                      f"{len(html):>9,}")
+        return results
+    finally:
+        os.chdir(REPO_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(current, baseline_path):
+    """Print median deltas against a previous result file"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    print(f"\n📊 Compared with {baseline.get('commit', '?')} ({baseline_path})")
+    for stage, summary in current["results"].items():
+        before = baseline.get("results", {}).get(stage, {})
+        if stage == "ingest":
+            pairs = [("", summary, before, "per_poll_ms")]
+        else:
+            # Results from before the cold/warm split only had cache-dependent timings; they are not compared
+            pairs = [(f" {mode}", summary.get(mode, {}), before.get(mode, {}), "median_ms") for mode in ("cold", "warm")]
+        for label, now, then, key in pairs:
+            if key not in now or key not in then:
+                continue
+            delta = (now[key] - then[key]) / then[key] * 100 if then[key] else 0
+            print(f"   {stage + label:<17} {then[key]:>9.1f} -> {now[key]:>9.1f} ms ({delta:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest and dashboard paths")
+    parser.add_argument("--data-dir", help="Reuse an existing season instead of generating one")
+    parser.add_argument("--interval-minutes", type=int, default=60)
+    parser.add_argument("--books", type=int, default=10)
+    parser.add_argument("--games", type=int, default=272)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--graph-games", type=int, default=5, help="Games fetched per graph-endpoint run")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--render-matrix", action="store_true",
+                        help="Only time rendering against the number of games and bookmakers")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    report = {
+        "commit": git_commit(),
+        "run_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "params": vars(args),
+        "results": {}
+    }
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    temp_dir = None
+    data_dir = args.data_dir
+    if args.render_matrix:
+        print("🖼️  Render time by board size...")
+        report["results"]["render_matrix"] = run_render_matrix(args.repeats)
+    elif not data_dir:
+        from generate_season import generate_season
+        temp_dir = tempfile.mkdtemp(prefix="nfl_bench_")
+        data_dir = temp_dir
+        print(f"🏈 Generating season ({args.games} games, {args.books} books, every {args.interval_minutes} min)...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            polls, ingest_seconds = generate_season(data_dir, args.interval_minutes, args.books,
+                                                    args.games, args.weeks, args.seed)
+        report["results"]["ingest"] = {
+            "polls": polls,
+            "total_s": round(ingest_seconds, 3),
+            "per_poll_ms": round(ingest_seconds / max(polls, 1) * 1000, 3)
+        }
+        print(f"   ingest       {polls} polls in {ingest_seconds:.2f}s "
+              f"({report['results']['ingest']['per_poll_ms']:.2f} ms/poll)")
+
+    if data_dir:
+        data_dir = os.path.abspath(data_dir)
+        try:
+            report["results"].update(run_benchmarks(data_dir, args.repeats, args.graph_games))
+        finally:
+            os.chdir(REPO_DIR)
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {output}")
+    if baseline:
+        compare(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
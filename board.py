@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Current Board
+Reduces a day's CSV to the latest line per (game, bookmaker) and encodes it as a
+compact columnar payload: dictionary-encoded names plus parallel arrays
+"""
+
+import math
+import pandas as pd
+
+LINE_KEYS = ['game_id', 'bookmaker', 'market', 'outcome_name']
+
+
+def load_current_board(csv_file):
+    """Rows of the most recent block written for each (game, bookmaker)"""
+    df = pd.read_csv(csv_file)
+    if df.empty:
+        return df
+    latest = df.groupby(['game_id', 'bookmaker'])['timestamp'].transform('max')
+    return df[df['timestamp'] == latest].reset_index(drop=True)
+
+
+def last_lines(df):
+    """Last price/point seen for each line in a file"""
+    return df.drop_duplicates(LINE_KEYS, keep='last')[LINE_KEYS + ['price', 'point']]
+
+
+def _nullable(values):
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+
+def encode_board(board, previous=None, version=None, snapshot=None):
+    """Columnar board payload; prev_price/prev_point come from `previous` rows when given,
+    open_price/open_point are included when the board has those columns"""
+    if previous is not None and not previous.empty:
+        prev = last_lines(previous).rename(columns={'price': 'prev_price', 'point': 'prev_point'})
+        board = board.merge(prev, on=LINE_KEYS, how='left')
+    else:
+        board = board.assign(prev_price=float('nan'), prev_point=float('nan'))
+
+    games = board.drop_duplicates('game_id')
+    names = pd.unique(pd.concat([games['away_team'], games['home_team'], board['outcome_name']]))
+    name_codes = {name: i for i, name in enumerate(names)}
+    game_codes, game_ids = pd.factorize(board['game_id'])
+    book_codes, books = pd.factorize(board['bookmaker'])
+    market_codes, markets = pd.factorize(board['market'])
+
+    lines = {
+        'game': game_codes.tolist(),
+        'book': book_codes.tolist(),
+        'market': market_codes.tolist(),
+        'outcome': board['outcome_name'].map(name_codes).tolist(),
+        'price': _nullable(board['price'].tolist()),
+        'point': _nullable(board['point'].tolist()),
+        'prev_price': _nullable(board['prev_price'].tolist()),
+        'prev_point': _nullable(board['prev_point'].tolist())
+    }
+    for column in ('open_price', 'open_point'):
+        if column in board.columns:
+            lines[column] = _nullable(board[column].tolist())
+
+    return {
+        'version': version,
+        'snapshot': snapshot,
+        'names': list(names),
+        'books': list(books),
+        'markets': list(markets),
+        'games': {
+            'id': list(game_ids),
+            'away': [name_codes[name] for name in games['away_team']],
+            'home': [name_codes[name] for name in games['home_team']],
+            'commence': list(games['commence_time'])
+        },
+        'lines': lines
+    }
+
+
+def filter_board(df, game_ids=None, team=None, bookmaker=None, start=None, end=None):
+    """Server-side filters: explicit games, team name substring, bookmaker, and a YYYY-MM-DD kickoff window"""
+    mask = pd.Series(True, index=df.index)
+    if game_ids:
+        mask &= df['game_id'].isin(game_ids)
+    if team:
+        team = team.lower()
+        mask &= (df['home_team'].str.lower().str.contains(team, regex=False)
+                 | df['away_team'].str.lower().str.contains(team, regex=False))
+    if bookmaker:
+        mask &= df['bookmaker'] == bookmaker
+    kickoff_date = df['commence_time'].astype(str).str[:10]
+    if start:
+        mask &= kickoff_date >= start
+    if end:
+        mask &= kickoff_date <= end
+    return df[mask]
+
+
+def page_of_games(df, offset=0, limit=None):
+    """Rows for one page of games, in board order; returns (rows, number of matching games)"""
+    game_ids = df['game_id'].unique()
+    page_ids = game_ids[offset:offset + limit] if limit else game_ids[offset:]
+    return df[df['game_id'].isin(page_ids)], len(game_ids)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Board Versions
+Ingest bumps a game's version only when one of its (game, bookmaker) blocks
+changed, so readers can tell which games need recomputing
+"""
+
+import os
+import json
+
+BOARD_VERSIONS_FILE = "board_versions.json"
+# One line per poll listing the (game, bookmaker) blocks it wrote and the ones it saw unchanged
+HEARTBEAT_FILE_FORMAT = "nfl_heartbeats_{date}.jsonl"
+
+
+def load_board_versions():
+    """Current board version, per-game versions and the snapshot that set them"""
+    if os.path.exists(BOARD_VERSIONS_FILE):
+        try:
+            with open(BOARD_VERSIONS_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {"version": 0, "snapshot": None, "games": {}}
+
+
+def bump_board_versions(game_ids, snapshot):
+    """Give every changed game the next board version; returns the new state"""
+    state = load_board_versions()
+    if not game_ids:
+        return state
+
+    state["version"] += 1
+    state["snapshot"] = snapshot
+    for game_id in game_ids:
+        state["games"][game_id] = state["version"]
+
+    tmp_path = f"{BOARD_VERSIONS_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, BOARD_VERSIONS_FILE)
+    return state
+
+
+BOARD_EVENTS_FILE = "board_events.jsonl"
+# Subscribers only replay the last few hundred events, so the log is cut back to its newest half past this
+BOARD_EVENTS_MAX_BYTES = int(os.environ.get("BOARD_EVENTS_MAX_BYTES", 16 * 1024 * 1024))
+
+
+def append_board_event(version, snapshot, changes):
+    """Log the lines that changed in a committed snapshot, for /events subscribers"""
+    with open(BOARD_EVENTS_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"version": version, "snapshot": snapshot, "changes": changes},
+                           separators=(',', ':')) + "\n")
+        size = f.tell()
+    if size > BOARD_EVENTS_MAX_BYTES:
+        trim_board_events(BOARD_EVENTS_MAX_BYTES // 2)
+
+
+def trim_board_events(keep_bytes):
+    """Replace the event log with its newest whole lines fitting in keep_bytes"""
+    with open(BOARD_EVENTS_FILE, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        start = f.tell() - keep_bytes
+        if start <= 0:
+            return
+        f.seek(start - 1)
+        f.readline()  # Finish the line cut in half
+        tail = f.read()
+    tmp_path = f"{BOARD_EVENTS_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(tail)
+    os.replace(tmp_path, BOARD_EVENTS_FILE)
+
+
+def compact_changes(rows):
+    """Group changed rows as {g: game, b: bookmaker, m: market, o: [[outcome, price, point], ...]}"""
+    grouped = {}
+    for row in rows:
+        key = (row['game_id'], row['bookmaker'], row['market'])
+        if key not in grouped:
+            grouped[key] = {"g": key[0], "b": key[1], "m": key[2], "o": []}
+        grouped[key]["o"].append([row['outcome_name'], row['price'], row['point']])
+    return list(grouped.values())
+
+
+def read_heartbeats(date_str):
+    """Polls of one day as {"timestamp", "written", "unchanged"} records; empty if none were logged"""
+    path = HEARTBEAT_FILE_FORMAT.format(date=date_str)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Closing Lines and Closing-Line Value
+Every ingest keeps the latest pre-kickoff block per (game, bookmaker, market)
+in closing_pending.csv; at the first poll at or after commence_time those
+blocks are frozen into closing_lines.csv. CLV is then a single merge of any
+set of bets against the closes:
+
+    clv_prob   no-vig closing probability minus the bet's implied probability
+    clv_ev     expected return of the bet priced at the fair close
+    clv_points points gained on the closing spread/total (positive = beat it)
+
+Poll and commence times are UTC. Polls recorded before the logger stamped
+them in UTC are naive local times; those are read in POLL_TIMEZONE (default:
+TZ, else this machine's zone).
+
+Usage:
+    python3 closing_lines.py rebuild nfl_odds_*.csv
+    python3 closing_lines.py score --history nfl_odds_*.csv --output clv.csv
+    python3 closing_lines.py score --picks nfl-picks.csv
+"""
+
+import os
+import re
+import argparse
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from consensus import point_direction
+from odds_math import american_to_probability, attach_fair_odds
+
+CLOSING_LINES_FILE = "closing_lines.csv"
+CLOSING_PENDING_FILE = "closing_pending.csv"
+
+BLOCK_KEYS = ['game_id', 'bookmaker', 'market']
+OUTCOME_KEYS = ['game_id', 'market', 'outcome_name']
+CLOSE_COLUMNS = ['timestamp', 'game_id', 'commence_time', 'home_team', 'away_team',
+                 'bookmaker', 'market', 'outcome_name', 'price', 'point']
+
+
+@lru_cache(maxsize=None)
+def poll_timezone():
+    """Zone of naive (pre-UTC) poll timestamps: POLL_TIMEZONE or TZ, else this machine's zone"""
+    name = (os.environ.get("POLL_TIMEZONE") or os.environ.get("TZ") or "").lstrip(':')
+    if not name and os.path.exists("/etc/localtime"):
+        name = "/etc/localtime"
+    if name:
+        try:
+            if os.path.isabs(name):
+                # A zone file such as /etc/localtime -> /usr/share/zoneinfo/America/New_York
+                name = os.path.realpath(name).partition("/zoneinfo/")[2] or name
+            return ZoneInfo(name)
+        except (OSError, ValueError, ZoneInfoNotFoundError) as e:
+            print(f"⚠️ Unknown time zone {name!r} ({e}); reading naive poll times in the local zone")
+    return datetime.now().astimezone().tzinfo
+
+
+def poll_times_utc(timestamps):
+    """Poll timestamps as UTC; naive ones are read in poll_timezone()"""
+    stamps = pd.Series(timestamps, dtype=object).astype(str)
+    aware = stamps.str.contains(r'(?:Z|[+-]\d\d:?\d\d)$', regex=True)
+    times = pd.Series(pd.NaT, index=stamps.index, dtype='datetime64[ns, UTC]')
+    if aware.any():
+        times[aware] = pd.to_datetime(stamps[aware], utc=True, format='ISO8601')
+    if not aware.all():
+        naive = pd.to_datetime(stamps[~aware], format='ISO8601')
+        times[~aware] = naive.dt.tz_localize(poll_timezone(), ambiguous='NaT',
+                                             nonexistent='shift_forward').dt.tz_convert('UTC')
+    return times
+
+
+def commence_times_utc(commence_times):
+    return pd.to_datetime(pd.Series(commence_times), utc=True, format='ISO8601')
+
+
+def _read_lines(path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=CLOSE_COLUMNS)
+    return pd.read_csv(path)
+
+
+def _block_index(df):
+    return pd.MultiIndex.from_frame(df[BLOCK_KEYS])
+
+
+def update_closing_lines(snapshot, timestamp):
+    """Hold the latest pre-kickoff block per (game, book, market); freeze blocks whose game has started"""
+    now = poll_times_utc([timestamp]).iloc[0]
+    pending = _read_lines(CLOSING_PENDING_FILE)
+
+    upcoming = snapshot[(commence_times_utc(snapshot['commence_time']) > now).to_numpy()][CLOSE_COLUMNS]
+    if not upcoming.empty:
+        pending = pd.concat([pending[~_block_index(pending).isin(_block_index(upcoming))], upcoming],
+                            ignore_index=True)
+
+    started = (commence_times_utc(pending['commence_time']) <= now).to_numpy()
+    closed = pending[started]
+    if not closed.empty:
+        closed.to_csv(CLOSING_LINES_FILE, mode='a', header=not os.path.exists(CLOSING_LINES_FILE), index=False)
+        print(f"🔒 Froze closing lines for {closed['game_id'].nunique()} games")
+
+    tmp_path = f"{CLOSING_PENDING_FILE}.tmp"
+    pending[~started].to_csv(tmp_path, index=False)
+    os.replace(tmp_path, CLOSING_PENDING_FILE)
+    return closed
+
+
+def closes_from_history(df):
+    """Closing rows from stored polls: each block's last write before its game started
+
+    Games that had not started by the last poll have no close yet and are left out.
+    """
+    polled = poll_times_utc(df['timestamp'])
+    commence = commence_times_utc(df['commence_time'])
+    df = df[((polled < commence) & (commence <= polled.max())).to_numpy()]
+    last_write = df.groupby(BLOCK_KEYS, sort=False)['timestamp'].transform('max')
+    return df[df['timestamp'] == last_write][CLOSE_COLUMNS].reset_index(drop=True)
+
+
+def load_closes():
+    return _read_lines(CLOSING_LINES_FILE)
+
+
+def closing_reference(closes, by_book=False):
+    """Fair closing probability and closing point per outcome
+
+    By default this is the median across books of each book's no-vig close; with
+    by_book each bookmaker's own close is kept.
+    """
+    fair = attach_fair_odds(closes, keys=BLOCK_KEYS)
+    keys = OUTCOME_KEYS + (['bookmaker'] if by_book else [])
+    return fair.groupby(keys, sort=False).agg(close_fair_prob=('fair_prob', 'median'),
+                                              close_price=('price', 'median'),
+                                              close_point=('point', 'median')).reset_index()
+
+
+def clv(bets, closes, by_book=False):
+    """Score bets (game_id, market, outcome_name, price, point[, bookmaker]) against the closes in one merge"""
+    reference = closing_reference(closes, by_book)
+    keys = OUTCOME_KEYS + (['bookmaker'] if by_book else [])
+    scored = bets.merge(reference, on=keys, how='left')
+
+    price = scored['price'].to_numpy(dtype=np.float64)
+    implied = american_to_probability(price)
+    decimal = np.where(price > 0, 1.0 + price / 100.0, 1.0 - 100.0 / price)
+    point = pd.to_numeric(scored['point'], errors='coerce').to_numpy(dtype=np.float64)
+    close_point = scored['close_point'].to_numpy(dtype=np.float64)
+    fair = scored['close_fair_prob'].to_numpy(dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        clv_points = point_direction(scored) * (point - close_point)
+    return scored.assign(clv_prob=fair - implied, clv_ev=fair * decimal - 1.0,
+                         clv_points=np.where(scored['market'] == 'h2h', np.nan, clv_points),
+                         same_point=(point == close_point) | (scored['market'] == 'h2h').to_numpy())
+
+
+PICK_MARKETS = {'spread': 'spreads', 'moneyline': 'h2h', 'over': 'totals', 'under': 'totals'}
+NUMBER = re.compile(r'([+-]?\d+(?:\.\d+)?)')
+
+
+def _names_match(short, full):
+    short, full = short.strip().lower(), full.lower()
+    return bool(short) and (short in full or full in short)
+
+
+def picks_to_bets(picks, closes):
+    """Map a picks-tracker CSV export onto closing-line games; picks that cannot be matched are dropped"""
+    games = closes.drop_duplicates('game_id')[['game_id', 'commence_time', 'home_team', 'away_team']]
+    game_dates = commence_times_utc(games['commence_time']).dt.tz_convert('America/New_York').dt.strftime('%Y-%m-%d')
+    games = games.assign(date=game_dates.to_numpy())
+
+    bets = []
+    for pick in picks.to_dict('records'):
+        market = PICK_MARKETS.get(str(pick.get('Bet Type', '')).lower())
+        if market is None:
+            continue  # Props are not on the board
+        teams = [str(pick.get('Team 1', '')), str(pick.get('Team 2', ''))]
+        candidates = games[games['date'] == str(pick.get('Date', ''))[:10]]
+        candidates = [game for game in candidates.to_dict('records')
+                      if all(any(_names_match(team, game[side]) for side in ('home_team', 'away_team'))
+                             for team in teams)]
+        if not candidates:
+            continue
+        game = candidates[0]
+        text = str(pick.get('Pick', ''))
+
+        if market == 'totals':
+            outcome = 'Over' if pick['Bet Type'].lower() == 'over' else 'Under'
+        else:
+            named = [team for team in (game['home_team'], game['away_team'])
+                     if _names_match(team.split()[-1], text) or _names_match(team, text)]
+            if len(named) != 1:
+                continue
+            outcome = named[0]
+
+        numbers = NUMBER.findall(text)
+        point = float(numbers[-1]) if numbers and market != 'h2h' else np.nan
+        odds = pd.to_numeric(pick.get('Odds'), errors='coerce')
+        bets.append({'game_id': game['game_id'], 'market': market, 'outcome_name': outcome,
+                     'price': odds, 'point': point, 'pick': text, 'units': pick.get('Units')})
+    return pd.DataFrame(bets, columns=['game_id', 'market', 'outcome_name', 'price', 'point', 'pick', 'units'])
+
+
+def _summary(scored):
+    priced = scored.dropna(subset=['clv_prob'])
+    print(f"📈 {len(scored):,} bets scored, {len(priced):,} with a close")
+    if len(priced):
+        print(f"   beat the close: {(priced['clv_prob'] > 0).mean() * 100:.1f}%   "
+              f"mean CLV {priced['clv_prob'].mean() * 100:+.2f} pts of probability   "
+              f"mean EV at close {priced['clv_ev'].mean() * 100:+.2f}%")
+    points = scored.dropna(subset=['clv_points'])
+    if len(points):
+        print(f"   spreads/totals: mean {points['clv_points'].mean():+.2f} points vs the close")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Closing lines and closing-line value")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser("rebuild", help=f"Rebuild {CLOSING_LINES_FILE} from stored daily CSVs")
+    rebuild.add_argument("csv_files", nargs="+")
+
+    score = subparsers.add_parser("score", help="Score prices or picks against the closing lines")
+    score.add_argument("--history", nargs="+", help="Daily CSVs; every stored price is scored")
+    score.add_argument("--picks", help="CSV exported from the picks tracker")
+    score.add_argument("--by-book", action="store_true", help="Compare with the same book's close")
+    score.add_argument("--output", help="Write scored rows here")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        history = pd.concat([pd.read_csv(path) for path in args.csv_files], ignore_index=True)
+        closes = closes_from_history(history)
+        closes.to_csv(CLOSING_LINES_FILE, index=False)
+        print(f"🔒 {len(closes):,} closing rows for {closes['game_id'].nunique()} games -> {CLOSING_LINES_FILE}")
+        return
+
+    closes = load_closes()
+    if closes.empty:
+        print("❌ No closing lines yet; run 'rebuild' or let ingest freeze some")
+        return
+    if args.picks:
+        bets = picks_to_bets(pd.read_csv(args.picks), closes)
+    elif args.history:
+        bets = pd.concat([pd.read_csv(path) for path in args.history], ignore_index=True)
+    else:
+        parser.error("score needs --history or --picks")
+    scored = clv(bets, closes, args.by_book)
+    _summary(scored)
+    if args.output:
+        scored.to_csv(args.output, index=False)
+        print(f"💾 Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
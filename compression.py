@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Response Compression
+Negotiates gzip or brotli from Accept-Encoding for HTML, JSON, CSV and text
+responses. Small bodies are compressed in one go, file and streamed bodies are
+compressed chunk by chunk, and completed daily CSVs get precompressed sidecar
+files (.gz / .br) that are written once and then served as-is.
+"""
+
+import os
+import gzip
+import zlib
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first when the client accepts several with equal weight
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_TYPES = ("text/html", "application/json", "text/csv", "text/plain", "application/javascript")
+MIN_SIZE = 1024
+CHUNK_SIZE = 64 * 1024
+
+# Dynamic responses trade ratio for speed; sidecars are written once so use the maximum
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+SIDECAR_GZIP_LEVEL = 9
+SIDECAR_BROTLI_QUALITY = 11
+
+
+def negotiate(request):
+    """Best encoding the client accepts, or None"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def encoded_etag(etag, encoding):
+    """Each encoding is a different representation, so it gets its own ETag"""
+    return f"{etag}-{encoding}"
+
+
+def compress_bytes(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_chunks(chunks, encoding):
+    """Compress an iterable of bytes without holding the whole body in memory"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    close = getattr(chunks, "close", None)
+    if close:
+        close()
+
+
+def _compressible(response):
+    if response.status_code not in (200, 201) or "Content-Encoding" in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return False  # Event streams, images and downloads of other types pass through
+    if response.content_length is not None and response.content_length < MIN_SIZE:
+        return False
+    return True
+
+
+def compress_response(response, encoding):
+    """Compress a Flask response in place"""
+    if response.is_streamed or response.direct_passthrough:
+        response.response = compress_chunks(
+            (chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in response.response), encoding)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+        response.set_data(compress_bytes(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(encoded_etag(etag, encoding), weak)
+    return response
+
+
+def is_completed_daily_file(filepath):
+    """Daily CSVs are named by date; any day before today will not be written again"""
+    name = os.path.basename(filepath)
+    if not (name.startswith("nfl_odds_") and name.endswith(".csv")):
+        return False
+    return name[len("nfl_odds_"):-len(".csv")] < datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def sidecar_path(filepath, encoding):
+    """Precompressed copy of filepath, written on first request and refreshed if the CSV changes"""
+    sidecar = filepath + SIDECAR_SUFFIXES[encoding]
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(filepath):
+        return sidecar
+
+    # Worker processes and their threads may race to build the same sidecar; each writes its own temp file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar) or ".", suffix=".tmp")
+    try:
+        with open(filepath, "rb") as source, os.fdopen(fd, "wb") as target:
+            if encoding == "br":
+                compressor = brotli.Compressor(quality=SIDECAR_BROTLI_QUALITY)
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(compressor.process(chunk))
+                target.write(compressor.finish())
+            else:
+                with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=SIDECAR_GZIP_LEVEL,
+                                   filename="", mtime=0) as compressed:
+                    shutil.copyfileobj(source, compressed, CHUNK_SIZE)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp_path, sidecar)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    print(f"🗜️ Wrote {sidecar} ({os.path.getsize(filepath):,} -> {os.path.getsize(sidecar):,} bytes)")
+    return sidecar
+
+
+def init_app(app):
+    """Compress eligible responses after every request"""
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        if _compressible(response):
+            encoding = negotiate(request)
+            if encoding:
+                compress_response(response, encoding)
+        if response.mimetype in COMPRESSIBLE_TYPES:
+            response.vary.add("Accept-Encoding")
+        return response
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Consensus and Best-Price Board
+Once per ingest, reduces the full snapshot to one row per (game, market,
+outcome): the best price and point on offer and the book offering it, the
+median line across books, the median no-vig probability and how far the books
+disagree. Everything is a hash group-by over the snapshot, so the cost is
+linear in the number of outcomes.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from odds_math import attach_fair_odds, probability_to_american
+
+CONSENSUS_FILE = "consensus_board.json"
+OUTCOME_KEYS = ['game_id', 'market', 'outcome_name']
+
+# Extra points beat any price difference: implied probabilities differ by less than 1,
+# so scaling them below half a point keeps the point as the deciding term
+PRICE_WEIGHT = 0.4
+
+
+def point_direction(df):
+    """+1 where a higher point is better for the bettor, -1 where lower is, 0 for h2h"""
+    direction = np.where(df['market'] == 'spreads', 1.0, 0.0)
+    totals = (df['market'] == 'totals').to_numpy()
+    direction = np.where(totals & (df['outcome_name'] == 'Over').to_numpy(), -1.0, direction)
+    direction = np.where(totals & (df['outcome_name'] == 'Under').to_numpy(), 1.0, direction)
+    return direction
+
+
+def compute_consensus(snapshot):
+    """One row per (game, market, outcome) from a frame holding every book's current block"""
+    if snapshot.empty:
+        return pd.DataFrame()
+    df = attach_fair_odds(snapshot, keys=['game_id', 'bookmaker', 'market'])
+    point = pd.to_numeric(df['point'], errors='coerce')
+    df = df.assign(point=point,
+                   value=point_direction(df) * point.fillna(0).to_numpy() - PRICE_WEIGHT * df['implied_prob'])
+
+    grouped = df.groupby(OUTCOME_KEYS, sort=False)
+    best = df.loc[grouped['value'].idxmax(), OUTCOME_KEYS + ['home_team', 'away_team', 'commence_time',
+                                                              'bookmaker', 'price', 'point']]
+    best = best.rename(columns={'bookmaker': 'best_book', 'price': 'best_price', 'point': 'best_point'})
+
+    stats = grouped.agg(books=('bookmaker', 'size'),
+                        consensus_prob=('implied_prob', 'median'),
+                        consensus_point=('point', 'median'),
+                        fair_prob=('fair_prob', 'median'),
+                        prob_dispersion=('implied_prob', 'std'),
+                        point_min=('point', 'min'),
+                        point_max=('point', 'max')).reset_index()
+    # American prices are not linear across even money, so take the median as a probability
+    stats['consensus_price'] = np.round(probability_to_american(stats['consensus_prob']))
+    stats['point_range'] = stats['point_max'] - stats['point_min']
+    stats['prob_dispersion'] = stats['prob_dispersion'].fillna(0.0)
+    return best.merge(stats.drop(columns=['point_min', 'point_max']), on=OUTCOME_KEYS, how='left')
+
+
+def _json_value(value):
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def update_consensus(snapshot, timestamp):
+    """Recompute the consensus board for this ingest and write it for the web process"""
+    consensus = compute_consensus(snapshot)
+    records = [{key: _json_value(value) for key, value in record.items()}
+               for record in consensus.to_dict('records')]
+    tmp_path = f"{CONSENSUS_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"snapshot": timestamp, "lines": records}, f, separators=(',', ':'))
+    os.replace(tmp_path, CONSENSUS_FILE)
+    return consensus
+
+
+def load_consensus():
+    """Last written consensus board, or an empty one"""
+    if not os.path.exists(CONSENSUS_FILE):
+        return {"snapshot": None, "lines": []}
+    with open(CONSENSUS_FILE, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Paged CSV Reader
+Reads one page of a daily CSV without loading the file. A sparse index written
+next to each file (<file>.idx.json) records the byte offset of every
+CHECKPOINT_ROWS-th row and which game, bookmaker and market values occur in
+each chunk, so a page seeks straight to its chunk and filtered pages skip
+chunks that cannot match. Daily files are append-only, so the index is
+extended from where it stopped rather than rebuilt.
+"""
+
+import os
+import csv
+import json
+import tempfile
+
+CHECKPOINT_ROWS = 1000
+INDEX_VERSION = 1
+FILTER_COLUMNS = ('game_id', 'bookmaker', 'market')
+
+
+def index_path(csv_file):
+    return f"{csv_file}.idx.json"
+
+
+def _parse_line(line):
+    return next(csv.reader([line.decode('utf-8')]))
+
+
+def _empty_index(header, header_end):
+    return {"version": INDEX_VERSION, "header": header, "size": header_end, "rows": 0,
+            "chunks": []}  # [byte offset, {column: [values]}] per CHECKPOINT_ROWS rows
+
+
+def load_index(csv_file):
+    """Index covering the whole file, extending or rebuilding the stored one as needed"""
+    size = os.path.getsize(csv_file)
+    index = None
+    try:
+        with open(index_path(csv_file), 'r') as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION or index["size"] > size:
+            index = None  # File was replaced or truncated
+    except (OSError, ValueError, KeyError):
+        index = None
+
+    if index is not None and index["size"] == size:
+        return index
+
+    with open(csv_file, 'rb') as f:
+        if index is None:
+            header_line = f.readline()
+            index = _empty_index(_parse_line(header_line) if header_line else [], f.tell())
+        positions = [index["header"].index(column) if column in index["header"] else None
+                     for column in FILTER_COLUMNS]
+
+        # Reopen the last, possibly partial chunk so new rows land in it
+        f.seek(index["size"])
+        values = None
+        if index["chunks"] and index["rows"] % CHECKPOINT_ROWS:
+            values = {column: set(seen) for column, seen in index["chunks"][-1][1].items()}
+            index["chunks"][-1][1] = values
+
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break  # End of file, or a row still being written
+            if index["rows"] % CHECKPOINT_ROWS == 0:
+                values = {column: set() for column in FILTER_COLUMNS}
+                index["chunks"].append([offset, values])
+            row = _parse_line(line)
+            for column, position in zip(FILTER_COLUMNS, positions):
+                if position is not None and position < len(row):
+                    values[column].add(row[position])
+            index["rows"] += 1
+            index["size"] = f.tell()
+
+    for chunk in index["chunks"]:
+        chunk[1] = {column: sorted(seen) for column, seen in chunk[1].items()}
+    # Concurrent requests in any worker thread may rebuild the same index; each writes its own temp file
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path(csv_file)) or ".", suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_path, index_path(csv_file))
+    except OSError as e:
+        print(f"⚠️ Could not save CSV index for {csv_file}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return index
+
+
+def read_page(csv_file, offset=0, limit=100, filters=None, index=None):
+    """Header, up to `limit` matching rows after skipping `offset` of them, and whether more follow"""
+    filters = {column: value for column, value in (filters or {}).items() if value}
+    index = index or load_index(csv_file)
+    header = index["header"]
+    positions = {header.index(column): value for column, value in filters.items() if column in header}
+    if len(positions) < len(filters):
+        return header, [], False  # Filtering on a column this file does not have
+
+    # Chunks that can hold a match; without filters, skip whole chunks by row count
+    candidates = [i for i, (_, values) in enumerate(index["chunks"])
+                  if all(value in values.get(column, ()) for column, value in filters.items())]
+    if not filters and candidates:
+        skip_chunks = min(offset // CHECKPOINT_ROWS, len(candidates) - 1)
+        candidates = candidates[skip_chunks:]
+        offset -= skip_chunks * CHECKPOINT_ROWS
+
+    rows = []
+    with open(csv_file, 'rb') as f:
+        for chunk_number in candidates:
+            f.seek(index["chunks"][chunk_number][0])
+            chunk_rows = min(CHECKPOINT_ROWS, index["rows"] - chunk_number * CHECKPOINT_ROWS)
+            for _ in range(chunk_rows):
+                row = _parse_line(f.readline())
+                if any(position >= len(row) or row[position] != value for position, value in positions.items()):
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                if len(rows) == limit:
+                    return header, rows, True
+                rows.append(row)
+    return header, rows, False
+
+
+def filter_options(index):
+    """Distinct game, bookmaker and market values for the viewer's filter lists"""
+    options = {column: set() for column in FILTER_COLUMNS}
+    for _, values in index["chunks"]:
+        for column, seen in values.items():
+            options[column].update(seen)
+    return {column: sorted(values) for column, values in options.items()}
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Board Event Stream
+Tails the ingest event log once per process and fans new snapshots out to
+Server-Sent Events clients. Flask's threaded dev server streams /events
+itself; under gunicorn, where each stream would hold a worker thread, app.py
+runs this standalone asyncio server on EVENTS_PORT instead (only when that
+port is reachable, i.e. PORT is unset or EVENTS_PORT is given):
+
+    python3 event_stream.py --port 8098
+    EVENTS_PORT=8098 SERVE_MODE=production python3 app.py
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import deque
+
+from board_state import BOARD_EVENTS_FILE
+
+KEEPALIVE_SECONDS = 15
+DRAIN_TIMEOUT = 10  # seconds a client may take to accept a write before it is dropped
+POLL_INTERVAL = 1.0
+HISTORY = 256
+
+
+class BoardEventBroadcaster:
+    """One log reader shared by every subscriber; events are kept in a small ring for resumes"""
+
+    def __init__(self, path=BOARD_EVENTS_FILE, poll_interval=POLL_INTERVAL, history=HISTORY):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.events = deque(maxlen=history)  # (version, payload)
+        self.condition = threading.Condition()
+        self.latest_version = 0
+        self.offset = 0
+        self.inode = None
+        self._thread = None
+        self._read_new_events(notify=False)
+
+    def _tail_offset(self, size):
+        """Start of the last `maxlen` lines; older events would fall straight out of the ring"""
+        position, newlines = size, 0
+        with open(self.path, 'rb') as f:
+            while position > 0:
+                step = min(65536, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step)
+                end = len(chunk)
+                while (i := chunk.rfind(b"\n", 0, end)) >= 0:
+                    newlines += 1
+                    if newlines > self.events.maxlen:
+                        return position + i + 1
+                    end = i
+        return 0
+
+    def _read_new_events(self, notify=True):
+        """Append any lines written since the last read; returns True if there were new events"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        replaced = self.inode is not None and stat.st_ino != self.inode
+        if self.inode is None:
+            self.offset = self._tail_offset(stat.st_size)
+        elif replaced or stat.st_size < self.offset:
+            # Log was trimmed or replaced; it may still hold lines already read
+            self.offset = 0
+            replaced = True
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return False
+
+        new_events = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Partially written line; pick it up next time
+                self.offset += len(line.encode('utf-8'))
+                event = json.loads(line)
+                new_events.append((event["version"], json.dumps(
+                    {"version": event["version"], "snapshot": event["snapshot"], "changes": event["changes"]},
+                    separators=(',', ':'))))
+
+        if replaced:
+            versions = [version for version, _ in new_events]
+            if self.latest_version in versions:
+                new_events = new_events[versions.index(self.latest_version) + 1:]
+        if not new_events:
+            return False
+        with self.condition:
+            self.events.extend(new_events)
+            self.latest_version = new_events[-1][0]
+            if notify:
+                self.condition.notify_all()
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            self._read_new_events()
+
+    def start(self):
+        """Start the shared watcher thread on first use"""
+        with self.condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def events_after(self, version):
+        with self.condition:
+            return [event for event in self.events if event[0] > version]
+
+    def wait(self, version, timeout):
+        """Block until an event newer than `version` arrives or timeout passes"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.latest_version > version, timeout)
+        return self.events_after(version)
+
+
+def format_event(version, payload):
+    return f"id: {version}\nevent: snapshot\ndata: {payload}\n\n"
+
+
+def parse_last_event_id(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def sse_stream(broadcaster, last_version):
+    """Generator for a WSGI streaming response"""
+    broadcaster.start()
+    yield "retry: 5000\n\n"
+    while True:
+        events = broadcaster.wait(last_version, KEEPALIVE_SECONDS)
+        if not events:
+            yield ": keep-alive\n\n"
+            continue
+        for version, payload in events:
+            yield format_event(version, payload)
+            last_version = version
+
+
+async def _send(writer, data):
+    """Write to one client; a client that stops reading is dropped instead of stalling the others"""
+    writer.write(data)
+    await asyncio.wait_for(writer.drain(), DRAIN_TIMEOUT)
+
+
+async def _serve_client(broadcaster, changed, reader, writer):
+    try:
+        request_line = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2 or parts[1].split("?")[0] != "/events":
+            await _send(writer, b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+
+        await _send(writer, b"HTTP/1.1 200 OK\r\n"
+                            b"Content-Type: text/event-stream\r\n"
+                            b"Cache-Control: no-cache\r\n"
+                            b"Access-Control-Allow-Origin: *\r\n"
+                            b"Connection: keep-alive\r\n\r\n"
+                            b"retry: 5000\n\n")
+
+        last_version = parse_last_event_id(headers.get("last-event-id"), broadcaster.latest_version)
+        while True:
+            # The condition only guards the wait; checking again under it means a notify can't slip by
+            async with changed:
+                events = broadcaster.events_after(last_version)
+                if not events:
+                    try:
+                        await asyncio.wait_for(changed.wait(), KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                    events = broadcaster.events_after(last_version)
+            if not events:
+                await _send(writer, b": keep-alive\n\n")
+                continue
+            batch = "".join(format_event(version, payload) for version, payload in events)
+            await _send(writer, batch.encode('utf-8'))
+            last_version = events[-1][0]
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, path=BOARD_EVENTS_FILE):
+    """Single-threaded SSE server: idle clients cost a socket and a coroutine, not a thread"""
+    broadcaster = BoardEventBroadcaster(path)
+    changed = asyncio.Condition()
+
+    async def tail():
+        while True:
+            await asyncio.sleep(broadcaster.poll_interval)
+            if broadcaster._read_new_events():
+                async with changed:
+                    changed.notify_all()
+
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_client(broadcaster, changed, reader, writer), host, port)
+    print(f"📡 Board events at http://{host}:{port}/events")
+    async with server:
+        await asyncio.gather(server.serve_forever(), tail())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server-Sent Events stream of board changes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("EVENTS_PORT", 8098)))
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n🛑 Event stream stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Synthetic Season Generator
+Builds a realistic full NFL season (272 games, 10+ books, random-walk line moves)
+at a configurable polling density and runs every poll through the real ingest
+pipeline, so dashboard and ingest behaviour can be measured at week 18 scale.
+
+Usage:
+    python3 generate_season.py --output-dir season_data --interval-minutes 60
+"""
+
+import os
+import time
+import random
+import hashlib
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from mock_odds_server import NFL_TEAMS, BOOKMAKERS, SyntheticBoard, round_half
+
+SEASON_WEEKS = 18
+SEASON_GAMES = 272
+# Thursday night, Sunday early/late/night, Monday night (UTC)
+KICKOFF_SLOTS = [(0, 0, 15), (3, 17, 0), (3, 20, 5), (3, 20, 25), (4, 0, 20), (5, 0, 15)]
+SLOT_WEIGHTS = [1, 9, 3, 1, 1, 1]
+
+
+def season_schedule(season_start, rng, n_games=SEASON_GAMES, weeks=SEASON_WEEKS):
+    """Spread n_games over the season's weeks with realistic kickoff slots"""
+    games = []
+    per_week = [n_games // weeks + (1 if week < n_games % weeks else 0) for week in range(weeks)]
+    for week, count in enumerate(per_week):
+        teams = NFL_TEAMS[:]
+        rng.shuffle(teams)
+        week_start = season_start + timedelta(weeks=week)
+        slots = sorted(rng.choices(KICKOFF_SLOTS, weights=SLOT_WEIGHTS, k=count))
+        for i, (day, hour, minute) in enumerate(slots):
+            home, away = teams[2 * i], teams[2 * i + 1]
+            games.append({
+                'id': hashlib.md5(f"{week}-{home}-{away}".encode()).hexdigest(),
+                'commence_time': week_start + timedelta(days=day, hours=hour, minutes=minute),
+                'home_team': home,
+                'away_team': away,
+                'spread': round_half(rng.gauss(-2.5, 5.5)),
+                'total': round_half(rng.gauss(44.5, 4))
+            })
+    return games
+
+
+def generate_season(output_dir, interval_minutes=60, n_books=10, n_games=SEASON_GAMES,
+                    weeks=SEASON_WEEKS, seed=2025, horizon_days=7, season_start=None):
+    """Poll a synthetic season into output_dir; returns (polls, seconds spent in ingest)"""
+    season_start = season_start or datetime(2025, 9, 4, 0, 0, tzinfo=timezone.utc)
+    rng = random.Random(seed)
+    games = season_schedule(season_start, rng, n_games, weeks)
+    board = SyntheticBoard(n_books=n_books, seed=seed, start=season_start - timedelta(days=horizon_days),
+                           games=games)
+    horizon = timedelta(days=horizon_days)
+    season_end = max(game['commence_time'] for game in games)
+
+    # Imported after chdir so every state file lands in output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    previous_dir = os.getcwd()
+    os.chdir(output_dir)
+    try:
+        from nfl_odds_logger import ingest_snapshot
+
+        polls = 0
+        ingest_seconds = 0.0
+        while board.now < season_end:
+            board.step(interval_minutes, horizon=horizon)
+            data = board.response(horizon)
+            if not data:
+                continue
+            fetched_at = board.now
+            start = time.perf_counter()
+            ingest_snapshot(data, fetched_at)
+            ingest_seconds += time.perf_counter() - start
+            polls += 1
+    finally:
+        os.chdir(previous_dir)
+
+    return polls, ingest_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic NFL odds season")
+    parser.add_argument("--output-dir", default="season_data")
+    parser.add_argument("--interval-minutes", type=int, default=60, help="Minutes between polls")
+    parser.add_argument("--books", type=int, default=10, help=f"Bookmakers per game (max {len(BOOKMAKERS)})")
+    parser.add_argument("--games", type=int, default=SEASON_GAMES)
+    parser.add_argument("--weeks", type=int, default=SEASON_WEEKS)
+    parser.add_argument("--horizon-days", type=int, default=7, help="How far ahead games appear on the board")
+    parser.add_argument("--seed", type=int, default=2025)
+    args = parser.parse_args()
+
+    print(f"🏈 Generating {args.games} games x {args.books} books over {args.weeks} weeks "
+          f"(poll every {args.interval_minutes} min) into {args.output_dir}/")
+    polls, ingest_seconds = generate_season(args.output_dir, args.interval_minutes, args.books,
+                                            args.games, args.weeks, args.seed, args.horizon_days)
+    print(f"✅ {polls} polls ingested in {ingest_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
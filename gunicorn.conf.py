@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for the production serving mode (python3 app.py --production)
+Workers share parsed data through shared_cache.py, so each one stays small
+"""
+
+import os
+import multiprocessing
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# The app modules live next to this file even when serving from another data directory
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Hold Tracker
+Every ingest computes each book's hold (implied probabilities of a market's
+outcomes summed, minus 1) for every game and market in the snapshot, and folds
+it into a SQLite file:
+
+    hold_lines   one row per (game, bookmaker, market): opening, latest, low
+                 and high hold and the number of snapshots seen
+    hold_rollup  running sum, count, low and high per (bookmaker, market) for
+                 each poll hour and for each time-to-kickoff bucket
+
+Aggregates by day, hour or time to kickoff are read straight from the rollup,
+so answering them never rescans the stored history.
+"""
+
+import os
+import sqlite3
+import numpy as np
+from contextlib import closing
+
+from odds_math import american_to_probability
+from closing_lines import poll_times_utc, commence_times_utc
+
+HOLD_DB = os.environ.get("HOLD_DB", "hold_tracker.sqlite3")
+
+# Hours before kickoff; a book tightening near kickoff shows up as a falling hold across these
+KICKOFF_EDGES = [0, 1, 3, 6, 12, 24, 48, 96, 168]
+KICKOFF_BUCKETS = ["0-1h", "1-3h", "3-6h", "6-12h", "12-24h", "24-48h", "48-96h", "96-168h", "168h+"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hold_lines (
+    game_id TEXT NOT NULL, bookmaker TEXT NOT NULL, market TEXT NOT NULL, commence_time TEXT,
+    open_hold REAL NOT NULL, hold REAL NOT NULL, min_hold REAL NOT NULL, max_hold REAL NOT NULL,
+    samples INTEGER NOT NULL, first_seen TEXT NOT NULL, updated TEXT NOT NULL,
+    PRIMARY KEY (game_id, bookmaker, market));
+CREATE TABLE IF NOT EXISTS hold_rollup (
+    bookmaker TEXT NOT NULL, market TEXT NOT NULL, kind TEXT NOT NULL, bucket TEXT NOT NULL,
+    total REAL NOT NULL, samples INTEGER NOT NULL, min_hold REAL NOT NULL, max_hold REAL NOT NULL,
+    PRIMARY KEY (bookmaker, market, kind, bucket));
+"""
+
+
+def connect(path=HOLD_DB):
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def compute_holds(snapshot, timestamp):
+    """One row per (game, bookmaker, market) with its hold and time-to-kickoff bucket"""
+    df = snapshot.assign(implied_prob=american_to_probability(snapshot['price'].to_numpy(dtype=np.float64)))
+    holds = df.groupby(['game_id', 'bookmaker', 'market'], sort=False).agg(
+        commence_time=('commence_time', 'first'), hold=('implied_prob', 'sum'),
+        outcomes=('implied_prob', 'size')).reset_index()
+    holds = holds[(holds['outcomes'] >= 2) & holds['hold'].notna()]
+    hours = (commence_times_utc(holds['commence_time']) - poll_times_utc([timestamp]).iloc[0]) \
+        .dt.total_seconds().to_numpy() / 3600
+    bucket = np.searchsorted(KICKOFF_EDGES, hours, side='right') - 1
+    return holds.assign(hold=holds['hold'] - 1.0,
+                        kickoff=np.where(bucket < 0, "live", np.array(KICKOFF_BUCKETS)[np.maximum(bucket, 0)]))
+
+
+def _rollup_rows(holds, kind, bucket):
+    grouped = holds.groupby(['bookmaker', 'market', bucket], sort=False)['hold']
+    stats = grouped.agg(['sum', 'size', 'min', 'max']).reset_index()
+    return [(book, market, kind, label, total, int(count), low, high)
+            for book, market, label, total, count, low, high in stats.itertuples(index=False, name=None)]
+
+
+def record_holds(snapshot, timestamp):
+    """Fold this snapshot's holds into the per-line table and the rollups"""
+    holds = compute_holds(snapshot, timestamp)
+    if holds.empty:
+        return holds
+    holds = holds.assign(hour=timestamp[:13])
+    lines = [(game_id, book, market, commence, hold, hold, hold, hold, 1, timestamp, timestamp)
+             for game_id, book, market, commence, hold in
+             holds[['game_id', 'bookmaker', 'market', 'commence_time', 'hold']].itertuples(index=False, name=None)]
+    rollups = _rollup_rows(holds, 'hour', 'hour') + _rollup_rows(holds, 'kickoff', 'kickoff')
+
+    with closing(connect()) as connection, connection:
+        connection.executemany(
+            "INSERT INTO hold_lines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (game_id, bookmaker, market) DO UPDATE SET hold = excluded.hold, "
+            "min_hold = min(min_hold, excluded.hold), max_hold = max(max_hold, excluded.hold), "
+            "samples = samples + 1, updated = excluded.updated", lines)
+        connection.executemany(
+            "INSERT INTO hold_rollup VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (bookmaker, market, kind, bucket) DO UPDATE SET total = total + excluded.total, "
+            "samples = samples + excluded.samples, min_hold = min(min_hold, excluded.min_hold), "
+            "max_hold = max(max_hold, excluded.max_hold)", rollups)
+    return holds
+
+
+def hold_aggregates(by='day', market=None, book=None):
+    """Mean, low and high hold per (bookmaker, market, bucket); by is day, hour or kickoff"""
+    kind, bucket = {'day': ('hour', "substr(bucket, 1, 10)"), 'hour': ('hour', "bucket"),
+                    'kickoff': ('kickoff', "bucket")}[by]
+    query = (f"SELECT bookmaker, market, {bucket} AS period, sum(total) / sum(samples), min(min_hold), "
+             f"max(max_hold), sum(samples) FROM hold_rollup WHERE kind = ?")
+    params = [kind]
+    if market:
+        query += " AND market = ?"
+        params.append(market)
+    if book:
+        query += " AND bookmaker = ?"
+        params.append(book)
+    query += " GROUP BY bookmaker, market, period ORDER BY bookmaker, market, period"
+
+    if not os.path.exists(HOLD_DB):
+        return []
+    with closing(connect()) as connection:
+        rows = connection.execute(query, params).fetchall()
+    order = {label: i for i, label in enumerate(["live"] + KICKOFF_BUCKETS)}
+    if by == 'kickoff':
+        rows.sort(key=lambda row: (row[0], row[1], order.get(row[2], len(order))))
+    return [{"bookmaker": book, "market": market, "period": period, "mean_hold": round(mean, 5),
+             "min_hold": round(low, 5), "max_hold": round(high, 5), "samples": samples}
+            for book, market, period, mean, low, high, samples in rows]
+
+
+def game_holds(game_id):
+    """Opening, latest, low and high hold per bookmaker and market for one game"""
+    if not os.path.exists(HOLD_DB):
+        return []
+    with closing(connect()) as connection:
+        connection.row_factory = sqlite3.Row
+        rows = connection.execute("SELECT * FROM hold_lines WHERE game_id = ? ORDER BY market, hold",
+                                  (game_id,)).fetchall()
+    return [dict(row) for row in rows]
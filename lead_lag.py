@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Book Lead-Lag Analysis
+Batch job over stored daily CSVs. For every game and market, each book's line
+(home spread, total, or home no-vig probability for h2h) is forward-filled onto
+a common time grid. Two measures come out of the aligned matrix:
+
+    cross-correlation  each book's line changes against the average change of
+                       all other books at lags -max_lag..max_lag; correlation
+                       at positive lags means the book moved first
+    first movers       moves where one or more books change direction-alike
+                       first and at least MIN_FOLLOWERS others follow within
+                       the follow window; the first books get the credit
+
+Both are array operations over books x grid steps, so each book is compared
+with the rest of the market once rather than with every other book. Games are
+spread over a process pool and the per-game results are rolled up into a
+season leaderboard.
+
+Usage:
+    python3 lead_lag.py nfl_odds_*.csv --grid-minutes 15 --output lead_lag.json
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from odds_math import attach_fair_odds
+from closing_lines import poll_times_utc
+
+LEADERBOARD_FILE = "lead_lag_leaderboard.json"
+GRID_MINUTES = 15
+MAX_LAG = 8            # grid steps each way for the cross-correlation
+FOLLOW_WINDOW = 4      # grid steps other books have to follow a first move
+MIN_FOLLOWERS = 2
+MIN_BOOKS = 3
+
+
+def line_series(history):
+    """One value per (timestamp, game, market, book): home spread, total, or home no-vig h2h probability"""
+    history = history.assign(point=pd.to_numeric(history['point'], errors='coerce'))
+    h2h = attach_fair_odds(history[history['market'] == 'h2h'])
+    parts = [
+        history[(history['market'] == 'spreads') & (history['outcome_name'] == history['home_team'])]
+        .assign(value=lambda df: df['point']),
+        history[(history['market'] == 'totals') & (history['outcome_name'] == 'Over')]
+        .assign(value=lambda df: df['point']),
+        h2h[h2h['outcome_name'] == h2h['home_team']].assign(value=lambda df: df['fair_prob']),
+    ]
+    series = pd.concat(parts, ignore_index=True)[['timestamp', 'game_id', 'market', 'bookmaker', 'value']]
+    series['timestamp'] = poll_times_utc(series['timestamp'])
+    return series.dropna(subset=['value'])
+
+
+def aligned_matrix(series, grid_minutes):
+    """Books x grid steps of forward-filled values for one (game, market)"""
+    wide = series.pivot_table(index='timestamp', columns='bookmaker', values='value', aggfunc='last')
+    grid = pd.date_range(wide.index.min().floor(f'{grid_minutes}min'), wide.index.max(),
+                         freq=f'{grid_minutes}min')
+    wide = wide.reindex(wide.index.union(grid)).ffill().reindex(grid)
+    return list(wide.columns), wide.to_numpy(dtype=np.float64).T
+
+
+def _window_any_after(moves, window):
+    """[b, t] is True if book b moves in (t, t + window]"""
+    padded = np.concatenate([np.zeros((moves.shape[0], 1)), np.cumsum(moves, axis=1)], axis=1)
+    steps = moves.shape[1]
+    end = np.minimum(np.arange(steps) + window, steps - 1)
+    return (padded[:, end + 1] - padded[:, np.arange(steps) + 1]) > 0
+
+
+def _window_any_before(moves, window):
+    """[t] is True if any book moved in [t - window, t)"""
+    any_move = moves.any(axis=0).astype(np.int64)
+    padded = np.concatenate([[0], np.cumsum(any_move)])
+    steps = len(any_move)
+    start = np.maximum(np.arange(steps) - window, 0)
+    return (padded[np.arange(steps)] - padded[start]) > 0
+
+
+def _next_move(moves):
+    """[b, t] is the first step after t at which book b moves (or a large sentinel)"""
+    books, steps = moves.shape
+    index = np.where(moves, np.arange(steps), steps * 2)
+    following = np.minimum.accumulate(index[:, ::-1], axis=1)[:, ::-1]
+    return np.concatenate([following[:, 1:], np.full((books, 1), steps * 2)], axis=1)
+
+
+def first_movers(values, follow_window=FOLLOW_WINDOW, min_followers=MIN_FOLLOWERS):
+    """Per book: moves led, moves followed, and summed follow lag in grid steps"""
+    changes = np.diff(values, axis=1)
+    changes = np.where(np.isnan(changes), 0.0, changes)
+    led = np.zeros(values.shape[0])
+    followed = np.zeros(values.shape[0])
+    lag_total = np.zeros(values.shape[0])
+    for sign in (1.0, -1.0):
+        moves = np.sign(changes) == sign
+        if not moves.any():
+            continue
+        after = _window_any_after(moves, follow_window)
+        followers = after & ~moves
+        starts = moves.any(axis=0) & ~_window_any_before(moves, follow_window) & \
+            (followers.sum(axis=0) >= min_followers)
+        led += (moves & starts).sum(axis=1)
+        following = followers & starts
+        followed += following.sum(axis=1)
+        lag = _next_move(moves) - np.arange(moves.shape[1])
+        lag_total += np.where(following, lag, 0).sum(axis=1)
+    return led, followed, lag_total
+
+
+def cross_correlations(values, max_lag=MAX_LAG):
+    """Books x (2 * max_lag + 1) correlation of each book's changes with the rest of the market's, by lag"""
+    changes = np.diff(values, axis=1)
+    changes = np.where(np.isnan(changes), 0.0, changes)
+    books, steps = changes.shape
+    others = (changes.sum(axis=0) - changes) / max(books - 1, 1)
+    result = np.full((books, 2 * max_lag + 1), np.nan)
+    for i, lag in enumerate(range(-max_lag, max_lag + 1)):
+        # Positive lag: the book's change at t against the others' change at t + lag
+        if lag >= 0:
+            mine, theirs = changes[:, :steps - lag], others[:, lag:]
+        else:
+            mine, theirs = changes[:, -lag:], others[:, :steps + lag]
+        if mine.shape[1] < 2:
+            continue
+        mine = mine - mine.mean(axis=1, keepdims=True)
+        theirs = theirs - theirs.mean(axis=1, keepdims=True)
+        denominator = np.sqrt((mine ** 2).sum(axis=1) * (theirs ** 2).sum(axis=1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[:, i] = np.where(denominator > 0, (mine * theirs).sum(axis=1) / denominator, np.nan)
+    return result
+
+
+def analyze_game(args):
+    """Lead-lag rows for every market of one game; runs in a worker process"""
+    game_series, grid_minutes, max_lag, follow_window, min_followers = args
+    rows = []
+    for market, series in game_series.groupby('market'):
+        books, values = aligned_matrix(series, grid_minutes)
+        if len(books) < MIN_BOOKS or values.shape[1] < 3:
+            continue
+        led, followed, lag_total = first_movers(values, follow_window, min_followers)
+        correlations = cross_correlations(values, max_lag)
+        for i, book in enumerate(books):
+            rows.append({'bookmaker': book, 'market': market, 'led': led[i], 'followed': followed[i],
+                         'lag_total': lag_total[i], 'correlations': correlations[i]})
+    return rows
+
+
+def leaderboard(rows, grid_minutes, max_lag):
+    """Season roll-up per book, most frequent leader first"""
+    if not rows:
+        return []
+    df = pd.DataFrame(rows)
+    lags = np.arange(-max_lag, max_lag + 1)
+    board = []
+    for book, group in df.groupby('bookmaker'):
+        correlations = np.vstack(group['correlations'].to_numpy())
+        with np.errstate(invalid='ignore'):
+            mean_corr = np.nanmean(correlations, axis=0) if np.isfinite(correlations).any() else np.full(len(lags), np.nan)
+        led, followed = group['led'].sum(), group['followed'].sum()
+        peak = int(lags[np.nanargmax(mean_corr)]) if np.isfinite(mean_corr).any() else None
+        board.append({
+            'bookmaker': book,
+            'series': len(group),
+            'moves_led': int(led),
+            'moves_followed': int(followed),
+            'lead_rate': round(led / (led + followed), 4) if led + followed else None,
+            'mean_follow_lag_minutes': round(group['lag_total'].sum() / followed * grid_minutes, 1) if followed else None,
+            'peak_lag_minutes': peak * grid_minutes if peak is not None else None,
+            'lead_score': round(float(np.nanmean(mean_corr[lags > 0]) - np.nanmean(mean_corr[lags < 0])), 4)
+            if np.isfinite(mean_corr).any() else None,
+        })
+    return sorted(board, key=lambda row: (row['lead_rate'] or 0, row['lead_score'] or 0), reverse=True)
+
+
+def run(csv_files, grid_minutes=GRID_MINUTES, max_lag=MAX_LAG, follow_window=FOLLOW_WINDOW,
+        min_followers=MIN_FOLLOWERS, workers=None):
+    columns = ['timestamp', 'game_id', 'home_team', 'bookmaker', 'market', 'outcome_name', 'price', 'point']
+    history = pd.concat([pd.read_csv(path, usecols=columns) for path in csv_files], ignore_index=True)
+    series = line_series(history)
+    jobs = [(group, grid_minutes, max_lag, follow_window, min_followers) for _, group in series.groupby('game_id')]
+    print(f"🔬 {len(jobs)} games, {series['bookmaker'].nunique()} books, {len(series):,} line points")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for game_rows in pool.map(analyze_game, jobs, chunksize=max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))):
+            rows.extend(game_rows)
+    return leaderboard(rows, grid_minutes, max_lag)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Which books move first: season lead-lag leaderboard")
+    parser.add_argument("csv_files", nargs="+")
+    parser.add_argument("--grid-minutes", type=int, default=GRID_MINUTES)
+    parser.add_argument("--max-lag", type=int, default=MAX_LAG, help="Grid steps each way for cross-correlation")
+    parser.add_argument("--follow-window", type=int, default=FOLLOW_WINDOW, help="Grid steps for books to follow")
+    parser.add_argument("--min-followers", type=int, default=MIN_FOLLOWERS)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default=LEADERBOARD_FILE)
+    args = parser.parse_args()
+
+    board = run(args.csv_files, args.grid_minutes, args.max_lag, args.follow_window, args.min_followers, args.workers)
+    print(f"{'book':<18} {'led':>6} {'followed':>9} {'lead rate':>10} {'follow lag':>11} {'peak lag':>9} {'score':>7}")
+    for row in board:
+        def show(value, suffix=''):
+            return '-' if value is None else f"{value}{suffix}"
+        print(f"{row['bookmaker']:<18} {row['moves_led']:>6} {row['moves_followed']:>9} {show(row['lead_rate']):>10} "
+              f"{show(row['mean_follow_lag_minutes'], 'm'):>11} {show(row['peak_lag_minutes'], 'm'):>9} "
+              f"{show(row['lead_score']):>7}")
+    with open(args.output, 'w') as f:
+        json.dump({"grid_minutes": args.grid_minutes, "books": board}, f, indent=2)
+    print(f"💾 Leaderboard written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ REGION = "us"  # "us", "uk", "au", "eu"
 MARKETS = "h2h,spreads,totals"  # moneyline, spreads, totals
 ODDS_FORMAT = "american"  # "american" or "decimal"
 DATE_FORMAT = "%Y-%m-%d"
+# Point at mock_odds_server.py for offline runs, e.g. http://localhost:8099
+API_BASE_URL = os.environ.get("ODDS_API_BASE_URL", "https://api.the-odds-api.com")
+REQUEST_TIMEOUT = float(os.environ.get("ODDS_API_TIMEOUT", 30))  # seconds
 # Key bookmakers to track (Pinnacle is crucial for line movements)
 BOOKMAKERS = "pinnacle,betmgm,draftkings,fanduel,caesars,bovada"
 
@@ -20,7 +23,7 @@ BOOKMAKERS = "pinnacle,betmgm,draftkings,fanduel,caesars,bovada"
 # FUNCTIONS
 # -------------------------
 def fetch_odds():
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/odds/"
+    url = f"{API_BASE_URL}/v4/sports/{SPORT}/odds/"
     params = {
         "apiKey": API_KEY,
         "regions": REGION,
@@ -28,7 +31,11 @@ def fetch_odds():
         "oddsFormat": ODDS_FORMAT,
         "bookmakers": BOOKMAKERS,  # Specify key bookmakers including Pinnacle
     }
-    response = requests.get(url, params=params)
+    try:
+        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print("Error:", e)
+        return None
 
     if response.status_code != 200:
         print("Error:", response.status_code, response.text)
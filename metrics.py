@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Request and Stage Metrics
+Latency histograms, cache hit counters and ingest run durations, rendered in
+the Prometheus text exposition format for GET /metrics. Each web worker keeps
+its own counts in memory and writes them to metrics_worker_<pid>_<start>.json
+at most every METRICS_FLUSH_SECONDS; /metrics sums every worker's file, so the
+scrape covers all gunicorn workers whichever one answers it. Files of workers
+that have exited are folded into metrics_totals.json and deleted at the scrape.
+"""
+
+import os
+import glob
+import json
+import time
+import fcntl
+import threading
+from contextlib import contextmanager
+
+# Prometheus client default buckets (seconds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Written by the ingest process, read by the web process
+INGEST_METRICS_FILE = "ingest_metrics.json"
+
+# One file per live worker process; exited workers' counts move to the totals so counters never go back
+WORKER_METRICS_PATTERN = "metrics_worker_*.json"
+TOTALS_FILE = "metrics_totals.json"
+FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", 1.0))
+
+_lock = threading.Lock()
+_histograms = {}  # (metric, labels) -> [bucket counts..., +Inf count, sum]
+_counters = {}    # (metric, labels) -> value
+_worker = {"pid": None, "path": None, "flushed": 0.0, "pending": False}
+_help = {
+    "nfl_http_request_duration_seconds": ("histogram", "Request latency by route"),
+    "nfl_stage_duration_seconds": ("histogram", "Time spent in named dashboard stages"),
+    "nfl_cache_requests_total": ("counter", "Cache lookups by cache and result"),
+    "nfl_ingest_duration_seconds": ("histogram", "Ingest pipeline run duration"),
+    "nfl_ingest_rows_total": ("counter", "Rows flattened by ingest runs"),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _new_histogram():
+    return [0] * (len(BUCKETS) + 1) + [0.0]
+
+
+def _add_to_histogram(histogram, seconds):
+    for i, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            histogram[i] += 1
+    histogram[len(BUCKETS)] += 1
+    histogram[-1] += seconds
+
+
+def observe(metric, seconds, **labels):
+    """Record one observation in a histogram"""
+    key = (metric, _labels_key(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _new_histogram()
+        _add_to_histogram(histogram, seconds)
+
+
+def increment(metric, amount=1, **labels):
+    """Increase a counter"""
+    key = (metric, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+@contextmanager
+def timer(stage):
+    """Time a named stage of request handling, e.g. read, organize, movement, render"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("nfl_stage_duration_seconds", time.perf_counter() - start, stage=stage)
+
+
+def record_cache(cache, hit):
+    """Count a cache lookup so hit rates can be derived"""
+    increment("nfl_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def record_ingest_run(seconds, rows):
+    """Persist an ingest run duration; ingest runs in its own process so this goes to disk"""
+    state = {"histogram": _new_histogram(), "rows": 0, "last_seconds": 0.0, "last_run": 0.0}
+    if os.path.exists(INGEST_METRICS_FILE):
+        try:
+            with open(INGEST_METRICS_FILE, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            pass
+    _add_to_histogram(state["histogram"], seconds)
+    state["rows"] += rows
+    state["last_seconds"] = seconds
+    state["last_run"] = time.time()
+    tmp_path = f"{INGEST_METRICS_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, INGEST_METRICS_FILE)
+
+
+def _worker_path():
+    """This process's metrics file; a forked worker gets its own"""
+    if _worker["pid"] != os.getpid():
+        _worker.update(pid=os.getpid(), path=f"metrics_worker_{os.getpid()}_{int(time.time())}.json",
+                       flushed=0.0, pending=False)
+    return _worker["path"]
+
+
+def flush(force=False):
+    """Write this worker's counts for the other workers' /metrics, at most every FLUSH_SECONDS"""
+    now = time.time()
+    path = _worker_path()
+    if not force and now - _worker["flushed"] < FLUSH_SECONDS:
+        # A worker that goes quiet still publishes its last requests once the interval is up
+        if not _worker["pending"]:
+            _worker["pending"] = True
+            timer = threading.Timer(FLUSH_SECONDS, flush, kwargs={"force": True})
+            timer.daemon = True
+            timer.start()
+        return
+    _worker["pending"] = False
+    with _lock:
+        state = {"histograms": [[metric, labels, value] for (metric, labels), value in _histograms.items()],
+                 "counters": [[metric, labels, value] for (metric, labels), value in _counters.items()]}
+    _worker["flushed"] = now
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _load_counts(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _add_counts(histograms, counters, state):
+    for metric, labels, value in state["histograms"]:
+        key = (metric, tuple(tuple(pair) for pair in labels))
+        total = histograms.setdefault(key, _new_histogram())
+        histograms[key] = [a + b for a, b in zip(total, value)]
+    for metric, labels, value in state["counters"]:
+        key = (metric, tuple(tuple(pair) for pair in labels))
+        counters[key] = counters.get(key, 0) + value
+
+
+def _worker_alive(path):
+    pid = int(os.path.basename(path).split("_")[2])
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OverflowError):
+        pass
+    return True
+
+
+def _fold_exited_workers():
+    """Add the files of workers that have exited into the totals file, then delete them"""
+    exited = [path for path in glob.glob(WORKER_METRICS_PATTERN) if not _worker_alive(path)]
+    if not exited:
+        return
+    histograms, counters = {}, {}
+    for path in [TOTALS_FILE] + exited:
+        state = _load_counts(path)
+        if state:
+            _add_counts(histograms, counters, state)
+    tmp_path = f"{TOTALS_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"histograms": [[metric, labels, value] for (metric, labels), value in histograms.items()],
+                   "counters": [[metric, labels, value] for (metric, labels), value in counters.items()]}, f)
+    os.replace(tmp_path, TOTALS_FILE)
+    for path in exited:
+        os.remove(path)
+
+
+def _read_workers():
+    """Histograms and counters summed over exited workers' totals and every live worker's file"""
+    histograms, counters = {}, {}
+    # Scrapes in different workers take turns, so a file is never folded twice or counted alongside its total
+    with open(f"{TOTALS_FILE}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            _fold_exited_workers()
+        except OSError as e:
+            print(f"⚠️ Could not fold exited workers' metrics: {e}")
+        for path in [TOTALS_FILE] + glob.glob(WORKER_METRICS_PATTERN):
+            state = _load_counts(path)
+            if state:
+                _add_counts(histograms, counters, state)
+    return histograms, counters
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + list(extra or [])
+    if not pairs:
+        return ""
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _render_histogram(lines, metric, labels, histogram):
+    for i, bound in enumerate(BUCKETS):
+        lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {histogram[i]}")
+    lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram[len(BUCKETS)]}")
+    lines.append(f"{metric}_sum{_format_labels(labels)} {histogram[-1]:.6f}")
+    lines.append(f"{metric}_count{_format_labels(labels)} {histogram[len(BUCKETS)]}")
+
+
+def render():
+    """All metrics in Prometheus text format, summed over every web worker"""
+    flush(force=True)
+    histograms, counters = _read_workers()
+
+    if os.path.exists(INGEST_METRICS_FILE):
+        try:
+            with open(INGEST_METRICS_FILE, 'r') as f:
+                ingest = json.load(f)
+            histograms[("nfl_ingest_duration_seconds", ())] = ingest["histogram"]
+            counters[("nfl_ingest_rows_total", ())] = ingest["rows"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    lines = []
+    for metric, (kind, description) in _help.items():
+        series = [(labels, value) for (name, labels), value in (histograms if kind == "histogram" else counters).items()
+                  if name == metric]
+        if not series:
+            continue
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for labels, value in sorted(series):
+            if kind == "histogram":
+                _render_histogram(lines, metric, labels, value)
+            else:
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app):
+    """Time every request by route template and serve /metrics"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request_time(response):
+        start = getattr(g, "metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            observe("nfl_http_request_duration_seconds", time.perf_counter() - start,
+                    route=route, method=request.method, status=response.status_code)
+        flush()
+        return response
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus scrape endpoint; other workers' counts are at most METRICS_FLUSH_SECONDS old"""
+        return Response(render(), mimetype="text/plain; version=0.0.4")
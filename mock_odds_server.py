@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Local Odds API Stand-in
+Serves recorded or synthetic /v4/sports/{sport}/odds/ responses with configurable
+latency, payload size, quota headers and error injection, so ingest and the
+scheduler can be exercised without network access or API credits.
+
+Usage:
+    python3 mock_odds_server.py --games 16 --books 10 --latency-ms 250
+    ODDS_API_BASE_URL=http://localhost:8099 python3 nfl_odds_logger.py
+"""
+
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+NFL_TEAMS = [
+    "Arizona Cardinals", "Atlanta Falcons", "Baltimore Ravens", "Buffalo Bills",
+    "Carolina Panthers", "Chicago Bears", "Cincinnati Bengals", "Cleveland Browns",
+    "Dallas Cowboys", "Denver Broncos", "Detroit Lions", "Green Bay Packers",
+    "Houston Texans", "Indianapolis Colts", "Jacksonville Jaguars", "Kansas City Chiefs",
+    "Las Vegas Raiders", "Los Angeles Chargers", "Los Angeles Rams", "Miami Dolphins",
+    "Minnesota Vikings", "New England Patriots", "New Orleans Saints", "New York Giants",
+    "New York Jets", "Philadelphia Eagles", "Pittsburgh Steelers", "San Francisco 49ers",
+    "Seattle Seahawks", "Tampa Bay Buccaneers", "Tennessee Titans", "Washington Commanders"
+]
+
+BOOKMAKERS = [
+    ("draftkings", "DraftKings"), ("fanduel", "FanDuel"), ("betmgm", "BetMGM"),
+    ("williamhill_us", "Caesars"), ("bovada", "Bovada"), ("betus", "BetUS"),
+    ("betonlineag", "BetOnline.ag"), ("mybookieag", "MyBookie.ag"), ("lowvig", "LowVig.ag"),
+    ("betrivers", "BetRivers"), ("pinnacle", "Pinnacle"), ("espnbet", "ESPN BET")
+]
+
+ODDS_PATH = re.compile(r"^/v4/sports/(?P<sport>[^/]+)/odds/?$")
+
+
+def probability_to_american(probability):
+    """Convert a win probability to an American price"""
+    probability = min(max(probability, 0.01), 0.99)
+    if probability >= 0.5:
+        return -int(round(100 * probability / (1 - probability)))
+    return int(round(100 * (1 - probability) / probability))
+
+
+def spread_win_probability(spread):
+    """Rough win probability of the side laying `spread` points (negative = favorite)"""
+    return 0.5 * (1 + math.erf(-spread / (13.5 * math.sqrt(2))))
+
+
+def round_half(value):
+    """Lines move in half points"""
+    return round(value * 2) / 2
+
+
+class SyntheticBoard:
+    """A random-walk NFL board that produces Odds API shaped responses"""
+
+    def __init__(self, n_games=16, n_books=10, seed=None, start=None, games=None):
+        self.rng = random.Random(seed)
+        self.now = start or datetime.now(timezone.utc).replace(microsecond=0)
+        self.books = BOOKMAKERS[:n_books]
+        self.games = games or self._make_games(n_games)
+
+        # Each book shades the market consensus by a small fixed amount
+        self.lines = {}
+        for game in self.games:
+            for book_key, _ in self.books:
+                self.lines[(game['id'], book_key)] = {
+                    'spread': round_half(game['spread'] + self.rng.choice([-0.5, 0, 0, 0, 0.5])),
+                    'total': round_half(game['total'] + self.rng.choice([-0.5, 0, 0, 0.5])),
+                    'juice': self.rng.choice([-115, -112, -110, -110, -110, -108, -105]),
+                    'last_update': self.now
+                }
+
+    def _make_games(self, n_games):
+        teams = NFL_TEAMS[:]
+        self.rng.shuffle(teams)
+        games = []
+        for i in range(n_games):
+            home, away = teams[(2 * i) % len(teams)], teams[(2 * i + 1) % len(teams)]
+            games.append({
+                'id': hashlib.md5(f"{home}-{away}-{i}-{self.rng.random()}".encode()).hexdigest(),
+                'commence_time': self.now + timedelta(days=3, hours=i % 4 * 3),
+                'home_team': home,
+                'away_team': away,
+                'spread': round_half(self.rng.gauss(-2.5, 5)),
+                'total': round_half(self.rng.gauss(44, 4))
+            })
+        return games
+
+    def step(self, minutes=30, move_probability=0.15, horizon=None):
+        """Advance the clock and random-walk a subset of the lines"""
+        self.now += timedelta(minutes=minutes)
+        for game in self.upcoming_games(horizon):
+            # Consensus moves occasionally and books follow with some lag
+            if self.rng.random() < move_probability:
+                game['spread'] = round_half(game['spread'] + self.rng.choice([-1, -0.5, 0.5, 1]))
+            if self.rng.random() < move_probability:
+                game['total'] = round_half(game['total'] + self.rng.choice([-1, -0.5, 0.5, 1]))
+            for book_key, _ in self.books:
+                line = self.lines[(game['id'], book_key)]
+                changed = False
+                if line['spread'] != game['spread'] and self.rng.random() < 0.5:
+                    line['spread'] = game['spread']
+                    changed = True
+                if line['total'] != game['total'] and self.rng.random() < 0.5:
+                    line['total'] = game['total']
+                    changed = True
+                if self.rng.random() < move_probability / 2:
+                    line['juice'] = self.rng.choice([-115, -112, -110, -108, -105])
+                    changed = True
+                if changed:
+                    line['last_update'] = self.now
+
+    def upcoming_games(self, horizon=None):
+        """Games not yet started, optionally only those kicking off within `horizon`"""
+        latest = self.now + horizon if horizon else None
+        return [
+            game for game in self.games
+            if game['commence_time'] > self.now and (latest is None or game['commence_time'] <= latest)
+        ]
+
+    def response(self, horizon=None):
+        """Current board as the Odds API returns it"""
+        payload = []
+        for game in self.upcoming_games(horizon):
+            bookmakers = []
+            for book_key, book_title in self.books:
+                line = self.lines[(game['id'], book_key)]
+                last_update = line['last_update'].strftime("%Y-%m-%dT%H:%M:%SZ")
+                home_probability = spread_win_probability(line['spread'])
+                # Spread the hold evenly across both moneyline sides
+                hold = 0.045 / 2
+                bookmakers.append({
+                    'key': book_key,
+                    'title': book_title,
+                    'last_update': last_update,
+                    'markets': [
+                        {'key': 'h2h', 'last_update': last_update, 'outcomes': [
+                            {'name': game['away_team'], 'price': probability_to_american(1 - home_probability + hold)},
+                            {'name': game['home_team'], 'price': probability_to_american(home_probability + hold)}
+                        ]},
+                        {'key': 'spreads', 'last_update': last_update, 'outcomes': [
+                            {'name': game['away_team'], 'price': -220 - line['juice'], 'point': -line['spread']},
+                            {'name': game['home_team'], 'price': line['juice'], 'point': line['spread']}
+                        ]},
+                        {'key': 'totals', 'last_update': last_update, 'outcomes': [
+                            {'name': 'Over', 'price': line['juice'], 'point': line['total']},
+                            {'name': 'Under', 'price': -220 - line['juice'], 'point': line['total']}
+                        ]}
+                    ]
+                })
+            payload.append({
+                'id': game['id'],
+                'sport_key': 'americanfootball_nfl',
+                'sport_title': 'NFL',
+                'commence_time': game['commence_time'].strftime("%Y-%m-%dT%H:%M:%SZ"),
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'bookmakers': bookmakers
+            })
+        return payload
+
+
+class RecordedResponses:
+    """Cycles through responses from the raw archive or a JSON file"""
+
+    def __init__(self, path=None):
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.bodies = [json.dumps(json.load(f)).encode('utf-8')]
+        else:
+            from odds_archive import list_responses, load_response
+            self.bodies = [json.dumps(load_response(entry)).encode('utf-8') for entry in list_responses()]
+        if not self.bodies:
+            raise ValueError("No recorded responses found")
+        self.position = 0
+        self.lock = threading.Lock()
+
+    def next_body(self):
+        with self.lock:
+            body = self.bodies[self.position % len(self.bodies)]
+            self.position += 1
+        return body
+
+
+class StandInState:
+    """Shared server configuration and quota counters"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.requests_used = args.quota_used
+        if args.replay_archive or args.response_file:
+            self.recorded = RecordedResponses(args.response_file)
+            self.board = None
+        else:
+            self.recorded = None
+            self.board = SyntheticBoard(args.games, args.books, seed=args.seed)
+
+    def next_body(self):
+        if self.recorded:
+            return self.recorded.next_body()
+        with self.lock:
+            self.board.step(self.args.step_minutes)
+            return json.dumps(self.board.response()).encode('utf-8')
+
+    def charge(self):
+        """Count a call against the quota; returns (used, remaining)"""
+        with self.lock:
+            self.requests_used += 1
+            return self.requests_used, self.args.quota - self.requests_used
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        if not self.state.args.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"message": message}).encode('utf-8'))
+
+    def do_GET(self):
+        args = self.state.args
+        url = urlparse(self.path)
+        if not ODDS_PATH.match(url.path):
+            return self._error(404, "Unknown endpoint")
+        if args.require_key and not parse_qs(url.query).get("apiKey"):
+            return self._error(401, "API key is missing")
+
+        # Latency first so timeouts can be exercised on every path
+        delay = max(0.0, args.latency_ms + self.state.rng.uniform(-args.jitter_ms, args.jitter_ms)) / 1000
+        roll = self.state.rng.random()
+        if roll < args.timeout_rate:
+            time.sleep(args.timeout_seconds)
+            return self._error(504, "Simulated timeout")
+        time.sleep(delay)
+
+        used, remaining = self.state.charge()
+        if remaining < 0:
+            return self._error(429, "Usage quota has been reached")
+        if roll < args.timeout_rate + args.error_rate:
+            return self._error(self.state.rng.choice(args.error_status), "Simulated upstream error")
+
+        self._send(200, self.state.next_body(), {
+            "x-requests-used": str(used),
+            "x-requests-remaining": str(remaining),
+            "x-requests-last": "3"
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for The Odds API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--games", type=int, default=16, help="Synthetic games per response")
+    parser.add_argument("--books", type=int, default=10, help=f"Synthetic bookmakers per game (max {len(BOOKMAKERS)})")
+    parser.add_argument("--step-minutes", type=int, default=30, help="Synthetic clock advance per request")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--replay-archive", action="store_true", help="Serve responses from raw_archive/")
+    parser.add_argument("--response-file", help="Serve a single recorded JSON response")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--quota", type=int, default=500, help="Monthly request quota")
+    parser.add_argument("--quota-used", type=int, default=0, help="Requests already used this month")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[500, 502, 503])
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that hang")
+    parser.add_argument("--timeout-seconds", type=float, default=60)
+    parser.add_argument("--require-key", action="store_true", help="Reject requests without apiKey")
+    parser.add_argument("--quiet", action="store_true", help="Disable per-request logging")
+    args = parser.parse_args()
+
+    StandInHandler.state = StandInState(args)
+    server = ThreadingHTTPServer((args.host, args.port), StandInHandler)
+    source = "recorded responses" if StandInHandler.state.recorded else f"{args.games} games x {args.books} books"
+    print(f"🧪 Odds API stand-in serving {source} at http://{args.host}:{args.port}")
+    print(f"   Set ODDS_API_BASE_URL=http://{args.host}:{args.port} to point the logger at it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stand-in stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,23 @@
 import requests
 import csv
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
+import hashlib
+import time
+
+import pandas as pd
+
+from metrics import record_ingest_run
+from board_state import bump_board_versions, append_board_event, compact_changes, HEARTBEAT_FILE_FORMAT
+from consensus import update_consensus
+from steam_detector import detect as detect_moves
+from arbitrage import scan as scan_opportunities
+from closing_lines import update_closing_lines
+from opening_lines import record_openings
+from stale_lines import detect_stale
+from hold_tracker import record_holds
+from alerts import evaluate_alerts
 
 # -------------------------
 # CONFIG
@@ -13,24 +28,43 @@ REGION = "us"  # "us", "uk", "au", "eu"
 MARKETS = "h2h,spreads,totals"  # moneyline, spreads, totals
 ODDS_FORMAT = "american"  # "american" or "decimal"
 DATE_FORMAT = "%Y-%m-%d"
+# Point at mock_odds_server.py for offline runs, e.g. http://localhost:8099
+API_BASE_URL = os.environ.get("ODDS_API_BASE_URL", "https://api.the-odds-api.com")
+REQUEST_TIMEOUT = float(os.environ.get("ODDS_API_TIMEOUT", 30))  # seconds
+FIELDNAMES = ['timestamp', 'game_id', 'commence_time', 'home_team', 'away_team',
+              'bookmaker', 'market', 'outcome_name', 'price', 'point']
+
+# Unchanged (game, bookmaker) blocks are skipped; a heartbeat records that they were still seen
+BLOCK_HASHES_FILE = "odds_block_hashes.json"
 
 # -------------------------
 # FUNCTIONS
 # -------------------------
-def fetch_odds():
-    url = f"https://api.the-odds-api.com/v4/sports/{SPORT}/odds/"
+def fetch_odds(fetched_at=None):
+    url = f"{API_BASE_URL}/v4/sports/{SPORT}/odds/"
     params = {
         "apiKey": API_KEY,
         "regions": REGION,
         "markets": MARKETS,
         "oddsFormat": ODDS_FORMAT,
     }
-    response = requests.get(url, params=params)
+    try:
+        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print("Error:", e)
+        return None
 
     if response.status_code != 200:
         print("Error:", response.status_code, response.text)
         return None
 
+    # Keep the untouched payload so the flattened CSVs can be rebuilt later
+    try:
+        from odds_archive import archive_response
+        archive_response(response.content, fetched_at or datetime.now(timezone.utc), SPORT)
+    except Exception as e:
+        print(f"⚠️ Could not archive raw response: {e}")
+
     return response.json()
 
 
@@ -61,48 +95,201 @@ def record_api_usage():
     with open(usage_file, 'w') as f:
         json.dump(data, f, indent=2)
 
-def save_to_csv(data):
-    """Save odds data to CSV file"""
+def flatten_odds(data, timestamp):
+    """Flatten the API response into CSV rows grouped by (game_id, bookmaker) block"""
+    blocks = {}
+    for game in data:
+        for bookmaker in game['bookmakers']:
+            rows = []
+            for market in bookmaker['markets']:
+                for outcome in market['outcomes']:
+                    rows.append({
+                        'timestamp': timestamp,
+                        'game_id': game['id'],
+                        'commence_time': game['commence_time'],
+                        'home_team': game['home_team'],
+                        'away_team': game['away_team'],
+                        'bookmaker': bookmaker['key'],
+                        'market': market['key'],
+                        'outcome_name': outcome['name'],
+                        'price': outcome['price'],
+                        'point': outcome.get('point', '')
+                    })
+            blocks[(game['id'], bookmaker['key'])] = rows
+    return blocks
+
+
+def block_hash(rows):
+    """Canonical content hash of a (game, bookmaker) block, ignoring the poll timestamp"""
+    canonical = sorted(
+        (row['commence_time'], row['market'], row['outcome_name'], str(row['price']), str(row['point']))
+        for row in rows
+    )
+    return hashlib.sha1(json.dumps(canonical).encode('utf-8')).hexdigest()
+
+
+def load_block_hashes(date_str):
+    """Load the block hashes written so far today (a new day starts a full snapshot)"""
+    if os.path.exists(BLOCK_HASHES_FILE):
+        try:
+            with open(BLOCK_HASHES_FILE, 'r') as f:
+                state = json.load(f)
+            if state.get("date") == date_str:
+                return state
+        except (OSError, ValueError):
+            pass
+    return {"date": date_str, "blocks": {}}
+
+
+def save_block_hashes(state):
+    """Persist block hashes for the next poll"""
+    with open(BLOCK_HASHES_FILE, 'w') as f:
+        json.dump(state, f)
+
+
+def record_heartbeat(date_str, timestamp, unchanged_keys, written_keys):
+    """Append a lightweight "seen at T" record for this poll"""
+    with open(HEARTBEAT_FILE_FORMAT.format(date=date_str), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({
+            "timestamp": timestamp,
+            "written": written_keys,
+            "unchanged": unchanged_keys
+        }) + "\n")
+
+
+def save_to_csv(data, fetched_at=None):
+    """Save odds data to CSV file, skipping (game, bookmaker) blocks that have not changed"""
     if not data:
         print("❌ No data to save")
-        return
+        return None
     
-    # Create filename with current date
-    today = datetime.now().strftime("%Y-%m-%d")
+    fetched_at = fetched_at or datetime.now(timezone.utc)
+    timestamp = fetched_at.isoformat()
+    
+    # Create filename with the poll date (UTC, like the poll timestamps)
+    today = fetched_at.strftime(DATE_FORMAT)
     filename = f"nfl_odds_{today}.csv"
     
     # Check if file exists to determine if we need headers
     file_exists = os.path.exists(filename)
     
+    blocks = flatten_odds(data, timestamp)
+    state = load_block_hashes(today)
+    if not file_exists:
+        # The day's file was removed or never written; start from a full snapshot
+        state["blocks"] = {}
+    
+    unchanged_keys = []
+    written_keys = []
+    written_rows = []
+    
     # Save to daily CSV file
     with open(filename, 'a', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['timestamp', 'game_id', 'commence_time', 'home_team', 'away_team', 
-                     'bookmaker', 'market', 'outcome_name', 'price', 'point']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         
         if not file_exists:
             writer.writeheader()
         
-        for game in data:
-            for bookmaker in game['bookmakers']:
-                for market in bookmaker['markets']:
-                    for outcome in market['outcomes']:
-                        writer.writerow({
-                            'timestamp': datetime.now().isoformat(),
-                            'game_id': game['id'],
-                            'commence_time': game['commence_time'],
-                            'home_team': game['home_team'],
-                            'away_team': game['away_team'],
-                            'bookmaker': bookmaker['key'],
-                            'market': market['key'],
-                            'outcome_name': outcome['name'],
-                            'price': outcome['price'],
-                            'point': outcome.get('point', '')
-                        })
+        for (game_id, bookmaker), rows in blocks.items():
+            key = f"{game_id}:{bookmaker}"
+            digest = block_hash(rows)
+            if state["blocks"].get(key) == digest:
+                unchanged_keys.append(key)
+                continue
+            writer.writerows(rows)
+            written_rows.extend(rows)
+            state["blocks"][key] = digest
+            written_keys.append(key)
     
-    print(f"✅ Data saved to {filename}")
+    save_block_hashes(state)
+    record_heartbeat(today, timestamp, unchanged_keys, written_keys)
+    versions = bump_board_versions({key.split(':', 1)[0] for key in written_keys}, timestamp)
+    if written_keys:
+        append_board_event(versions["version"], timestamp, compact_changes(written_rows))
+    
+    print(f"✅ Data saved to {filename} ({len(written_keys)} changed, {len(unchanged_keys)} unchanged blocks)")
+    return blocks
 
 
+def get_line_at(game_id, bookmaker, at):
+    """Return the rows a (game, bookmaker) block showed at time `at`, or None if it was not offered"""
+    date_str = at.strftime(DATE_FORMAT)
+    filename = f"nfl_odds_{date_str}.csv"
+    heartbeat_file = HEARTBEAT_FILE_FORMAT.format(date=date_str)
+    if not os.path.exists(filename):
+        return None
+    
+    at_str = at.isoformat()
+    key = f"{game_id}:{bookmaker}"
+    
+    # The latest poll at or before T decides whether the block was still on the board
+    if os.path.exists(heartbeat_file):
+        last_poll = None
+        with open(heartbeat_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                poll = json.loads(line)
+                if poll["timestamp"] > at_str:
+                    break
+                last_poll = poll
+        if last_poll is None:
+            return None
+        if key not in last_poll["written"] and key not in last_poll["unchanged"]:
+            return None
+    
+    # The line is whatever was last written for the block at or before T
+    block_rows = []
+    block_timestamp = None
+    with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            if row['game_id'] != game_id or row['bookmaker'] != bookmaker:
+                continue
+            if row['timestamp'] > at_str:
+                break
+            if row['timestamp'] != block_timestamp:
+                block_timestamp = row['timestamp']
+                block_rows = []
+            block_rows.append(row)
+    
+    return block_rows or None
+
+
+def snapshot_frame(blocks):
+    """Every block of one poll as a DataFrame with numeric points"""
+    snapshot = pd.DataFrame([row for rows in blocks.values() for row in rows], columns=FIELDNAMES)
+    snapshot['point'] = pd.to_numeric(snapshot['point'], errors='coerce')
+    return snapshot
+
+
+def run_stage(name, stage, *args, default=None):
+    """Run one per-snapshot analytics stage; a failure is reported and the rest of the ingest carries on"""
+    try:
+        return stage(*args)
+    except Exception as e:
+        print(f"⚠️ {name} failed: {e}")
+        return default
+
+
+def ingest_snapshot(data, fetched_at):
+    """Run one API response through the storage pipeline, then the per-snapshot analytics"""
+    start = time.perf_counter()
+    blocks = save_to_csv(data, fetched_at)
+    
+    if blocks:
+        # The odds are stored by now; analytics are derived state and must not lose the poll
+        snapshot = snapshot_frame(blocks)
+        timestamp = fetched_at.isoformat()
+        run_stage("Opening lines", record_openings, snapshot, timestamp)
+        consensus = run_stage("Consensus", update_consensus, snapshot, timestamp, default=pd.DataFrame())
+        run_stage("Steam detection", detect_moves, snapshot, timestamp)
+        run_stage("Stale-line detection", detect_stale, snapshot, consensus, timestamp)
+        run_stage("Opportunity scan", scan_opportunities, snapshot, consensus, timestamp)
+        run_stage("Closing lines", update_closing_lines, snapshot, timestamp)
+        run_stage("Hold tracking", record_holds, snapshot, timestamp)
+        run_stage("Alerts", evaluate_alerts, snapshot, consensus, timestamp)
+    
+    rows = sum(len(market['outcomes']) for game in data for bookmaker in game['bookmakers']
+               for market in bookmaker['markets'])
+    record_ingest_run(time.perf_counter() - start, rows)
 
 
 # -------------------------
@@ -111,10 +298,12 @@ def save_to_csv(data):
 if __name__ == "__main__":
     print("Fetching NFL odds...")
 
-    odds_data = fetch_odds()
+    # Polls are stamped in UTC so they compare directly with the API's commence times
+    fetched_at = datetime.now(timezone.utc)
+    odds_data = fetch_odds(fetched_at)
     if odds_data:
-        save_to_csv(odds_data)
-        record_api_usage()  # Track API usage
+        record_api_usage()  # The call is spent once the response is in, whatever ingest does with it
+        ingest_snapshot(odds_data, fetched_at)
         print("✅ Odds appended to today's CSV.")
         
         # Show usage stats
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Raw API Response Archive
+Stores every Odds API response compressed and content-addressed, and replays
+stored responses back through the ingest pipeline without spending credits
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = "raw_archive"
+INDEX_FILE = "index.jsonl"
+
+
+def _object_path(digest, codec):
+    """Path of a stored response: objects/ab/abcdef....json.<codec>"""
+    return os.path.join(ARCHIVE_DIR, "objects", digest[:2], f"{digest}.json.{codec}")
+
+
+def _compress(raw):
+    """Compress with zstd when available, gzip otherwise"""
+    if zstandard is not None:
+        return "zst", zstandard.ZstdCompressor(level=10).compress(raw)
+    return "gz", gzip.compress(raw, compresslevel=9)
+
+
+def _decompress(blob, codec):
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst archive entries")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def archive_response(raw, fetched_at, sport):
+    """Store a raw response body and append it to the fetch-time index"""
+    digest = hashlib.sha256(raw).hexdigest()
+    codec, blob = _compress(raw)
+    path = _object_path(digest, codec)
+
+    # Identical payloads share one object; only the index grows
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+    entry = {
+        "fetched_at": fetched_at.isoformat(),
+        "sha256": digest,
+        "codec": codec,
+        "sport": sport,
+        "raw_bytes": len(raw),
+        "stored_bytes": len(blob)
+    }
+    with open(os.path.join(ARCHIVE_DIR, INDEX_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + "\n")
+    return digest
+
+
+def list_responses(since=None, until=None):
+    """Index entries in fetch order, optionally limited to a fetch-time window"""
+    index_path = os.path.join(ARCHIVE_DIR, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return []
+
+    entries = []
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if since and entry["fetched_at"] < since:
+                continue
+            if until and entry["fetched_at"] > until:
+                continue
+            entries.append(entry)
+    return sorted(entries, key=lambda entry: entry["fetched_at"])
+
+
+def load_response(entry):
+    """Decode the JSON payload for an index entry"""
+    with open(_object_path(entry["sha256"], entry["codec"]), 'rb') as f:
+        return json.loads(_decompress(f.read(), entry["codec"]))
+
+
+def replay(entries, output_dir):
+    """Run stored responses through the flattening and storage pipeline at full speed
+    
+    Replays rebuild every CSV and analytics state file, so they go to a directory without
+    odds CSVs of its own; alerts are only logged to its alerts.jsonl, never sent.
+    """
+    if glob.glob(os.path.join(output_dir, "nfl_odds_*.csv")):
+        raise ValueError(f"{output_dir} already holds odds CSVs; replay into an empty directory")
+
+    import alerts
+    from nfl_odds_logger import ingest_snapshot
+    alerts.mute_sinks(("stdout", "webhook"))
+    alerts.ALERT_RULES_FILE = os.path.abspath(alerts.ALERT_RULES_FILE)
+
+    # Decode everything up front so the timing below covers ingest only
+    payloads = [(datetime.fromisoformat(entry["fetched_at"]), load_response(entry)) for entry in entries]
+
+    os.makedirs(output_dir, exist_ok=True)
+    os.chdir(output_dir)
+
+    start = time.perf_counter()
+    rows = 0
+    for fetched_at, data in payloads:
+        ingest_snapshot(data, fetched_at)
+        rows += sum(
+            len(market['outcomes'])
+            for game in data
+            for bookmaker in game['bookmakers']
+            for market in bookmaker['markets']
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"🔁 Replayed {len(payloads)} responses ({rows:,} outcomes) in {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"   ⚡ {rows / elapsed:,.0f} outcomes/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw Odds API response archive")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List archived responses")
+    replay_parser = subparsers.add_parser("replay", help="Replay archived responses through ingest")
+    for sub in (list_parser, replay_parser):
+        sub.add_argument("--since", help="Earliest fetch time (ISO format)")
+        sub.add_argument("--until", help="Latest fetch time (ISO format)")
+    replay_parser.add_argument("--sha256", help="Replay a single stored response")
+    replay_parser.add_argument("--output-dir", required=True,
+                               help="Empty directory for the rebuilt CSVs and state (never the live one)")
+
+    args = parser.parse_args()
+    entries = list_responses(args.since, args.until)
+
+    if args.command == "list":
+        for entry in entries:
+            print(f"{entry['fetched_at']}  {entry['sha256'][:12]}  {entry['codec']}  "
+                  f"{entry['raw_bytes']:,} -> {entry['stored_bytes']:,} bytes")
+        print(f"📦 {len(entries)} archived responses")
+        return
+
+    if args.sha256:
+        entries = [entry for entry in entries if entry["sha256"].startswith(args.sha256)]
+    if not entries:
+        print("❌ No archived responses match")
+        sys.exit(1)
+
+    try:
+        replay(entries, args.output_dir)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Implied Probability and No-Vig Fair Odds
+Converts American price columns to implied probabilities and removes the
+bookmaker margin within each (game, bookmaker, market) group, all as NumPy
+array operations: groups are integer codes and per-group sums are bincounts,
+so a season archive is processed without a Python-level loop over rows.
+
+Methods:
+    multiplicative  p / sum(p)
+    additive        p - (sum(p) - 1) / n
+    power           p ** k with k solved per group so the powers sum to 1
+
+Usage:
+    python3 odds_math.py nfl_odds_2025-09-04.csv --method power --output fair.csv
+"""
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+METHODS = ('multiplicative', 'additive', 'power')
+
+# One market at one moment; without a timestamp column a frame is treated as a single snapshot
+GROUP_KEYS = ['timestamp', 'game_id', 'bookmaker', 'market']
+
+POWER_ITERATIONS = 50
+POWER_TOLERANCE = 1e-12
+
+
+def american_to_probability(prices):
+    """Implied probability of each American price (NaN stays NaN)"""
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(prices > 0, 100.0 / (prices + 100.0), -prices / (100.0 - prices))
+
+
+def probability_to_american(probabilities):
+    """American price for each probability, unrounded; 0 and 1 map to NaN"""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    probabilities = np.where((probabilities > 0) & (probabilities < 1), probabilities, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(probabilities >= 0.5,
+                        -100.0 * probabilities / (1.0 - probabilities),
+                        100.0 * (1.0 - probabilities) / probabilities)
+
+
+def group_codes(df, keys=None):
+    """Integer group code per row for the given key columns (those present in df)"""
+    keys = [key for key in (keys or GROUP_KEYS) if key in df.columns]
+    if not keys:
+        return np.zeros(len(df), dtype=np.int64)
+    return df.groupby(keys, sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+
+
+def _group_sum(codes, values, n_groups):
+    return np.bincount(codes, weights=values, minlength=n_groups)
+
+
+def _power_exponents(probabilities, codes, n_groups):
+    """Solve sum(p ** k) = 1 per group with Newton's method, every group at once"""
+    log_p = np.log(np.where(probabilities > 0, probabilities, 1.0))
+    k = np.ones(n_groups)
+    for _ in range(POWER_ITERATIONS):
+        powered = probabilities ** k[codes]
+        f = _group_sum(codes, powered, n_groups) - 1.0
+        slope = _group_sum(codes, powered * log_p, n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            step = np.where(slope != 0, f / slope, 0.0)
+        k -= step
+        if np.all(np.abs(step) < POWER_TOLERANCE):
+            break
+    return k
+
+
+def remove_vig(probabilities, codes, method='multiplicative'):
+    """Fair probabilities and the overround of each row's group
+
+    Groups with fewer than two priced outcomes have no margin to remove and get NaN for both.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown no-vig method {method!r}; expected one of {', '.join(METHODS)}")
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    n_groups = int(codes.max()) + 1 if len(codes) else 0
+
+    valid = ~np.isnan(probabilities)
+    clean = np.where(valid, probabilities, 0.0)
+    totals = _group_sum(codes, clean, n_groups)
+    counts = _group_sum(codes, valid.astype(np.float64), n_groups)
+    overround = totals - 1.0
+
+    if method == 'multiplicative':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fair = clean / totals[codes]
+    elif method == 'additive':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fair = clean - overround[codes] / counts[codes]
+    else:
+        # Missing outcomes are 0 in `clean`, so they add nothing to the power sums
+        k = _power_exponents(clean, codes, n_groups)
+        fair = clean ** k[codes]
+
+    priced = counts[codes] >= 2
+    fair = np.where(valid & priced, fair, np.nan)
+    return fair, np.where(priced, overround[codes], np.nan)
+
+
+def attach_fair_odds(df, method='multiplicative', keys=None):
+    """Copy of a snapshot frame with implied_prob, overround, fair_prob and fair_price columns"""
+    implied = american_to_probability(df['price'].to_numpy(dtype=np.float64))
+    fair, overround = remove_vig(implied, group_codes(df, keys), method)
+    return df.assign(implied_prob=implied, overround=overround, fair_prob=fair,
+                     fair_price=probability_to_american(fair))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attach implied probabilities and no-vig fair odds to odds CSVs")
+    parser.add_argument("csv_files", nargs="+")
+    parser.add_argument("--method", choices=METHODS, default='multiplicative')
+    parser.add_argument("--output", help="Write the combined frame with fair odds here")
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_csv(path) for path in args.csv_files], ignore_index=True)
+    start = time.perf_counter()
+    fair = attach_fair_odds(df, args.method)
+    seconds = time.perf_counter() - start
+
+    print(f"🎯 {len(fair):,} outcomes ({args.method}) in {seconds:.3f}s "
+          f"({len(fair) / max(seconds, 1e-9):,.0f} outcomes/s)")
+    summary = fair.groupby('market')['overround'].mean() * 100
+    for market, hold in summary.items():
+        print(f"   {market:<8} average overround {hold:.2f}%")
+    if args.output:
+        fair.to_csv(args.output, index=False)
+        print(f"💾 Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
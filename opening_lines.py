@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Opening-Line Registry
+First price and point seen for every (game, bookmaker, market, outcome),
+recorded at ingest in opening_lines.json. "Movement since open" is then a
+dictionary lookup per line instead of a scan of the stored history.
+"""
+
+import os
+import json
+import numpy as np
+
+OPENING_LINES_FILE = "opening_lines.json"
+
+_cache = {"mtime": None, "lines": {}}
+
+
+def line_key(game_id, bookmaker, market, outcome):
+    return f"{game_id}|{bookmaker}|{market}|{outcome}"
+
+
+def _keys(df):
+    return [line_key(*key) for key in
+            df[['game_id', 'bookmaker', 'market', 'outcome_name']].itertuples(index=False, name=None)]
+
+
+def _point(value):
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else float(value)
+
+
+def load_openings():
+    """Registry as {key: [first seen, price, point]}, re-read only when the file changes"""
+    try:
+        mtime = os.stat(OPENING_LINES_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    if _cache["mtime"] != mtime:
+        with open(OPENING_LINES_FILE, 'r') as f:
+            _cache["lines"] = json.load(f)
+        _cache["mtime"] = mtime
+    return _cache["lines"]
+
+
+def record_openings(snapshot, timestamp):
+    """Add lines seen for the first time in this snapshot; returns how many were new"""
+    openings = dict(load_openings())
+    new = 0
+    for key, price, point in zip(_keys(snapshot), snapshot['price'].tolist(), snapshot['point'].tolist()):
+        if key not in openings:
+            openings[key] = [timestamp, price, _point(point)]
+            new += 1
+
+    if new:
+        tmp_path = f"{OPENING_LINES_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(openings, f, separators=(',', ':'))
+        os.replace(tmp_path, OPENING_LINES_FILE)
+    return new
+
+
+def attach_openings(df):
+    """Copy of df with open_price and open_point for every row (NaN if never recorded)"""
+    openings = load_openings()
+    opened = [openings.get(key) for key in _keys(df)]
+    return df.assign(
+        open_price=np.array([line[1] if line else np.nan for line in opened], dtype=np.float64),
+        open_point=np.array([line[2] if line and line[2] is not None else np.nan for line in opened],
+                            dtype=np.float64))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared Parsed-Data Cache
+SQLite-backed cache shared by every web worker process. Entries are stored
+under a key with the data fingerprint they were built from, so a worker that
+sees new files recomputes once and every other worker picks up the result.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+CACHE_DB = os.environ.get("SHARED_CACHE_DB", "shared_cache.sqlite3")
+
+
+class SharedCache:
+    """One row per key; a stale fingerprint is treated as a miss and overwritten"""
+
+    def __init__(self, path=CACHE_DB):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, value BLOB NOT NULL, created REAL NOT NULL)")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key, fingerprint):
+        """Stored bytes for key if they were built from `fingerprint`, else None"""
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE key = ? AND fingerprint = ?", (key, fingerprint)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set(self, key, fingerprint, value):
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, fingerprint, value, created) VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, sqlite3.Binary(value), time.time()))
+        except sqlite3.Error as e:
+            print(f"⚠️ Shared cache write failed for {key}: {e}")
+
+    def get_or_compute(self, key, fingerprint, compute):
+        """Return cached bytes or compute(), store and return them; second value is True on a hit"""
+        value = self.get(key, fingerprint)
+        if value is not None:
+            return bytes(value), True
+        value = compute()
+        self.set(key, fingerprint, value)
+        return value, False
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing
+SingleFlight runs one computation per key at a time; concurrent callers with
+the same key wait for that run and share its result. StaleWhileRevalidate keeps
+the last result per key with the data version it was built from, serves it
+while a newer version is recomputed in the background, and only makes callers
+wait when nothing has been computed for the key yet.
+"""
+
+import threading
+from collections import OrderedDict
+
+import metrics
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls with the same key within this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, compute):
+        """Result of compute() for key; second value is True if another caller's run was shared"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.value = compute()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.value, not leader
+
+
+class StaleWhileRevalidate:
+    """Versioned results per key: fresh if the version matches, otherwise stale and refreshed in the background"""
+
+    def __init__(self, name, max_entries=512):
+        self.name = name
+        self.max_entries = max_entries
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (version, value)
+
+    def clear(self):
+        """Forget every stored result"""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _compute(self, key, version, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]  # A refresh that started just before this one already finished
+        value = compute()
+        self._store(key, version, value)
+        return value
+
+    def _refresh(self, key, version, compute):
+        try:
+            self.flight.do((key, version), lambda: self._compute(key, version, compute))
+        except Exception as e:
+            print(f"⚠️ Background refresh of {self.name} {key} failed: {e}")
+
+    def get(self, key, version, compute):
+        """Value for key at `version`; state is one of fresh, stale, shared or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and entry[0] == version:
+            state = "fresh"
+            value = entry[1]
+        elif entry is not None:
+            state = "stale"
+            value = entry[1]
+            if not self.flight.in_flight((key, version)):
+                threading.Thread(target=self._refresh, args=(key, version, compute), daemon=True).start()
+        else:
+            value, shared = self.flight.do((key, version), lambda: self._compute(key, version, compute))
+            state = "shared" if shared else "miss"
+
+        metrics.increment("nfl_cache_requests_total", cache=self.name, result=state)
+        return value, state
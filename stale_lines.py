@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Stale-Line Detector
+Runs on every ingest after the consensus. For each (game, bookmaker, market)
+it keeps the book's last line, the consensus it was compared with, and how
+many snapshots the consensus has moved while the book's line stayed put. One
+dictionary entry per key, updated in constant time.
+
+A line is flagged stale once the consensus has moved STALE_MIN_MOVES times
+without the book and the book now sits at least a gap threshold away from it.
+A book with most of its lines stale at once is more likely a dead feed than a
+soft spot; stale_report() says which.
+
+The line compared is the home spread, the total, or the home moneyline as an
+implied probability. Newly flagged lines are appended to move_events.jsonl.
+"""
+
+import os
+import json
+import numpy as np
+
+from odds_math import american_to_probability
+from steam_detector import MOVE_EVENTS_FILE
+
+STALE_LINES_FILE = "stale_lines.json"
+
+STALE_MIN_MOVES = int(os.environ.get("STALE_MIN_MOVES", 3))
+# Consensus changes smaller than these do not count as a move
+STALE_POINT_MOVE = float(os.environ.get("STALE_POINT_MOVE", 0.25))
+STALE_PROB_MOVE = float(os.environ.get("STALE_PROB_MOVE", 0.01))
+# How far off the consensus a stale line has to be before it is flagged
+STALE_POINT_GAP = float(os.environ.get("STALE_POINT_GAP", 0.5))
+STALE_PROB_GAP = float(os.environ.get("STALE_PROB_GAP", 0.015))
+# Share of a book's lines stale at once that marks the whole feed as dead
+STALE_FEED_SHARE = float(os.environ.get("STALE_FEED_SHARE", 0.8))
+
+# Entry layout: [price, point, consensus value, consensus moves, unchanged since, flagged at]
+PRICE, POINT, CONSENSUS, MOVES, SINCE, FLAGGED = range(6)
+
+
+def load_state():
+    if not os.path.exists(STALE_LINES_FILE):
+        return {"snapshot": None, "lines": {}}
+    try:
+        with open(STALE_LINES_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"snapshot": None, "lines": {}}
+
+
+def reference_lines(snapshot, consensus):
+    """One row per (game, book, market) with the book's value and the consensus value for the same side"""
+    is_home = snapshot['outcome_name'] == snapshot['home_team']
+    reference = snapshot[((snapshot['market'] != 'totals') & is_home) | (snapshot['outcome_name'] == 'Over')]
+    reference = reference.merge(consensus[['game_id', 'market', 'outcome_name', 'consensus_prob', 'consensus_point']],
+                                on=['game_id', 'market', 'outcome_name'], how='left')
+    h2h = (reference['market'] == 'h2h').to_numpy()
+    price = reference['price'].to_numpy(dtype=np.float64)
+    return reference.assign(
+        h2h=h2h,
+        value=np.where(h2h, american_to_probability(price), reference['point'].to_numpy(dtype=np.float64)),
+        consensus_value=np.where(h2h, reference['consensus_prob'].to_numpy(dtype=np.float64),
+                                 reference['consensus_point'].to_numpy(dtype=np.float64)))
+
+
+def _number(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def detect_stale(snapshot, consensus, timestamp):
+    """Advance every line's counter by one snapshot; returns the lines flagged for the first time"""
+    if consensus.empty:
+        return []
+    previous = load_state()["lines"]
+    lines = {}
+    flagged = []
+    reference = reference_lines(snapshot, consensus)
+    columns = ['game_id', 'bookmaker', 'market', 'price', 'point', 'h2h', 'value', 'consensus_value']
+    for game_id, book, market, price, point, h2h, value, consensus_value in \
+            reference[columns].itertuples(index=False, name=None):
+        key = f"{game_id}|{book}|{market}"
+        point, consensus_value = _number(point), _number(consensus_value)
+        entry = previous.get(key)
+        if entry is None or entry[PRICE] != price or entry[POINT] != point or consensus_value is None \
+                or entry[CONSENSUS] is None:
+            lines[key] = [price, point, consensus_value, 0, timestamp, None]
+            continue
+
+        moved = abs(consensus_value - entry[CONSENSUS]) >= (STALE_PROB_MOVE if h2h else STALE_POINT_MOVE)
+        entry = [price, point, consensus_value, entry[MOVES] + moved, entry[SINCE], entry[FLAGGED]]
+        gap = consensus_value - value
+        if entry[FLAGGED] is None and entry[MOVES] >= STALE_MIN_MOVES and \
+                abs(gap) >= (STALE_PROB_GAP if h2h else STALE_POINT_GAP):
+            entry[FLAGGED] = timestamp
+            flagged.append({"t": timestamp, "type": "stale", "g": game_id, "m": market, "b": book,
+                            "since": entry[SINCE], "moves": entry[MOVES], "gap": round(gap, 4)})
+        lines[key] = entry
+
+    # Games that have left the board drop out with the snapshot
+    tmp_path = f"{STALE_LINES_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"snapshot": timestamp, "lines": lines}, f, separators=(',', ':'))
+    os.replace(tmp_path, STALE_LINES_FILE)
+
+    if flagged:
+        with open(MOVE_EVENTS_FILE, 'a', encoding='utf-8') as f:
+            for event in flagged:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        print(f"🧊 {len(flagged)} lines went stale")
+    return flagged
+
+
+def stale_report(book=None):
+    """Currently stale lines plus, per book, the share of its lines that are stale and a dead-feed verdict"""
+    state = load_state()
+    totals, stale = {}, []
+    for key, entry in state["lines"].items():
+        game_id, bookmaker, market = key.split("|")
+        if book and bookmaker != book:
+            continue
+        totals[bookmaker] = totals.get(bookmaker, 0) + 1
+        if entry[FLAGGED]:
+            stale.append({"game_id": game_id, "bookmaker": bookmaker, "market": market, "price": entry[PRICE],
+                          "point": entry[POINT], "consensus": entry[CONSENSUS], "consensus_moves": entry[MOVES],
+                          "unchanged_since": entry[SINCE], "flagged": entry[FLAGGED]})
+
+    books = []
+    for bookmaker, total in sorted(totals.items()):
+        count = sum(1 for line in stale if line["bookmaker"] == bookmaker)
+        share = count / total
+        books.append({"bookmaker": bookmaker, "lines": total, "stale": count, "share": round(share, 4),
+                      "dead_feed": count > 0 and share >= STALE_FEED_SHARE})
+    return {"snapshot": state["snapshot"], "books": books,
+            "stale": sorted(stale, key=lambda line: line["unchanged_since"])}
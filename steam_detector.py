@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Steam Move Detector
+Runs on every ingest. Compares each book's line with the last one it posted,
+keeps a short rolling window of moves per (game, market, outcome), and logs:
+
+    steam  STEAM_MIN_BOOKS or more books moving the same side within STEAM_WINDOW_MINUTES
+    key    a book's spread crossing, landing on or leaving 3 or 7
+
+A move "toward" an outcome makes it worse to bet: a lower spread point, a lower
+Over / higher Under total, or a shorter price. Steam is reported on the side
+the books moved toward. Events are appended to move_events.jsonl as one
+compact JSON object per line.
+"""
+
+import os
+import json
+import numpy as np
+from datetime import datetime, timedelta
+
+from consensus import point_direction
+from odds_math import american_to_probability
+
+STEAM_STATE_FILE = "steam_state.json"
+MOVE_EVENTS_FILE = "move_events.jsonl"
+
+STEAM_WINDOW = timedelta(minutes=int(os.environ.get("STEAM_WINDOW_MINUTES", 30)))
+STEAM_MIN_BOOKS = int(os.environ.get("STEAM_MIN_BOOKS", 3))
+# Smallest implied-probability change that counts as a price move (-110 to -115 is 0.011)
+PRICE_MOVE = float(os.environ.get("STEAM_PRICE_MOVE", 0.01))
+KEY_NUMBERS = (3, 7)
+
+LINE_KEYS = ['game_id', 'market', 'outcome_name', 'bookmaker']
+
+
+def load_state():
+    """Last line per book plus recent moves; starts empty if the file is missing or unreadable"""
+    state = {"lines": {}, "recent": {}, "flagged": {}}
+    if os.path.exists(STEAM_STATE_FILE):
+        try:
+            with open(STEAM_STATE_FILE, 'r') as f:
+                state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return state
+
+
+def save_state(state):
+    tmp_path = f"{STEAM_STATE_FILE}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, separators=(',', ':'))
+    os.replace(tmp_path, STEAM_STATE_FILE)
+
+
+def _line_key(game_id, market, outcome, bookmaker):
+    return f"{game_id}|{market}|{outcome}|{bookmaker}"
+
+
+def find_moves(snapshot, lines):
+    """Rows whose point or price moved since the book's last posted line, with the side they moved toward"""
+    current = snapshot[LINE_KEYS + ['home_team', 'price', 'point']]
+    keys = [_line_key(*key) for key in current[LINE_KEYS].itertuples(index=False, name=None)]
+    previous = [lines.get(key) for key in keys]
+    old_price = np.array([line[0] if line else np.nan for line in previous], dtype=np.float64)
+    old_point = np.array([line[1] if line and line[1] is not None else np.nan for line in previous],
+                         dtype=np.float64)
+
+    new_price = current['price'].to_numpy(dtype=np.float64)
+    new_point = current['point'].to_numpy(dtype=np.float64)
+    implied_change = american_to_probability(new_price) - american_to_probability(old_price)
+    point_change = np.nan_to_num(new_point - old_point)
+
+    # Steam makes the side worse to bet: less attractive point, else a shorter price
+    toward = np.where(point_change != 0, -np.sign(point_direction(current) * point_change),
+                      np.sign(implied_change))
+    moved = ~np.isnan(old_price) & ((point_change != 0) | (np.abs(implied_change) >= PRICE_MOVE)) & (toward != 0)
+
+    moves = current[moved].assign(old_price=old_price[moved], old_point=old_point[moved],
+                                  toward=toward[moved].astype(int))
+    return moves, keys
+
+
+def key_crossings(moves):
+    """Spread moves through or onto/off a key number, once per (game, book) on the home side"""
+    spreads = moves[(moves['market'] == 'spreads') & (moves['outcome_name'] == moves['home_team'])]
+    old = spreads['old_point'].abs().to_numpy()
+    new = spreads['point'].abs().to_numpy()
+    crossed = np.zeros(len(spreads), dtype=bool)
+    for key in KEY_NUMBERS:
+        crossed |= ((old - key) * (new - key) <= 0) & (old != new)
+    return spreads[crossed]
+
+
+def _point(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def detect(snapshot, timestamp):
+    """Update rolling state with one snapshot; returns and logs the events it raised"""
+    state = load_state()
+    now = datetime.fromisoformat(timestamp)
+    cutoff = (now - STEAM_WINDOW).isoformat()
+    moves, keys = find_moves(snapshot, state["lines"])
+    events = []
+
+    for row in key_crossings(moves).itertuples(index=False):
+        events.append({"t": timestamp, "type": "key", "g": row.game_id, "m": row.market, "o": row.outcome_name,
+                       "b": row.bookmaker, "from": _point(row.old_point), "to": _point(row.point)})
+
+    # Rolling window of (time, book, side) per outcome; a book counts once, with its latest side
+    recent = state["recent"]
+    for row in moves.itertuples(index=False):
+        outcome_key = f"{row.game_id}|{row.market}|{row.outcome_name}"
+        window = [move for move in recent.get(outcome_key, []) if move[0] >= cutoff and move[1] != row.bookmaker]
+        window.append([timestamp, row.bookmaker, row.toward])
+        recent[outcome_key] = window
+
+        # The opposite side mirrors every move, so only the side moved toward is reported
+        if row.toward < 0 or state["flagged"].get(outcome_key, "") >= cutoff:
+            continue
+        books = sorted(move[1] for move in window if move[2] > 0)
+        if len(books) >= STEAM_MIN_BOOKS:
+            state["flagged"][outcome_key] = timestamp
+            events.append({"t": timestamp, "type": "steam", "g": row.game_id, "m": row.market,
+                           "o": row.outcome_name, "books": books,
+                           "price": int(row.price), "point": _point(row.point)})
+
+    state["recent"] = {key: window for key, window in recent.items() if window[-1][0] >= cutoff}
+    state["flagged"] = {key: flagged_at for key, flagged_at in state["flagged"].items() if flagged_at >= cutoff}
+    # The snapshot is the whole board, so games that have left it drop out of the state
+    points = [_point(point) for point in snapshot['point'].tolist()]
+    state["lines"] = {key: [price, point] for key, price, point in zip(keys, snapshot['price'].tolist(), points)}
+    save_state(state)
+
+    if events:
+        with open(MOVE_EVENTS_FILE, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        steam = sum(1 for event in events if event["type"] == "steam")
+        print(f"🚂 {steam} steam moves, {len(events) - steam} key-number crossings")
+    return events
+
+
+def read_events(since=None):
+    """Logged move events, optionally only those at or after `since` (ISO timestamp)"""
+    if not os.path.exists(MOVE_EVENTS_FILE):
+        return []
+    events = []
+    with open(MOVE_EVENTS_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            event = json.loads(line)
+            if since is None or event["t"] >= since:
+                events.append(event)
+    return events
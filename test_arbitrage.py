@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Arbitrage and Middle Scanner Tests
+Small hand-built snapshots run through the consensus and the scanner.
+
+Usage:
+    python3 -m pytest test_arbitrage.py
+"""
+
+import pandas as pd
+import pytest
+
+from arbitrage import find_arbitrage, find_middles
+from consensus import compute_consensus
+
+HOME, AWAY = "Kansas City Chiefs", "Buffalo Bills"
+
+
+def block(bookmaker, market, *outcomes):
+    """Snapshot rows for one (book, market); outcomes are (name, price, point)"""
+    return [{"timestamp": "2025-09-07T12:00:00", "game_id": "g1", "commence_time": "2025-09-07T20:25:00Z",
+             "home_team": HOME, "away_team": AWAY, "bookmaker": bookmaker, "market": market,
+             "outcome_name": name, "price": price, "point": point} for name, price, point in outcomes]
+
+
+def spreads(bookmaker, home_point, away_point, price=-110):
+    return block(bookmaker, "spreads", (HOME, price, home_point), (AWAY, price, away_point))
+
+
+def totals(bookmaker, over, under, price=-110):
+    return block(bookmaker, "totals", ("Over", price, over), ("Under", price, under))
+
+
+def snapshot(*blocks):
+    """Rows as ingest hands them over, with numeric points"""
+    df = pd.DataFrame([row for rows in blocks for row in rows])
+    df['point'] = pd.to_numeric(df['point'], errors='coerce')
+    return df
+
+
+def middles(*blocks):
+    return find_middles(compute_consensus(snapshot(*blocks)))
+
+
+@pytest.mark.parametrize("home_point, away_point, width, expected", [
+    (-2.5, 3.0, 0.5, False),   # lands on 3: win and push
+    (-3.0, 3.5, 0.5, False),   # lands on 3: push and win
+    (-3.0, 4.0, 1.0, False),   # only whole numbers on the edges
+    (-2.5, 3.5, 1.0, True),    # 3 wins both
+    (-2.5, 4.0, 1.5, True),    # 3 wins both
+    (-3.0, 4.5, 1.5, True),    # 4 wins both
+])
+def test_spread_middles_need_a_whole_margin_inside(home_point, away_point, width, expected):
+    found = middles(spreads("book_a", home_point, -home_point), spreads("book_b", -away_point, away_point))
+    assert bool(found) == expected
+    if expected:
+        assert found[0]["width"] == width
+        assert {leg["book"] for leg in found[0]["legs"]} == {"book_a", "book_b"}
+
+
+@pytest.mark.parametrize("over, under, expected", [
+    (44.5, 45.0, False),
+    (44.0, 45.0, False),
+    (44.5, 46.0, True),
+    (44.0, 45.5, True),
+])
+def test_total_middles_need_a_whole_total_inside(over, under, expected):
+    found = middles(totals("book_a", over, over), totals("book_b", under, under))
+    assert bool(found) == expected
+
+
+def test_matching_lines_are_not_a_middle():
+    assert middles(spreads("book_a", -3.0, 3.0), spreads("book_b", -3.0, 3.0)) == []
+
+
+def test_arbitrage_on_the_same_line():
+    found = find_arbitrage(snapshot(
+        block("book_a", "spreads", (HOME, 110, -3.0), (AWAY, -130, 3.0)),
+        block("book_b", "spreads", (HOME, -130, -3.0), (AWAY, 105, 3.0))))
+    assert len(found) == 1
+    assert found[0]["line"] == -3.0
+    assert {(leg["outcome"], leg["book"]) for leg in found[0]["legs"]} == {(HOME, "book_a"), (AWAY, "book_b")}
+    assert found[0]["edge"] > 0
+
+
+@pytest.mark.parametrize("away_point", [2.5, 3.5, 4.0, 4.5])
+def test_prices_on_different_lines_are_not_arbitrage(away_point):
+    # -3 at one book against +2.5 .. +4.5 at another is a different line, whatever the prices
+    found = find_arbitrage(snapshot(
+        block("book_a", "spreads", (HOME, 110, -3.0), (AWAY, -130, 3.0)),
+        block("book_b", "spreads", (HOME, -130, -away_point), (AWAY, 110, away_point))))
+    assert found == []
+
+
+def test_moneyline_arbitrage_needs_implied_under_one():
+    fair = snapshot(block("book_a", "h2h", (HOME, -110, None), (AWAY, -110, None)),
+                    block("book_b", "h2h", (HOME, -105, None), (AWAY, -105, None)))
+    assert find_arbitrage(fair) == []
+    arb = snapshot(block("book_a", "h2h", (HOME, 105, None), (AWAY, -125, None)),
+                   block("book_b", "h2h", (HOME, -125, None), (AWAY, 105, None)))
+    found = find_arbitrage(arb)
+    assert len(found) == 1 and found[0]["market"] == "h2h"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Deduplicated Storage Tests
+Polls written with save_to_csv, read back with get_line_at: the CSV only holds
+changed blocks, the heartbeats say which blocks were still on the board.
+
+Usage:
+    python3 -m pytest test_ingest.py
+"""
+
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+from nfl_odds_logger import save_to_csv, get_line_at
+
+HOME, AWAY = "Kansas City Chiefs", "Buffalo Bills"
+
+
+def at(text):
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+
+def response(spreads):
+    """One game as the Odds API returns it; spreads maps bookmaker -> home spread"""
+    return [{"id": "g1", "commence_time": "2025-09-09T00:15:00Z", "home_team": HOME, "away_team": AWAY,
+             "bookmakers": [{"key": book, "markets": [{"key": "spreads", "outcomes": [
+                 {"name": HOME, "price": -110, "point": point},
+                 {"name": AWAY, "price": -110, "point": -point}]}]}
+                 for book, point in spreads.items()]}]
+
+
+def home_point(rows):
+    return None if rows is None else float(next(row['point'] for row in rows if row['outcome_name'] == HOME))
+
+
+def written_books(date_str):
+    with open(f"nfl_odds_{date_str}.csv", newline='', encoding='utf-8') as f:
+        return [(row['timestamp'], row['bookmaker']) for row in csv.DictReader(f) if row['outcome_name'] == HOME]
+
+
+@pytest.fixture
+def polls(tmp_path, monkeypatch):
+    """book_a never moves, book_b moves once and then drops off; the last poll is on the next day"""
+    monkeypatch.chdir(tmp_path)
+    save_to_csv(response({"book_a": -3.0, "book_b": -3.5}), at("2025-09-07T12:00:00"))
+    save_to_csv(response({"book_a": -3.0, "book_b": -4.0}), at("2025-09-07T12:30:00"))
+    save_to_csv(response({"book_a": -3.0}), at("2025-09-07T13:00:00"))
+    save_to_csv(response({"book_a": -3.0}), at("2025-09-08T00:00:00"))
+
+
+@pytest.mark.parametrize("when, book_a, book_b", [
+    ("2025-09-07T11:59:00", None, None),    # before the first poll
+    ("2025-09-07T12:00:00", -3.0, -3.5),
+    ("2025-09-07T12:15:00", -3.0, -3.5),    # between polls: the earlier poll's lines
+    ("2025-09-07T12:30:00", -3.0, -4.0),    # book_a unchanged, so not written again
+    ("2025-09-07T12:45:00", -3.0, -4.0),
+    ("2025-09-07T13:00:00", -3.0, None),    # book_b left the board
+    ("2025-09-07T23:59:00", -3.0, None),
+    ("2025-09-08T00:00:00", -3.0, None),    # next day's file
+    ("2025-09-08T06:00:00", -3.0, None),
+])
+def test_line_at(polls, when, book_a, book_b):
+    assert home_point(get_line_at("g1", "book_a", at(when))) == book_a
+    assert home_point(get_line_at("g1", "book_b", at(when))) == book_b
+
+
+def test_only_changed_blocks_are_written(polls):
+    assert written_books("2025-09-07") == [("2025-09-07T12:00:00+00:00", "book_a"),
+                                           ("2025-09-07T12:00:00+00:00", "book_b"),
+                                           ("2025-09-07T12:30:00+00:00", "book_b")]
+
+
+def test_new_day_starts_with_a_full_snapshot(polls):
+    # book_a's hash is unchanged, but the day's file must stand on its own
+    assert written_books("2025-09-08") == [("2025-09-08T00:00:00+00:00", "book_a")]
@@ -7,12 +7,49 @@ Provides a clean dashboard for viewing odds data with line movement graphs
 import os
 import json
 import glob
+import pickle
+import hashlib
+import threading
 import pandas as pd
-from datetime import datetime
-from flask import Flask, render_template_string, jsonify
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from functools import wraps
+from flask import Flask, Response, make_response, redirect, request, jsonify, send_file, stream_with_context
 import pytz
+import metrics
+import compression
+from metrics import timer, record_cache
+from board_state import load_board_versions, read_heartbeats, BOARD_VERSIONS_FILE, HEARTBEAT_FILE_FORMAT
+from event_stream import BoardEventBroadcaster, parse_last_event_id, sse_stream
+from board import load_current_board, last_lines, encode_board, filter_board, page_of_games
+from shared_cache import SharedCache
+from single_flight import StaleWhileRevalidate
+import csv_viewer
+from consensus import load_consensus, CONSENSUS_FILE
+from arbitrage import opportunities_report, OPPORTUNITIES_STATE_FILE, OPPORTUNITIES_LOG_FILE
+from opening_lines import attach_openings, OPENING_LINES_FILE
+from stale_lines import stale_report, STALE_LINES_FILE
+from hold_tracker import hold_aggregates, game_holds, HOLD_DB
+from alerts import recent_alerts, ALERTS_LOG_FILE
 
 app = Flask(__name__)
+metrics.init_app(app)
+compression.init_app(app)
+
+# Under gunicorn dashboards subscribe to event_stream.py's asyncio server on EVENTS_PORT (plain http),
+# or EVENTS_URL where the stream is published elsewhere (e.g. behind a proxy); without either they poll
+EVENTS_URL = os.environ.get('EVENTS_URL')
+EVENTS_PORT = os.environ.get('EVENTS_PORT')
+BOARD_POLL_SECONDS = int(os.environ.get('BOARD_POLL_SECONDS', 60))
+event_broadcaster = BoardEventBroadcaster()
+
+# Parsed-data cache shared by all worker processes (see gunicorn.conf.py)
+shared_cache = SharedCache()
+
+# Concurrent identical requests share one computation; after new data arrives the
+# previous result is served while it is rebuilt
+board_frames_coalescer = StaleWhileRevalidate('board_frames')
+graphs_coalescer = StaleWhileRevalidate('graphs')
 
 # HTML Template with improved formatting and interactive graphs
 HTML_TEMPLATE = """
@@ -272,6 +309,31 @@ HTML_TEMPLATE = """
             padding-top: 20px;
             border-top: 1px solid #e9ecef;
         }
+        .game-filters {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 15px;
+        }
+        .game-filters input, .game-filters select {
+            padding: 8px;
+            border: 1px solid #dee2e6;
+            border-radius: 6px;
+        }
+        .game-filters .refresh-btn {
+            margin-bottom: 0;
+        }
+        .page-info {
+            color: #6c757d;
+            margin-bottom: 15px;
+        }
+        .pagination {
+            display: flex;
+            justify-content: center;
+            gap: 20px;
+            margin-bottom: 30px;
+        }
         .no-data {
             text-align: center;
             padding: 40px;
@@ -349,6 +411,11 @@ HTML_TEMPLATE = """
             font-size: 0.8rem;
             margin-top: 2px;
         }
+        .since-open {
+            display: block;
+            color: #6c757d;
+            font-size: 0.75rem;
+        }
         .no-odds {
             text-align: center;
             padding: 15px;
@@ -460,6 +527,25 @@ HTML_TEMPLATE = """
         .data-section {
             margin-bottom: 40px;
         }
+        .consensus-table {
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.9rem;
+        }
+        .consensus-table th, .consensus-table td {
+            padding: 6px 10px;
+            border-bottom: 1px solid #ecf0f1;
+            text-align: left;
+        }
+        .consensus-table .game-row td {
+            background: #f8f9fa;
+            font-weight: 600;
+            color: #2c3e50;
+        }
+        .consensus-book {
+            color: #6c757d;
+            font-size: 0.8rem;
+        }
         .data-section h3 {
             color: #2c3e50;
             margin-bottom: 20px;
@@ -526,6 +612,14 @@ HTML_TEMPLATE = """
             font-style: italic;
         }
 
+        .odds-display.updated {
+            animation: odds-updated 2s ease-out;
+        }
+
+        @keyframes odds-updated {
+            from { background-color: #fff3bf; }
+            to { background-color: transparent; }
+        }
     </style>
 </head>
 <body>
@@ -562,13 +656,46 @@ HTML_TEMPLATE = """
         
         <div class="main-tabs">
             <button class="main-tab active" onclick="showMainTab('games')">Games & Odds</button>
+            <button class="main-tab" onclick="showMainTab('consensus')">Best Prices</button>
             <button class="main-tab" onclick="showMainTab('data')">Data Files</button>
         </div>
         
         <div class="main-content" id="games-content">
+            {% if client_rendered %}
+            <form class="game-filters" method="get" action="/">
+                <input type="text" name="team" placeholder="Team" value="{{ filters.team or '' }}">
+                <select name="bookmaker">
+                    <option value="">All bookmakers</option>
+                    {% for bookmaker in bookmakers %}
+                    <option value="{{ bookmaker }}"{% if bookmaker == filters.bookmaker %} selected{% endif %}>{{ bookmaker }}</option>
+                    {% endfor %}
+                </select>
+                <label>From <input type="date" name="start" value="{{ filters.start or '' }}"></label>
+                <label>To <input type="date" name="end" value="{{ filters.end or '' }}"></label>
+                <button type="submit" class="refresh-btn">Filter</button>
+                <a href="/" class="filter-reset">Clear</a>
+            </form>
+            <div class="page-info">
+                {% if matching_games %}Showing {{ (page - 1) * page_size + 1 }}–{{ [page * page_size, matching_games]|min }} of {{ matching_games }} games{% else %}No games match these filters{% endif %}
+            </div>
+            {% endif %}
             <div class="games-container">
                 {{ games_html|safe }}
             </div>
+            {% if client_rendered and pages > 1 %}
+            <div class="pagination">
+                {% set query = filters | dictsort | selectattr(1) | list | urlencode %}
+                {% if page > 1 %}<a href="/?{{ query ~ '&' if query }}page={{ page - 1 }}">← Previous</a>{% endif %}
+                <span>Page {{ page }} of {{ pages }}</span>
+                {% if page < pages %}<a href="/?{{ query ~ '&' if query }}page={{ page + 1 }}">Next →</a>{% endif %}
+            </div>
+            {% endif %}
+        </div>
+        
+        <div class="main-content" id="consensus-content" style="display: none;">
+            <div class="data-files-container">
+                <div class="graph-placeholder">Loading best prices…</div>
+            </div>
         </div>
         
         <div class="main-content" id="data-content" style="display: none;">
@@ -597,6 +724,58 @@ HTML_TEMPLATE = """
             // Show selected content and activate tab
             document.getElementById(`${tabName}-content`).style.display = 'block';
             event.target.classList.add('active');
+            
+            if (tabName === 'consensus') {
+                loadConsensus();
+            }
+        }
+
+        // Best price and consensus line for the games on this page, from the last ingest
+        function loadConsensus() {
+            const container = document.querySelector('#consensus-content .data-files-container');
+            const gameIds = Array.from(document.querySelectorAll('.odds-grid[data-board-game]'))
+                .map(grid => grid.dataset.boardGame);
+            if (!gameIds.length) {
+                container.innerHTML = '<div class="no-data">No games on this page</div>';
+                return;
+            }
+            
+            fetch(`/api/consensus?game=${encodeURIComponent(gameIds.join(','))}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.lines || !data.lines.length) {
+                        container.innerHTML = '<div class="no-data">No consensus yet; it is computed on the next odds fetch</div>';
+                        return;
+                    }
+                    const order = new Map(gameIds.map((gameId, i) => [gameId, i]));
+                    const lines = data.lines.slice().sort((a, b) => order.get(a.game_id) - order.get(b.game_id));
+                    const rows = [];
+                    let currentGame = null;
+                    lines.forEach(line => {
+                        if (line.game_id !== currentGame) {
+                            currentGame = line.game_id;
+                            rows.push(`<tr class="game-row"><td colspan="6">${escapeHtml(line.away_team)} @ ${escapeHtml(line.home_team)}</td></tr>`);
+                        }
+                        const fair = line.fair_prob === null ? '' : `${(line.fair_prob * 100).toFixed(1)}%`;
+                        const spread = line.point_range ? `${line.point_range} pts, ` : '';
+                        rows.push(`<tr>
+                            <td>${escapeHtml(line.market)}</td>
+                            <td>${escapeHtml(line.outcome_name)}</td>
+                            <td>${formatPoint(line.best_point, line.market)} ${formatPrice(line.best_price)} <span class="consensus-book">${escapeHtml(line.best_book)}</span></td>
+                            <td>${formatPoint(line.consensus_point, line.market)} ${formatPrice(line.consensus_price)}</td>
+                            <td>${fair}</td>
+                            <td>${spread}${(line.prob_dispersion * 100).toFixed(1)}% across ${line.books} books</td>
+                        </tr>`);
+                    });
+                    container.innerHTML = `<div class="page-info">As of ${escapeHtml(data.snapshot)}</div>
+                        <table class="consensus-table">
+                            <tr><th>Market</th><th>Outcome</th><th>Best</th><th>Consensus</th><th>No-vig</th><th>Disagreement</th></tr>
+                            ${rows.join('')}
+                        </table>`;
+                })
+                .catch(() => {
+                    container.innerHTML = '<div class="no-data">Could not load best prices</div>';
+                });
         }
 
         // Toggle game expansion
@@ -608,13 +787,18 @@ HTML_TEMPLATE = """
             if (gameDetails.classList.contains('expanded')) {
                 gameDetails.classList.remove('expanded');
                 gameCard.classList.remove('expanded');
-                expandIcon.classList.remove('expanded');
-                expandIcon.textContent = '▼';
+                if (expandIcon) {
+                    expandIcon.classList.remove('expanded');
+                    expandIcon.textContent = '▼';
+                }
             } else {
+                if (gameDetails.dataset.lazy) buildGraphTabs(gameDetails);
                 gameDetails.classList.add('expanded');
                 gameCard.classList.add('expanded');
-                expandIcon.classList.add('expanded');
-                expandIcon.textContent = '▲';
+                if (expandIcon) {
+                    expandIcon.classList.add('expanded');
+                    expandIcon.textContent = '▲';
+                }
                 
                 // Load graphs if not already loaded
                 if (!gameDetails.dataset.graphsLoaded) {
@@ -646,6 +830,11 @@ HTML_TEMPLATE = """
             fetch(`/api/game/${gameId}/graphs`)
                 .then(response => response.json())
                 .then(data => {
+                    // Redraws replace the charts already on the canvases
+                    document.querySelectorAll(`#details-${gameId} canvas`).forEach(canvas => {
+                        const existing = Chart.getChart(canvas);
+                        if (existing) existing.destroy();
+                    });
                     if (data.spreads) createSpreadChart(gameId, data.spreads);
                     if (data.moneyline_favorite) createMoneylineFavoriteChart(gameId, data.moneyline_favorite);
                     if (data.moneyline_underdog) createMoneylineUnderdogChart(gameId, data.moneyline_underdog);
@@ -658,6 +847,251 @@ HTML_TEMPLATE = """
                 });
         }
 
+        // Format a price/point pair the same way the server renders it
+        function formatPrice(price) {
+            return price > 0 ? `+${price}` : `${price}`;
+        }
+
+        function formatPoint(point, market) {
+            if (point === '' || point === null || point === undefined) return '';
+            return market === 'totals' ? `O/U ${point}` : `(${point})`;
+        }
+
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+        }
+
+        // Client-side rendering from the columnar /api/board payload
+        const BET_COLUMNS = [['spreads', 'Point Spread'], ['h2h', 'Moneyline'], ['totals', 'Total']];
+        const GRAPH_TABS = {{ graph_tabs|tojson }};
+        const gameLines = new Map();  // gameId -> [{book, market, outcome, price, point, prevPrice, prevPoint}]
+
+        // Unpack the dictionary-encoded columns into per-game rows
+        function decodeBoard(data) {
+            const lines = data.lines;
+            for (let i = 0; i < lines.game.length; i++) {
+                const gameId = data.games.id[lines.game[i]];
+                if (!gameLines.has(gameId)) gameLines.set(gameId, []);
+                gameLines.get(gameId).push({
+                    book: data.books[lines.book[i]], market: data.markets[lines.market[i]],
+                    outcome: data.names[lines.outcome[i]], price: lines.price[i], point: lines.point[i],
+                    prevPrice: lines.prev_price[i], prevPoint: lines.prev_point[i],
+                    openPrice: lines.open_price ? lines.open_price[i] : null,
+                    openPoint: lines.open_point ? lines.open_point[i] : null
+                });
+            }
+        }
+
+        function formatMovementRows(book, market, rows) {
+            let html = `<div class="movement-bookmaker">${escapeHtml(book)}</div>`;
+            rows.forEach(row => {
+                let movementClass = 'no-change';
+                let arrow = '→';
+                if (row.prevPrice !== null) {
+                    if (row.price > row.prevPrice) { movementClass = 'moved-up'; arrow = '↗'; }
+                    else if (row.price < row.prevPrice) { movementClass = 'moved-down'; arrow = '↘'; }
+                }
+                let pointMove = '';
+                if (row.point !== null && row.prevPoint !== null && row.prevPrice !== null) {
+                    const change = row.point - row.prevPoint;
+                    if (change > 0) pointMove = ` <span class='point-up'>+${change.toFixed(1)}</span>`;
+                    else if (change < 0) pointMove = ` <span class='point-down'>${change.toFixed(1)}</span>`;
+                }
+                html += `<div class="movement-row ${movementClass}">
+                    <div class="movement-team">${escapeHtml(row.outcome)}</div>
+                    <div class="movement-odds">
+                        <span class="current-odds">${formatPrice(row.price)}</span>
+                        <span class="movement-arrow">${arrow}</span>
+                        <span class="previous-odds">${row.prevPrice === null ? 'NEW' : formatPrice(row.prevPrice)}</span>
+                        <span class="point-display">${formatPoint(row.point, market)}</span>${pointMove}
+                    </div>
+                </div>`;
+            });
+            return html;
+        }
+
+        // Open line and the point change since, when the line has moved since it opened
+        function formatSinceOpen(row, market) {
+            if (row.openPrice === null || row.openPrice === undefined) return '';
+            if (row.openPrice === row.price && row.openPoint === row.point) return '';
+            let pointMove = '';
+            if (row.point !== null && row.openPoint !== null && row.point !== row.openPoint) {
+                const change = row.point - row.openPoint;
+                pointMove = change > 0 ? ` <span class='point-up'>+${change.toFixed(1)}</span>`
+                                       : ` <span class='point-down'>${change.toFixed(1)}</span>`;
+            }
+            return `<span class="since-open">open ${formatPrice(row.openPrice)} ${formatPoint(row.openPoint, market)}${pointMove}</span>`;
+        }
+
+        function renderGameOdds(gameId) {
+            const grid = document.querySelector(`.odds-grid[data-board-game="${gameId}"]`);
+            if (!grid) return;
+
+            // market -> book -> rows, in board order
+            const byMarket = {};
+            (gameLines.get(gameId) || []).forEach(row => {
+                byMarket[row.market] = byMarket[row.market] || new Map();
+                if (!byMarket[row.market].has(row.book)) byMarket[row.market].set(row.book, []);
+                byMarket[row.market].get(row.book).push(row);
+            });
+
+            let html = '';
+            BET_COLUMNS.forEach(([market, label]) => {
+                html += `<div class="bet-column"><div class="bet-header">${label}</div>`;
+                const books = byMarket[market];
+                if (!books) {
+                    html += '<div class="no-odds">No data</div></div>';
+                    return;
+                }
+                let movement = '';
+                books.forEach((rows, book) => {
+                    if (rows.some(row => row.prevPrice !== null)) movement += formatMovementRows(book, market, rows);
+                });
+                if (movement) html += `<div class="movement-section">${movement}</div>`;
+                books.forEach((rows, book) => {
+                    html += `<div class="bookmaker-row" data-bookmaker="${escapeHtml(book)}" data-market="${market}"><div class="bookmaker-name">${escapeHtml(book)}</div>`;
+                    rows.forEach(row => {
+                        html += `<div class="odds-display" data-outcome="${escapeHtml(row.outcome)}">
+                            <span class="team-name">${escapeHtml(row.outcome)}</span>
+                            <div class="odds-values">
+                                <span class="odds-value">${formatPrice(row.price)}</span>
+                                <span class="point-value">${formatPoint(row.point, market)}</span>
+                                ${formatSinceOpen(row, market)}
+                            </div>
+                        </div>`;
+                    });
+                    html += '</div>';
+                });
+                html += '</div>';
+            });
+            grid.innerHTML = html;
+        }
+
+        // Odds grids are requested in small batches as cards scroll into view
+        const pendingGames = new Set();
+        let flushTimer = null;
+
+        function requestOdds(gameId) {
+            pendingGames.add(gameId);
+            if (!flushTimer) flushTimer = setTimeout(flushOddsRequests, 50);
+        }
+
+        function flushOddsRequests() {
+            const gameIds = [...pendingGames];
+            pendingGames.clear();
+            flushTimer = null;
+
+            const params = new URLSearchParams();
+            const bookmaker = new URLSearchParams(window.location.search).get('bookmaker');
+            if (bookmaker) params.set('bookmaker', bookmaker);
+            params.set('game', gameIds.join(','));
+
+            fetch(`/api/board?${params}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.error) return;
+                    gameIds.forEach(gameId => gameLines.set(gameId, []));
+                    decodeBoard(data);
+                    gameIds.forEach(gameId => renderGameOdds(gameId));
+                })
+                .catch(error => console.error('Error loading odds:', error));
+        }
+
+        function observeOddsGrids() {
+            const grids = document.querySelectorAll('.odds-grid[data-board-game]');
+            if (!window.IntersectionObserver) {
+                grids.forEach(grid => requestOdds(grid.dataset.boardGame));
+                return;
+            }
+            const observer = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    if (!entry.isIntersecting) return;
+                    observer.unobserve(entry.target);
+                    requestOdds(entry.target.dataset.boardGame);
+                });
+            }, { rootMargin: '400px' });
+            grids.forEach(grid => observer.observe(grid));
+        }
+
+        // Graph tabs and canvases are only created when a card is first expanded
+        function buildGraphTabs(details) {
+            const gameId = details.dataset.game;
+            let html = '<div class="graph-tabs">';
+            GRAPH_TABS.forEach(([tabId, label], i) => {
+                html += `<button class="graph-tab${i === 0 ? ' active' : ''}" id="tab-${gameId}-${tabId}" onclick="showGraphTab('${gameId}', '${tabId}', event)">${label}</button>`;
+            });
+            html += '</div>';
+            GRAPH_TABS.forEach(([tabId], i) => {
+                html += `<div class="graph-content" id="content-${gameId}-${tabId}" style="display: ${i === 0 ? 'block' : 'none'};">
+                    <div class="graph-container"><canvas id="chart-${gameId}-${tabId}"></canvas></div>
+                </div>`;
+            });
+            details.innerHTML = html;
+            delete details.dataset.lazy;
+        }
+
+        // Fold a snapshot's changed lines into the loaded games and re-render them
+        function applySnapshotToBoard(snapshot) {
+            const dirtyGames = new Set();
+            snapshot.changes.forEach(change => {
+                const rows = gameLines.get(change.g);
+                if (!rows) return;
+                change.o.forEach(([outcome, price, point]) => {
+                    let row = rows.find(r => r.book === change.b && r.market === change.m && r.outcome === outcome);
+                    if (!row) {
+                        row = { book: change.b, market: change.m, outcome: outcome, prevPrice: null, prevPoint: null,
+                                openPrice: price, openPoint: point === '' ? null : point };
+                        rows.push(row);
+                    }
+                    row.price = price;
+                    row.point = point === '' ? null : point;
+                });
+                dirtyGames.add(change.g);
+            });
+            dirtyGames.forEach(gameId => renderGameOdds(gameId));
+        }
+
+        // Patch game cards in place when the logger commits a new snapshot
+        function applySnapshot(snapshot) {
+            applySnapshotToBoard(snapshot);
+            const refreshGraphs = new Set();
+            snapshot.changes.forEach(change => {
+                const row = document.querySelector(
+                    `#game-${change.g} .bookmaker-row[data-bookmaker="${CSS.escape(change.b)}"][data-market="${change.m}"]`);
+                if (!row) return;
+                change.o.forEach(([outcome, price, point]) => {
+                    const cell = row.querySelector(`.odds-display[data-outcome="${CSS.escape(outcome)}"]`);
+                    if (!cell) return;
+                    cell.querySelector('.odds-value').textContent = formatPrice(price);
+                    cell.querySelector('.point-value').textContent = formatPoint(point, change.m);
+                    cell.classList.remove('updated');
+                    void cell.offsetWidth;
+                    cell.classList.add('updated');
+                });
+                const details = document.getElementById(`details-${change.g}`);
+                if (details && details.dataset.graphsLoaded) refreshGraphs.add(change.g);
+            });
+            refreshGraphs.forEach(gameId => loadGameGraphs(gameId));
+        }
+
+        observeOddsGrids();
+
+        // Without a reachable event stream, loaded odds grids are re-requested on a timer
+        let pollTimer = null;
+        function pollBoard() {
+            if (!pollTimer) pollTimer = setInterval(() => gameLines.forEach((_, gameId) => requestOdds(gameId)),
+                                                    {{ board_poll_seconds }} * 1000);
+        }
+
+        const eventsUrl = {{ events_url|tojson }};
+        if (eventsUrl && window.EventSource) {
+            const events = new EventSource(eventsUrl);
+            events.addEventListener('snapshot', event => applySnapshot(JSON.parse(event.data)));
+            events.onerror = () => { if (events.readyState === EventSource.CLOSED) pollBoard(); };
+        } else {
+            pollBoard();
+        }
+
         // Create spread chart with improved display
         function createSpreadChart(gameId, data) {
             const ctx = document.getElementById(`chart-${gameId}-spreads`);
@@ -1060,145 +1494,279 @@ def organize_data_by_games(df):
     
     return games
 
-def generate_games_html(games):
-    """Generate HTML for games display with interactive graphs"""
-    if not games:
-        return '<div class="no-data">No games data available yet. The logger will start collecting data soon.</div>'
-    
-    html_parts = []
-    
-    for game_id, game_data in games.items():
-        # Game header
-        game_html = f'''
-        <div class="game-card" id="game-{game_id}">
+# Game card markup, compiled once and rendered per game through the game_card macro
+GAME_CARD_TEMPLATE = """
+{% macro odds_row(odd) -%}
+                        <div class="odds-display" data-outcome="{{ odd.team_name }}">
+                            <span class="team-name">{{ odd.team_name }}</span>
+                            <div class="odds-values">
+                                <span class="odds-value">{{ odd.price_display }}</span>
+                                <span class="point-value">{{ odd.point_display }}</span>
+                            </div>
+                        </div>
+{%- endmacro %}
+
+{% macro game_card(game) -%}
+        <div class="game-card" id="game-{{ game.id }}">
             <div class="game-header">
-                <div class="game-teams">{game_data['away_team']} @ {game_data['home_team']}</div>
-                <div class="game-time">{format_game_time(game_data['commence_time'])}</div>
+                <div class="game-teams">{{ game.away_team }} @ {{ game.home_team }}</div>
+                <div class="game-time">{{ game.game_time }}</div>
                 <div class="game-actions">
-                    <button class="graph-btn" onclick="toggleGame('{game_id}')">📊 View Graphs</button>
+                    <button class="graph-btn" onclick="toggleGame('{{ game.id }}')">📊 View Graphs</button>
                 </div>
             </div>
             <div class="game-content">
-                <div class="odds-grid">
-        '''
-        
-        # Get previous odds for movement comparison
-        previous_odds = get_previous_odds(game_id, game_data['bookmakers'])
-        
-        # Create columns for each bet type
-        bet_types = ['spreads', 'h2h', 'totals']
-        bet_type_labels = ['Point Spread', 'Moneyline', 'Total']
-        
-        for i, (bet_type, label) in enumerate(zip(bet_types, bet_type_labels)):
-            game_html += f'<div class="bet-column">'
-            game_html += f'<div class="bet-header">{label}</div>'
-            
-            # Get all bookmakers for this bet type
-            bookmakers_for_type = {}
-            for bookmaker, markets in game_data['bookmakers'].items():
-                if bet_type in markets:
-                    bookmakers_for_type[bookmaker] = markets[bet_type]
-            
-            if bookmakers_for_type:
-                # Calculate movement for this bet type
-                movement_data = calculate_movement(game_data['bookmakers'], previous_odds, bet_type)
-                movement_html = format_movement_display(movement_data, bet_type)
-                
-                if movement_html:
-                    game_html += f'<div class="movement-section">{movement_html}</div>'
-                
-                for bookmaker, odds in bookmakers_for_type.items():
-                    game_html += f'<div class="bookmaker-row">'
-                    game_html += f'<div class="bookmaker-name">{bookmaker}</div>'
-                    
-                    # Display odds for this bookmaker
-                    for odd in odds:
-                        team_name = odd['outcome_name']
-                        price = odd['price']
-                        point = odd['point']
-                        
-                        # Format price
-                        if price > 0:
-                            price_display = f"+{price}"
-                        else:
-                            price_display = str(price)
-                        
-                        # Format point (for spreads/totals)
-                        point_display = ""
-                        if pd.notna(point) and point != "":
-                            if bet_type == 'totals':
-                                point_display = f"O/U {point}"
-                            else:
-                                point_display = f"({point})"
-                        
-                        game_html += f'''
-                        <div class="odds-display">
-                            <span class="team-name">{team_name}</span>
-                            <div class="odds-values">
-                                <span class="odds-value">{price_display}</span>
-                                <span class="point-value">{point_display}</span>
-                            </div>
-                        </div>
-                        '''
-                    
-                    game_html += '</div>'  # Close bookmaker-row
-            else:
-                game_html += '<div class="no-odds">No data</div>'
-            
-            game_html += '</div>'  # Close bet-column
-        
-        game_html += '</div>'  # Close odds-grid
-        game_html += '</div>'  # Close game-content
-        
-        # Add expandable details section with graphs
-        game_html += f'''
-        <div class="game-details" id="details-{game_id}" data-game="{game_id}">
-            <div class="graph-tabs">
-                <button class="graph-tab active" id="tab-{game_id}-spreads" onclick="showGraphTab('{game_id}', 'spreads', event)">
-                    Point Spreads
-                </button>
-                <button class="graph-tab" id="tab-{game_id}-moneyline-favorite" onclick="showGraphTab('{game_id}', 'moneyline-favorite', event)">
-                    ML Favorite
-                </button>
-                <button class="graph-tab" id="tab-{game_id}-moneyline-underdog" onclick="showGraphTab('{game_id}', 'moneyline-underdog', event)">
-                    ML Underdog
-                </button>
-                <button class="graph-tab" id="tab-{game_id}-totals" onclick="showGraphTab('{game_id}', 'totals', event)">
-                    Totals
-                </button>
-            </div>
-            
-            <div class="graph-content" id="content-{game_id}-spreads" style="display: block;">
-                <div class="graph-container">
-                    <canvas id="chart-{game_id}-spreads"></canvas>
+                <div class="odds-grid" data-board-game="{{ game.id }}">
+                {%- if game.columns is none -%}
+                <div class="no-odds">Loading odds…</div>
+                {%- endif -%}
+                {%- for column in game.columns or [] -%}
+                <div class="bet-column"><div class="bet-header">{{ column.label }}</div>
+                    {%- if column.bookmakers -%}
+                    {%- if column.movement_html %}<div class="movement-section">{{ column.movement_html|safe }}</div>{% endif -%}
+                    {%- for bookmaker in column.bookmakers -%}
+                    <div class="bookmaker-row" data-bookmaker="{{ bookmaker.name }}" data-market="{{ column.market }}"><div class="bookmaker-name">{{ bookmaker.name }}</div>
+                    {%- for odd in bookmaker.odds %}{{ odds_row(odd) }}{% endfor -%}
+                    </div>
+                    {%- endfor -%}
+                    {%- else -%}
+                    <div class="no-odds">No data</div>
+                    {%- endif -%}
                 </div>
-            </div>
-            
-            <div class="graph-content" id="content-{game_id}-moneyline-favorite" style="display: none;">
-                <div class="graph-container">
-                    <canvas id="chart-{game_id}-moneyline-favorite"></canvas>
+                {%- endfor -%}
                 </div>
             </div>
-            
-            <div class="graph-content" id="content-{game_id}-moneyline-underdog" style="display: none;">
-                <div class="graph-container">
-                    <canvas id="chart-{game_id}-moneyline-underdog"></canvas>
-                </div>
+        {%- if game.columns is none %}
+        <div class="game-details" id="details-{{ game.id }}" data-game="{{ game.id }}" data-lazy="true"></div>
+        {%- else %}
+        <div class="game-details" id="details-{{ game.id }}" data-game="{{ game.id }}">
+            <div class="graph-tabs">
+                {%- for tab_id, tab_label in graph_tabs %}
+                <button class="graph-tab{% if loop.first %} active{% endif %}" id="tab-{{ game.id }}-{{ tab_id }}" onclick="showGraphTab('{{ game.id }}', '{{ tab_id }}', event)">
+                    {{ tab_label }}
+                </button>
+                {%- endfor %}
             </div>
-            
-            <div class="graph-content" id="content-{game_id}-totals" style="display: none;">
+            {% for tab_id, tab_label in graph_tabs %}
+            <div class="graph-content" id="content-{{ game.id }}-{{ tab_id }}" style="display: {{ 'block' if loop.first else 'none' }};">
                 <div class="graph-container">
-                    <canvas id="chart-{game_id}-totals"></canvas>
+                    <canvas id="chart-{{ game.id }}-{{ tab_id }}"></canvas>
                 </div>
             </div>
+            {% endfor %}
+        </div>
+        {%- endif %}
         </div>
-        '''
+{%- endmacro %}
+"""
+
+# Paged file viewer; rendered with generate() so rows are written out as they are formatted
+FILE_VIEWER_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ filename }} - NFL Odds Logger</title>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 20px; color: #333; }
+        form { display: flex; flex-wrap: wrap; gap: 10px; align-items: center; margin-bottom: 15px; }
+        select, input, button { padding: 6px; border: 1px solid #dee2e6; border-radius: 6px; }
+        table { border-collapse: collapse; font-size: 0.85rem; font-family: monospace; }
+        th, td { border: 1px solid #e9ecef; padding: 3px 8px; text-align: left; white-space: nowrap; }
+        th { background: #f8f9fa; position: sticky; top: 0; }
+        .pagination { display: flex; gap: 20px; margin: 15px 0; color: #6c757d; }
+    </style>
+</head>
+<body>
+    <h2>📄 {{ filename }}</h2>
+    <p><a href="/">← Dashboard</a> · <a href="/download/file/{{ filename }}">📥 Download</a> · {{ total_rows }} rows</p>
+    <form method="get">
+        {% for column, values in options.items() %}
+        <select name="{{ column }}">
+            <option value="">All {{ column }}</option>
+            {% for value in values %}
+            <option value="{{ value }}"{% if value == filters[column] %} selected{% endif %}>{{ value }}</option>
+            {% endfor %}
+        </select>
+        {% endfor %}
+        <label>Rows <input type="number" name="limit" min="1" max="{{ max_limit }}" value="{{ limit }}"></label>
+        <button type="submit">Filter</button>
+        <a href="/view/file/{{ filename }}">Clear</a>
+    </form>
+    {% set query = filters | dictsort | selectattr(1) | list | urlencode %}
+    {% macro pager() %}
+    <div class="pagination">
+        {% if offset > 0 %}<a href="?{{ query ~ '&' if query }}offset={{ [offset - limit, 0]|max }}&limit={{ limit }}">← Previous</a>{% endif %}
+        <span>Rows {{ offset + 1 if rows else offset }}–{{ offset + rows|length }}</span>
+        {% if has_more %}<a href="?{{ query ~ '&' if query }}offset={{ offset + limit }}&limit={{ limit }}">Next →</a>{% endif %}
+    </div>
+    {% endmacro %}
+    {{ pager() }}
+    <table>
+        <tr>{% for column in header %}<th>{{ column }}</th>{% endfor %}</tr>
+        {% for row in rows %}
+        <tr>{% for value in row %}<td>{{ value }}</td>{% endfor %}</tr>
+        {% endfor %}
+    </table>
+    {{ pager() }}
+</body>
+</html>
+"""
+
+GRAPH_TABS = [
+    ('spreads', 'Point Spreads'),
+    ('moneyline-favorite', 'ML Favorite'),
+    ('moneyline-underdog', 'ML Underdog'),
+    ('totals', 'Totals')
+]
+
+_compiled_templates = {}
+
+def get_template(name, source):
+    """Compile a template once and reuse it for every request"""
+    template = _compiled_templates.get(name)
+    record_cache('template', template is not None)
+    if template is None:
+        template = app.jinja_env.from_string(source, globals={'graph_tabs': GRAPH_TABS})
+        _compiled_templates[name] = template
+    return template
+
+def format_price(price):
+    """American price with an explicit + for underdogs"""
+    return f"+{price}" if price > 0 else str(price)
+
+def build_game_card(game_id, game_data):
+    """Collect the display values for one game card"""
+    # Get previous odds for movement comparison
+    with timer('movement'):
+        previous_odds = get_previous_odds(game_id, game_data['bookmakers'])
+    
+    columns = []
+    
+    # Create columns for each bet type
+    bet_types = ['spreads', 'h2h', 'totals']
+    bet_type_labels = ['Point Spread', 'Moneyline', 'Total']
+    
+    for bet_type, label in zip(bet_types, bet_type_labels):
+        column = {'label': label, 'market': bet_type, 'bookmakers': [], 'movement_html': ''}
+        
+        # Get all bookmakers for this bet type
+        bookmakers_for_type = {}
+        for bookmaker, markets in game_data['bookmakers'].items():
+            if bet_type in markets:
+                bookmakers_for_type[bookmaker] = markets[bet_type]
         
-        game_html += '</div>'  # Close game-card
-        html_parts.append(game_html)
+        if bookmakers_for_type:
+            # Calculate movement for this bet type
+            with timer('movement'):
+                movement_data = calculate_movement(game_data['bookmakers'], previous_odds, bet_type)
+                column['movement_html'] = format_movement_display(movement_data, bet_type)
+            
+            for bookmaker, odds in bookmakers_for_type.items():
+                odds_display = []
+                for odd in odds:
+                    point = odd['point']
+                    
+                    # Format point (for spreads/totals)
+                    point_display = ""
+                    if pd.notna(point) and point != "":
+                        if bet_type == 'totals':
+                            point_display = f"O/U {point}"
+                        else:
+                            point_display = f"({point})"
+                    
+                    odds_display.append({
+                        'team_name': odd['outcome_name'],
+                        'price_display': format_price(odd['price']),
+                        'point_display': point_display
+                    })
+                column['bookmakers'].append({'name': bookmaker, 'odds': odds_display})
+        
+        columns.append(column)
+    
+    return {
+        'id': game_id,
+        'away_team': game_data['away_team'],
+        'home_team': game_data['home_team'],
+        'game_time': format_game_time(game_data['commence_time']),
+        'columns': columns
+    }
+
+def generate_games_html(games):
+    """Generate HTML for games display with interactive graphs"""
+    if not games:
+        return '<div class="no-data">No games data available yet. The logger will start collecting data soon.</div>'
+    
+    game_card = get_template('game_card', GAME_CARD_TEMPLATE).module.game_card
+    
+    html_parts = []
+    for game_id, game_data in games.items():
+        html_parts.append(str(game_card(build_game_card(game_id, game_data))))
     
     return '\n'.join(html_parts)
 
+# (mode, game_id) -> ((latest file, board version), rendered card), shared by the worker's threads
+_fragment_cache = {}
+_fragment_lock = threading.Lock()
+
+def build_game_skeleton(game_id, game_data):
+    """Card header and graph tabs only; the odds grid is filled in from /api/board"""
+    return {
+        'id': game_id,
+        'away_team': game_data['away_team'],
+        'home_team': game_data['home_team'],
+        'game_time': format_game_time(game_data['commence_time']),
+        'columns': None
+    }
+
+def render_game_cards(df, latest_file, client_rendered=False, board_game_ids=None):
+    """Assemble game cards from the fragment cache, rebuilding only games whose board version moved
+    
+    board_game_ids is every game in latest_file (df may be one page of it); cached cards for
+    games outside it are dropped.
+    """
+    game_ids = list(df['game_id'].unique())
+    if not game_ids:
+        return generate_games_html({})
+    
+    # Games without a recorded version (e.g. files written before versioning) follow the file's mtime
+    versions = load_board_versions()['games']
+    file_version = os.path.getmtime(latest_file)
+    keys = {game_id: (latest_file, versions.get(game_id, file_version)) for game_id in game_ids}
+    mode = 'client' if client_rendered else 'server'
+    
+    fragments = {}
+    with _fragment_lock:
+        for game_id in game_ids:
+            cached = _fragment_cache.get((mode, game_id))
+            if cached is not None and cached[0] == keys[game_id]:
+                fragments[game_id] = cached[1]
+    for game_id in game_ids:
+        record_cache('game_card', game_id in fragments)
+    
+    dirty = [game_id for game_id in game_ids if game_id not in fragments]
+    if dirty:
+        game_card = get_template('game_card', GAME_CARD_TEMPLATE).module.game_card
+        if client_rendered:
+            headers = df[df['game_id'].isin(dirty)].drop_duplicates('game_id').set_index('game_id')
+            for game_id, game_data in headers.iterrows():
+                fragments[game_id] = str(game_card(build_game_skeleton(game_id, game_data)))
+        else:
+            with timer('organize'):
+                games = organize_data_by_games(df[df['game_id'].isin(dirty)])
+            for game_id, game_data in games.items():
+                fragments[game_id] = str(game_card(build_game_card(game_id, game_data)))
+    
+    on_board = set(board_game_ids) if board_game_ids is not None else set(game_ids)
+    with _fragment_lock:
+        for game_id in dirty:
+            _fragment_cache[(mode, game_id)] = (keys[game_id], fragments[game_id])
+        # Drop games that are no longer on the board; other pages and filters keep theirs
+        for cache_key in [cache_key for cache_key in _fragment_cache if cache_key[1] not in on_board]:
+            del _fragment_cache[cache_key]
+    
+    return '\n'.join(fragments[game_id] for game_id in game_ids)
+
 def generate_data_files_html():
     """Generate HTML for data files view"""
     # Get all CSV files
@@ -1310,8 +1878,45 @@ def get_historical_data_for_game(game_id):
     
     return combined_df
 
+def poll_timeline(game_data, game_id):
+    """Polls at which the game was on the board, each with the set of its bookmakers that were"""
+    prefix = f"{game_id}:"
+    polls = []
+    # Each day's CSV starts with a full snapshot, so the game has rows on every day it was listed
+    for date_str in sorted(game_data['timestamp'].astype(str).str[:10].unique()):
+        for poll in read_heartbeats(date_str):
+            books = {key[len(prefix):] for key in poll["written"] + poll["unchanged"] if key.startswith(prefix)}
+            if books:
+                polls.append((poll["timestamp"], books))
+    if not polls:
+        # Logged before heartbeats existed, when every poll wrote every block
+        polls = [(timestamp, set(group['bookmaker'])) for timestamp, group in game_data.groupby('timestamp')]
+    return polls
+
+def aligned_series(rows, polls, labels):
+    """One point per poll for every bookmaker: its last written line at or before the poll, None while it was off the board"""
+    if rows.empty:
+        return None
+    times = [timestamp for timestamp, _ in polls]
+    series = {}
+    for bookmaker, group in rows.groupby('bookmaker', sort=False):
+        group = group.drop_duplicates('timestamp', keep='last').set_index('timestamp').sort_index()
+        filled = group.reindex(group.index.union(times)).ffill().reindex(times)
+        points = []
+        for (_, books), label, line in zip(polls, labels, filled.to_dict('records')):
+            on_board = bookmaker in books and pd.notna(line['price'])
+            points.append({
+                'time': label,
+                'point': float(line['point']) if on_board and pd.notna(line['point']) else None,
+                'price': float(line['price']) if on_board else None,
+                'team': line['outcome_name'] if on_board else None,
+                'outcome': line['outcome_name'] if on_board else None
+            })
+        series[bookmaker] = points
+    return series
+
 def organize_graph_data(df, game_id):
-    """Organize data for graph display"""
+    """Organize data for graph display: every bookmaker forward-filled onto the same poll timeline"""
     if df is None or df.empty:
         return None
     
@@ -1319,114 +1924,48 @@ def organize_graph_data(df, game_id):
     game_data = df[df['game_id'] == game_id]
     if game_data.empty:
         return None
+    game_data = game_data.assign(point=pd.to_numeric(game_data['point'], errors='coerce'),
+                                 price=pd.to_numeric(game_data['price'], errors='coerce'))
     
-    # Get home and away team names
-    home_team = game_data['home_team'].iloc[0]
-    away_team = game_data['away_team'].iloc[0]
+    # Only changed blocks are written, so a book's i-th row is not the i-th poll
+    polls = poll_timeline(game_data, game_id)
+    time_labels = [format_time_for_chart(timestamp) for timestamp, _ in polls]
+    columns = ['timestamp', 'bookmaker', 'outcome_name', 'price', 'point']
     
-    # Organize by market type
-    spreads_data = {}
-    moneyline_favorite_data = {}
-    moneyline_underdog_data = {}
-    totals_data = {}
+    # Spreads and totals follow one side so each poll is a single point per book
+    spreads = game_data[(game_data['market'] == 'spreads') & (game_data['outcome_name'] == game_data['home_team'])]
+    totals = game_data[(game_data['market'] == 'totals') & (game_data['outcome_name'] == 'Over')]
     
-    # Track unique timestamps for proper time progression
-    all_timestamps = []
-    
-    for _, row in game_data.iterrows():
-        bookmaker = row['bookmaker']
-        market = row['market']
-        timestamp = row['timestamp']
-        outcome_name = row['outcome_name']
-        price = row['price']
-        point = row['point']
-        
-        # Store timestamp for later processing
-        all_timestamps.append(timestamp)
-        
-        if market == 'spreads':
-            if bookmaker not in spreads_data:
-                spreads_data[bookmaker] = []
-            
-            # For spreads, use the point value as the main line
-            if pd.notna(point) and point != "":
-                spreads_data[bookmaker].append({
-                    'timestamp': timestamp,
-                    'point': float(point),
-                    'team': outcome_name
-                })
-        
-        elif market == 'h2h':
-            # Separate favorite and underdog moneyline data
-            if price < 0:  # Favorite (negative odds)
-                if bookmaker not in moneyline_favorite_data:
-                    moneyline_favorite_data[bookmaker] = []
-                moneyline_favorite_data[bookmaker].append({
-                    'timestamp': timestamp,
-                    'price': price,
-                    'team': outcome_name
-                })
-            else:  # Underdog (positive odds)
-                if bookmaker not in moneyline_underdog_data:
-                    moneyline_underdog_data[bookmaker] = []
-                moneyline_underdog_data[bookmaker].append({
-                    'timestamp': timestamp,
-                    'price': price,
-                    'team': outcome_name
-                })
-        
-        elif market == 'totals':
-            if bookmaker not in totals_data:
-                totals_data[bookmaker] = []
-            totals_data[bookmaker].append({
-                'timestamp': timestamp,
-                'point': float(point) if pd.notna(point) and point != "" else None,
-                'price': price,
-                'outcome': outcome_name
-            })
-    
-    # Sort timestamps and create time labels
-    unique_timestamps = sorted(list(set(all_timestamps)))
-    time_labels = [format_time_for_chart(ts) for ts in unique_timestamps]
-    
-    # Process each data type to ensure proper time progression
-    def process_data_for_time(data_dict):
-        processed = {}
-        for bookmaker, data_points in data_dict.items():
-            # Sort by timestamp and create time-indexed data
-            sorted_data = sorted(data_points, key=lambda x: x['timestamp'])
-            processed[bookmaker] = []
-            
-            for i, data_point in enumerate(sorted_data):
-                processed[bookmaker].append({
-                    'time': time_labels[i] if i < len(time_labels) else time_labels[-1],
-                    'point': data_point.get('point'),
-                    'price': data_point.get('price'),
-                    'team': data_point.get('team'),
-                    'outcome': data_point.get('outcome')
-                })
-        return processed
+    # Favorite and underdog are the shorter and longer moneyline price of each written block
+    h2h = game_data[game_data['market'] == 'h2h'].dropna(subset=['price'])
+    block = h2h.groupby(['timestamp', 'bookmaker'], sort=False)['price']
+    favorites = h2h.loc[block.idxmin()] if not h2h.empty else h2h
+    underdogs = h2h.loc[block.idxmax()] if not h2h.empty else h2h
     
     return {
-        'spreads': process_data_for_time(spreads_data) if spreads_data else None,
-        'moneyline_favorite': process_data_for_time(moneyline_favorite_data) if moneyline_favorite_data else None,
-        'moneyline_underdog': process_data_for_time(moneyline_underdog_data) if moneyline_underdog_data else None,
-        'totals': process_data_for_time(totals_data) if totals_data else None,
+        'spreads': aligned_series(spreads[columns], polls, time_labels),
+        'moneyline_favorite': aligned_series(favorites[columns], polls, time_labels),
+        'moneyline_underdog': aligned_series(underdogs[columns], polls, time_labels),
+        'totals': aligned_series(totals[columns], polls, time_labels),
         'labels': time_labels
     }
 
-def get_previous_odds(game_id, current_data):
-    """Get previous odds for comparison"""
+def get_previous_csv_file():
+    """The second most recent CSV file, used as the movement baseline"""
     csv_files = glob.glob("nfl_odds_*.csv")
-    if not csv_files:
-        return None
     
     # Sort files by date (oldest first) and get the second most recent
     sorted_files = sorted(csv_files, key=os.path.getctime)
     if len(sorted_files) < 2:
         return None
     
-    previous_file = sorted_files[-2]  # Second most recent file
+    return sorted_files[-2]
+
+def get_previous_odds(game_id, current_data):
+    """Get previous odds for comparison"""
+    previous_file = get_previous_csv_file()
+    if not previous_file:
+        return None
     
     try:
         df = pd.read_csv(previous_file)
@@ -1613,6 +2152,29 @@ def get_latest_csv_file():
         return None
     return max(csv_files, key=os.path.getctime)
 
+def csv_date(csv_file):
+    """YYYY-MM-DD of a daily nfl_odds_<date>.csv file"""
+    return os.path.basename(csv_file)[len("nfl_odds_"):-len(".csv")]
+
+def count_polled_odds(csv_file, df):
+    """Odds rows seen across the day's polls, as if every poll had written the full board
+    
+    Only changed blocks are stored; an unchanged block repeats the rows of its last write,
+    so the heartbeats give the exact count. df needs timestamp, game_id and bookmaker.
+    """
+    polls = read_heartbeats(csv_date(csv_file))
+    if not polls:
+        return len(df)
+    keys = df['game_id'] + ':' + df['bookmaker']
+    written_rows = keys.groupby([df['timestamp'], keys]).size().to_dict()
+    block_rows = {}
+    total = 0
+    for poll in polls:
+        for key in poll["written"]:
+            block_rows[key] = written_rows.get((poll["timestamp"], key), 0)
+        total += sum(block_rows.get(key, 0) for key in poll["written"] + poll["unchanged"])
+    return total
+
 def get_usage_stats():
     """Get API usage statistics"""
     try:
@@ -1643,29 +2205,150 @@ def get_usage_stats():
     
     return {"calls": 0, "limit": 500, "remaining": 500, "usage_percent": 0}
 
+# Changes to this module change the markup, so they are part of every ETag
+APP_VERSION = str(os.path.getmtime(__file__))
+
+def data_fingerprint(files, *extra):
+    """Strong ETag and Last-Modified for a response built from `files`, using stat() only"""
+    digest = hashlib.sha1(APP_VERSION.encode('utf-8'))
+    latest_mtime = None
+    for path in sorted(set(files)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+        latest_mtime = max(latest_mtime or 0, stat.st_mtime)
+    for part in extra:
+        digest.update(str(part).encode('utf-8'))
+    
+    last_modified = datetime.fromtimestamp(int(latest_mtime), timezone.utc) if latest_mtime else None
+    return digest.hexdigest(), last_modified
+
+def conditional_on(files_for_request):
+    """Answer matching If-None-Match / If-Modified-Since requests with 304 before any pandas work"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = data_fingerprint(*files_for_request(*args, **kwargs))
+            
+            if request.if_none_match:
+                # Compressed responses carry an encoding-specific ETag
+                not_modified = any(request.if_none_match.contains(tag) for tag in
+                                   [etag] + [compression.encoded_etag(etag, e) for e in compression.ENCODINGS])
+            else:
+                not_modified = bool(last_modified and request.if_modified_since
+                                    and last_modified <= request.if_modified_since)
+            
+            if not_modified:
+                record_cache('conditional', True)
+                response = Response(status=304)
+            else:
+                record_cache('conditional', False)
+                response = make_response(view(*args, **kwargs))
+            
+            if response.headers.get('X-Cache') == 'stale':
+                # Built from older data; an ETag would pin it as the current version
+                response.cache_control.no_store = True
+                return response
+            
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            # Clients may keep the body but must revalidate; revalidation is a stat() per file
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+def latest_heartbeat_files():
+    latest_file = get_latest_csv_file()
+    return [HEARTBEAT_FILE_FORMAT.format(date=csv_date(latest_file))] if latest_file else []
+
+def dashboard_files():
+    return glob.glob("*.csv") + ["api_usage.json", BOARD_VERSIONS_FILE] + latest_heartbeat_files(), \
+        'dashboard', request.query_string
+
+def board_data_files():
+    return glob.glob("nfl_odds_*.csv") + [BOARD_VERSIONS_FILE, OPENING_LINES_FILE], 'board'
+
+def board_files():
+    return board_data_files() + (request.query_string,)
+
+# Games per dashboard page; each card's odds grid is fetched when it scrolls into view
+PAGE_SIZE = 20
+
+def board_filters(args):
+    """Filters shared by the dashboard list and /api/board"""
+    return {
+        'team': args.get('team', '').strip() or None,
+        'bookmaker': args.get('bookmaker', '').strip() or None,
+        'start': args.get('start', '').strip() or None,
+        'end': args.get('end', '').strip() or None
+    }
+
+def parse_int(value, default):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return default
+
+def stats_files():
+    latest_file = get_latest_csv_file()
+    return ([latest_file] if latest_file else []) + ["api_usage.json"] + latest_heartbeat_files(), \
+        'stats', latest_file
+
+def game_graph_files(game_id):
+    # Heartbeats extend every book's line to the latest poll even when nothing was written
+    return glob.glob("nfl_odds_*.csv") + glob.glob("nfl_heartbeats_*.jsonl"), 'graphs', game_id
+
 @app.route('/')
+@conditional_on(dashboard_files)
 def dashboard():
     """Main dashboard"""
     # Get latest CSV file
     latest_file = get_latest_csv_file()
+    data_files_html = ''
+    filters = board_filters(request.args)
+    client_rendered = False
+    bookmakers = []
+    matching_games = 0
+    page = pages = 1
     
     if latest_file:
         try:
+            # Cards are filled in from /api/board by default; ?render=server keeps the full server-side cards
+            client_rendered = request.args.get('render') != 'server'
+            
             # Read the latest CSV
-            df = pd.read_csv(latest_file)
+            with timer('read'):
+                if client_rendered:
+                    df = pd.read_csv(latest_file, usecols=['timestamp', 'game_id', 'commence_time', 'home_team',
+                                                           'away_team', 'bookmaker'])
+                else:
+                    df = pd.read_csv(latest_file)
             
-            # Organize data by games
-            games = organize_data_by_games(df)
+            if client_rendered:
+                # Only one page of lightweight cards; odds grids load as they scroll into view
+                bookmakers = sorted(df['bookmaker'].unique())
+                matching = filter_board(df, **filters)
+                matching_games = matching['game_id'].nunique()
+                pages = max((matching_games + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+                page = min(parse_int(request.args.get('page'), 1) or 1, pages)
+                page_rows, _ = page_of_games(matching, (page - 1) * PAGE_SIZE, PAGE_SIZE)
+            else:
+                page_rows = df
             
-            # Generate games HTML
-            games_html = generate_games_html(games)
+            # Generate games HTML, rebuilding only games that changed since the last render
+            with timer('games_html'):
+                games_html = render_game_cards(page_rows, latest_file, client_rendered, df['game_id'].unique())
             
             # Generate data files HTML
             data_files_html = generate_data_files_html()
             
             # Calculate stats
-            total_games = len(games)
-            total_odds = len(df)
+            total_games = df['game_id'].nunique()
+            total_odds = count_polled_odds(latest_file, df)
             
             last_update = format_timestamp(datetime.fromtimestamp(os.path.getctime(latest_file)).isoformat())
             
@@ -1683,34 +2366,191 @@ def dashboard():
     # Get usage stats
     usage_stats = get_usage_stats()
     
-    return render_template_string(HTML_TEMPLATE,
-        total_games=total_games,
-        total_odds=total_odds,
-        api_calls=usage_stats["calls"],
-        remaining_calls=usage_stats["remaining"],
-        games_html=games_html,
-        data_files_html=data_files_html, # Pass data_files_html to the template
-        last_update=last_update
-    )
+    context = {
+        'total_games': total_games,
+        'total_odds': total_odds,
+        'api_calls': usage_stats["calls"],
+        'remaining_calls': usage_stats["remaining"],
+        'games_html': games_html,
+        'data_files_html': data_files_html,
+        'last_update': last_update,
+        'events_url': events_url(),
+        'board_poll_seconds': BOARD_POLL_SECONDS,
+        'client_rendered': client_rendered,
+        'filters': filters,
+        'bookmakers': bookmakers,
+        'matching_games': matching_games,
+        'page': page,
+        'pages': pages,
+        'page_size': PAGE_SIZE,
+        'graph_tabs': GRAPH_TABS
+    }
+    app.update_template_context(context)
+    
+    with timer('render'):
+        return get_template('dashboard', HTML_TEMPLATE).render(context)
+
+def get_board_frames():
+    """Current board and movement baseline, re-read only when the underlying files change
+    
+    Returns the frames and the coalescer state; 'stale' frames are from before the latest write
+    """
+    fingerprint, _ = data_fingerprint(*board_data_files())
+    
+    def compute():
+        latest_file = get_latest_csv_file()
+        with timer('read'):
+            board = load_current_board(latest_file)
+            previous_file = get_previous_csv_file()
+            previous = last_lines(pd.read_csv(previous_file)) if previous_file else None
+        return pickle.dumps((board, previous, load_board_versions()), protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def load():
+        # Parsed frames live in the shared cache so every worker reuses one parse
+        value, hit = shared_cache.get_or_compute('board', fingerprint, compute)
+        record_cache('board', hit)
+        return pickle.loads(value)
+    
+    return board_frames_coalescer.get('board', fingerprint, load)
+
+@app.route('/api/board')
+@conditional_on(board_files)
+def api_board():
+    """Current board as dictionary-encoded names plus parallel arrays of prices and points
+    
+    Optional filters: game (comma separated ids), team, bookmaker, start/end (YYYY-MM-DD
+    kickoff window), offset/limit (paging over games)
+    """
+    if not get_latest_csv_file():
+        return jsonify({'error': 'No data available'})
+    
+    (board, previous, versions), state = get_board_frames()
+    game_ids = [game_id for game_id in request.args.get('game', '').split(',') if game_id]
+    board = filter_board(board, game_ids=game_ids, **board_filters(request.args))
+    board, matching_games = page_of_games(board, parse_int(request.args.get('offset'), 0),
+                                          parse_int(request.args.get('limit'), None))
+    if previous is not None:
+        previous = previous[previous['game_id'].isin(board['game_id'].unique())]
+    board = attach_openings(board)
+    
+    with timer('encode_board'):
+        payload = encode_board(board, previous, versions['version'], versions['snapshot'])
+        payload['matching_games'] = matching_games
+    
+    return Response(json.dumps(payload, separators=(',', ':')), mimetype='application/json',
+                    headers={'X-Cache': state})
+
+def consensus_files():
+    return [CONSENSUS_FILE], 'consensus', request.query_string
+
+@app.route('/api/consensus')
+@conditional_on(consensus_files)
+def api_consensus():
+    """Best price, median line and dispersion per game, market and outcome from the last ingest
+    
+    Optional filter: game (comma separated ids)
+    """
+    consensus = load_consensus()
+    game_ids = {game_id for game_id in request.args.get('game', '').split(',') if game_id}
+    if game_ids:
+        consensus['lines'] = [line for line in consensus['lines'] if line['game_id'] in game_ids]
+    return Response(json.dumps(consensus, separators=(',', ':')), mimetype='application/json')
+
+def opportunities_files():
+    return [OPPORTUNITIES_STATE_FILE, OPPORTUNITIES_LOG_FILE], 'opportunities', request.query_string
+
+@app.route('/api/opportunities')
+@conditional_on(opportunities_files)
+def api_opportunities():
+    """Open arbitrage and middle opportunities with their age, plus recently closed ones
+    
+    Optional: type (arbitrage or middle), limit (closed opportunities, default 100)
+    """
+    report = opportunities_report(min(parse_int(request.args.get('limit'), 100), 1000))
+    kind = request.args.get('type')
+    if kind:
+        report = {state: [o for o in opportunities if o['type'] == kind] for state, opportunities in report.items()}
+    return jsonify(report)
+
+def stale_files():
+    return [STALE_LINES_FILE], 'stale', request.query_string
+
+@app.route('/api/stale')
+@conditional_on(stale_files)
+def api_stale():
+    """Lines that stopped following the consensus, with a per-book dead-feed verdict
+    
+    Optional filter: book
+    """
+    return jsonify(stale_report(request.args.get('book') or None))
+
+def hold_files():
+    return [HOLD_DB, f"{HOLD_DB}-wal"], 'hold', request.query_string
+
+@app.route('/api/hold')
+@conditional_on(hold_files)
+def api_hold():
+    """Book hold from the ingest rollups: mean, low and high per bookmaker, market and period
+    
+    Optional: by (day, hour or kickoff; default day), market, book, game (per-line holds for one game)
+    """
+    if request.args.get('game'):
+        return jsonify({"lines": game_holds(request.args['game'])})
+    by = request.args.get('by', 'day')
+    if by not in ('day', 'hour', 'kickoff'):
+        return jsonify({"error": "by must be day, hour or kickoff"}), 400
+    return jsonify({"by": by, "rows": hold_aggregates(by, request.args.get('market') or None,
+                                                       request.args.get('book') or None)})
+
+def alerts_files():
+    return [ALERTS_LOG_FILE], 'alerts', request.query_string
+
+@app.route('/api/alerts')
+@conditional_on(alerts_files)
+def api_alerts():
+    """Latest alerts raised by the ingest rules, newest first
+    
+    Optional: rule (name), limit (default 100)
+    """
+    limit = min(parse_int(request.args.get('limit'), 100), 1000)
+    return jsonify({"alerts": recent_alerts(limit, request.args.get('rule') or None)})
 
 @app.route('/api/game/<game_id>/graphs')
+@conditional_on(game_graph_files)
 def game_graphs(game_id):
     """API endpoint for game graph data"""
-    try:
+    fingerprint, _ = data_fingerprint(*game_graph_files(game_id))
+    
+    def build():
         # Get historical data for the game
-        historical_df = get_historical_data_for_game(game_id)
+        with timer('read_history'):
+            historical_df = get_historical_data_for_game(game_id)
         
         if historical_df is None:
-            return jsonify({'error': 'No data found for this game'})
+            return json.dumps({'error': 'No data found for this game'}).encode('utf-8')
         
         # Organize data for graphs
-        graph_data = organize_graph_data(historical_df, game_id)
-        
-        return jsonify(graph_data)
+        with timer('organize_graphs'):
+            graph_data = organize_graph_data(historical_df, game_id)
+        return json.dumps(graph_data).encode('utf-8')
+    
+    def load():
+        cached = shared_cache.get(f'graphs:{game_id}', fingerprint)
+        record_cache('graphs', cached is not None)
+        if cached is not None:
+            return bytes(cached)
+        payload = build()
+        shared_cache.set(f'graphs:{game_id}', fingerprint, payload)
+        return payload
+    
+    try:
+        payload, state = graphs_coalescer.get(game_id, fingerprint, load)
+        return Response(payload, mimetype='application/json', headers={'X-Cache': state})
     except Exception as e:
         return jsonify({'error': str(e)})
 
 @app.route('/api/stats')
+@conditional_on(stats_files)
 def api_stats():
     """API endpoint for stats"""
     latest_file = get_latest_csv_file()
@@ -1727,23 +2567,70 @@ def api_stats():
     
     if latest_file:
         try:
-            df = pd.read_csv(latest_file)
-            games = organize_data_by_games(df)
+            with timer('read'):
+                df = pd.read_csv(latest_file)
+            with timer('organize'):
+                games = organize_data_by_games(df)
             stats["total_games"] = len(games)
-            stats["total_odds"] = len(df)
+            stats["total_odds"] = count_polled_odds(latest_file, df)
             stats["last_update"] = datetime.fromtimestamp(os.path.getctime(latest_file)).isoformat()
         except:
             pass
     
     return jsonify(stats)
 
+def served_by_gunicorn():
+    return request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn')
+
+def events_url():
+    """Where browsers open the board event stream, or None if they should poll instead"""
+    if EVENTS_URL:
+        return EVENTS_URL
+    # The standalone server speaks plain http; an https page may not connect to it
+    if EVENTS_PORT and request.scheme == 'http':
+        return f"http://{urlsplit(request.host_url).hostname}:{EVENTS_PORT}/events"
+    if not served_by_gunicorn():
+        return '/events'
+    return None
+
+@app.route('/events')
+def board_events():
+    """Server-Sent Events stream of changed lines, one event per committed snapshot
+    
+    Served in-process only by single-process servers; a streaming response holds a worker
+    thread per client, so with a standalone stream this redirects there and under gunicorn
+    without one it refuses (dashboards then poll).
+    """
+    url = events_url()
+    if url and url != request.path:
+        return redirect(url, code=307)
+    if served_by_gunicorn():
+        return Response("Board events are served by event_stream.py; start it and set EVENTS_PORT\n",
+                        status=503, mimetype='text/plain')
+    last_version = parse_last_event_id(request.headers.get('Last-Event-ID'), event_broadcaster.latest_version)
+    return Response(sse_stream(event_broadcaster, last_version), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def send_csv(filepath):
+    """Send a CSV download; completed days use a precompressed sidecar, today's file is compressed as it streams"""
+    # send_file resolves relative paths against the app directory, not the data directory
+    filepath = os.path.abspath(filepath)
+    encoding = compression.negotiate(request)
+    if encoding and compression.is_completed_daily_file(filepath):
+        sidecar = compression.sidecar_path(filepath, encoding)
+        response = send_file(sidecar, mimetype='text/csv', as_attachment=True,
+                             download_name=os.path.basename(filepath))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    return send_file(filepath, mimetype='text/csv', as_attachment=True)
+
 @app.route('/download/latest')
 def download_latest():
     """Download the latest CSV file"""
     latest_file = get_latest_csv_file()
     if latest_file:
-        from flask import send_file
-        return send_file(latest_file, as_attachment=True)
+        return send_csv(latest_file)
     else:
         return "No data available", 404
 
@@ -1752,20 +2639,34 @@ def download_specific_file(filename):
     """Download a specific CSV file"""
     filepath = os.path.join(".", filename)
     if os.path.exists(filepath):
-        return send_file(filepath, as_attachment=True)
+        return send_csv(filepath)
     else:
         return "File not found", 404
 
+# Rows per viewer page, and the most a single request may ask for
+VIEW_PAGE_SIZE = 100
+VIEW_MAX_LIMIT = 1000
+
 @app.route('/view/file/<filename>')
 def view_specific_file(filename):
-    """View a specific CSV file in the browser"""
+    """View one page of a CSV file in the browser, optionally filtered by game, bookmaker and market"""
     filepath = os.path.join(".", filename)
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            content = f.read()
-        return render_template_string(f"<pre>{content}</pre>")
-    else:
+    if not filename.endswith('.csv') or not os.path.exists(filepath):
         return "File not found", 404
+    
+    offset = parse_int(request.args.get('offset'), 0)
+    limit = min(parse_int(request.args.get('limit'), VIEW_PAGE_SIZE) or VIEW_PAGE_SIZE, VIEW_MAX_LIMIT)
+    filters = {column: request.args.get(column, '').strip() for column in csv_viewer.FILTER_COLUMNS}
+    
+    with timer('read_page'):
+        index = csv_viewer.load_index(filepath)
+        header, rows, has_more = csv_viewer.read_page(filepath, offset, limit, filters, index)
+    
+    context = {'filename': filename, 'header': header, 'rows': rows, 'has_more': has_more,
+               'offset': offset, 'limit': limit, 'max_limit': VIEW_MAX_LIMIT, 'filters': filters,
+               'options': csv_viewer.filter_options(index), 'total_rows': index['rows']}
+    template = get_template('file_viewer', FILE_VIEWER_TEMPLATE)
+    return Response(stream_with_context(template.generate(context)), mimetype='text/html')
 
 if __name__ == '__main__':
     # Install required packages